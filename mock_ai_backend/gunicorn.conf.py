@@ -0,0 +1,94 @@
+# gunicorn.conf.py
+#
+# Production server: a gunicorn master imports the app and the configured
+# models once (preload_app), then forks uvicorn workers that share what it
+# loaded copy-on-write instead of each loading its own copy.
+#
+# With the default EMOTION_MODEL_BACKEND=keras the master loads NO model
+# weights (TensorFlow is not fork-safe): every worker loads its own copy of the
+# emotion model on first use, so memory grows with WEB_CONCURRENCY. To share
+# the weights, export the ONNX model (script/export_emotion_model_onnx.py) and
+# run with EMOTION_MODEL_BACKEND=onnx.
+#
+# Everything that has to agree across workers lives outside process memory:
+# auth and interview sessions, resumable uploads and LLM evaluation jobs in
+# SQLite (DATABASE_PATH), session revocations in a marker file next to it,
+# stage metrics in METRICS_DIR, scratch directories tagged with the owning
+# worker's PID, and per-user admission slots in SQLite. Admission concurrency
+# and queue limits (ADMISSION_*) and scratch quotas (SCRATCH_*_QUOTA_MB) are
+# deployment-wide totals split between the workers (SERVER_PROCESSES). A
+# worker's disk share must still fit the largest single reservation (a streamed
+# batch: MAX_VIDEO_SIZE x BATCH_MAX_VIDEOS, 1000 MB by default), so raise
+# SCRATCH_DISK_QUOTA_MB with WEB_CONCURRENCY.
+#
+# Usage:
+#   gunicorn -c mock_ai_backend/gunicorn.conf.py main:app          (from the repository root)
+#   WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py main:app          (from mock_ai_backend/)
+
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(4, multiprocessing.cpu_count()))))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "60"))
+keepalive = 5
+# Recycle workers after this many requests (0 = never); new workers fork from the preloaded master
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+# Registry entries the master loads before forking: comma-separated names, "all" or "none".
+# Only what survives fork() belongs here. MediaPipe graphs run their own threads and
+# TensorFlow's runtime is not fork-safe, so by default the master imports the analysis
+# modules and loads the emotion model weights only for the ONNX backend, whose session
+# is single-threaded (ONNX_INTRA_OP_THREADS=1); workers load the rest on first use.
+_default_preload = "emotion_prediction,video_analysis,speech_to_text"
+if os.getenv("EMOTION_MODEL_BACKEND", "keras").lower() == "onnx" and os.getenv("ONNX_INTRA_OP_THREADS", "1") == "1":
+    _default_preload += ",emotion_detector"
+GUNICORN_PRELOAD_MODELS = os.getenv("GUNICORN_PRELOAD_MODELS", _default_preload).strip().lower()
+
+# Per-process pools: split the cores between workers unless configured explicitly
+os.environ.setdefault("ANALYSIS_WORKERS", str(max(1, multiprocessing.cpu_count() // workers)))
+# Admission limits and scratch quotas are totals for the whole server, split between the workers
+os.environ.setdefault("SERVER_PROCESSES", str(workers))
+# Every worker writes its stage histograms here; /metrics on any worker reports all of them
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), f"mock_ai_metrics_{os.getpid()}"))
+
+
+def on_starting(server):
+    shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
+    os.makedirs(os.environ["METRICS_DIR"], exist_ok=True)
+
+    # Slots left by a previous server are stale (and their worker PIDs may be reused)
+    from services.admission import get_admission_slots
+    get_admission_slots().clear()
+
+
+def when_ready(server):
+    """Runs in the master after the app is imported and before any worker is forked"""
+    from services.model_registry import registry
+
+    if GUNICORN_PRELOAD_MODELS != "none":
+        names = None if GUNICORN_PRELOAD_MODELS == "all" else [
+            name.strip() for name in GUNICORN_PRELOAD_MODELS.split(",") if name.strip()
+        ]
+        server.log.info(f"📦 Loading models in the master before forking {workers} workers")
+        registry.preload(names)
+        server.log.info(f"📦 Models loaded: {registry.status()}")
+    if GUNICORN_PRELOAD_MODELS != "all" and "emotion_detector" not in GUNICORN_PRELOAD_MODELS:
+        server.log.warning("⚠️ Emotion model weights are not preloaded: each worker loads its own copy "
+                           "(set EMOTION_MODEL_BACKEND=onnx to share them)")
+
+    # Move everything allocated so far out of the collector's reach: collections
+    # in the workers then never write to (and so never copy) the shared pages
+    gc.freeze()
+
+
+def on_exit(server):
+    shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
@@ -1,9 +1,21 @@
 # ✅ FastAPI imports and setup
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from routes import facial_audio_evaluation
 from routes import resume, jd, questions, feedback
 from routes import auth  # ← Add this import
+from routes import sessions
+from routes import uploads
+from routes import live
+from services.model_registry import registry, PRELOAD_MODELS
+from services.tracing import metrics
+from services.admission import ADMISSION_BY_PATH, client_key
+from services.upload_store import get_upload_store, UPLOAD_CLEANUP_INTERVAL
+from services.auth_store import get_user_store
+from services.answer_evaluator import get_evaluation_jobs, get_reference_answers
+from services.scratch_space import get_scratch_manager
 
 app = FastAPI()
 
@@ -16,6 +28,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ✅ Reject heavy requests before their upload is read when the queue is already full
+@app.middleware("http")
+async def admission_precheck(request: Request, call_next):
+    controller = ADMISSION_BY_PATH.get(request.url.path)
+    if controller is not None and request.method == "POST":
+        rejection = await controller.precheck_response(await client_key(request))
+        if rejection is not None:
+            return rejection
+    return await call_next(request)
+
 # ✅ Routers
 app.include_router(auth.router, prefix="/auth")  # ← Add this line
 app.include_router(resume.router, prefix="/resume")
@@ -24,8 +46,60 @@ app.include_router(questions.router, prefix="/questions")
 # app.include_router(audio_checker.router, prefix="/check")
 app.include_router(feedback.router, prefix="/feedback")
 app.include_router(facial_audio_evaluation.router, prefix="/emotion")
+app.include_router(sessions.router, prefix="/sessions")
+app.include_router(uploads.router, prefix="/uploads")
+app.include_router(live.router, prefix="/live")
+
+# ✅ Warm heavy models in the background; requests are served while they load
+@app.on_event("startup")
+def preload_models():
+    if PRELOAD_MODELS:
+        registry.preload_in_background()
+
+# ✅ Periodically drop expired rows and files: (what is removed, blocking cleanup returning a count)
+PERIODIC_CLEANUPS = [
+    ("expired upload(s)", lambda: get_upload_store().cleanup_expired()),  # Also orphaned files from crashed workers
+    ("expired auth session(s)", lambda: get_user_store().purge_expired_sessions()),
+    ("old LLM evaluation job(s)", lambda: get_evaluation_jobs().cleanup()),
+    ("old reference answer(s)", lambda: get_reference_answers().cleanup()),
+]
+
+async def _cleanup_forever():
+    while True:
+        for label, cleanup in PERIODIC_CLEANUPS:
+            try:
+                removed = await asyncio.to_thread(cleanup)
+                if removed:
+                    print(f"🧹 Removed {removed} {label}")
+            except Exception as e:
+                print(f"⚠️ Cleanup of {label} failed: {e}")
+        await asyncio.sleep(UPLOAD_CLEANUP_INTERVAL)
+
+@app.on_event("startup")
+async def start_periodic_cleanup():
+    app.state.cleanup_task = asyncio.create_task(_cleanup_forever())
+
+# ✅ Drop scratch directories left behind by crashed or restarted workers
+@app.on_event("startup")
+async def sweep_scratch_space():
+    removed = await asyncio.to_thread(get_scratch_manager().sweep_orphans)
+    if removed:
+        print(f"🧹 Removed {removed} orphaned scratch director{'y' if removed == 1 else 'ies'}")
 
 # ✅ Root route
 @app.get("/")
 def read_root():
-    return {"message": "Mock AI Backend is Running"}
\ No newline at end of file
+    return {"message": "Mock AI Backend is Running"}
+
+# ✅ Readiness: 200 only once every model is loaded (liveness stays on /emotion/health)
+@app.get("/ready")
+def readiness():
+    models = registry.status()
+    if not registry.ready():
+        return JSONResponse(status_code=503, content={"ready": False, "models": models})
+    return {"ready": True, "models": models}
+
+# ✅ Prometheus-style stage duration histograms
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return metrics.render_prometheus()
\ No newline at end of file
@@ -0,0 +1,46 @@
+# models/evaluation.py
+
+from pydantic import BaseModel, Field, field_validator
+from typing import Literal
+
+EVALUATION_STATUSES = ("Correct", "Partially Correct", "Incorrect")
+
+
+class AnswerEvaluation(BaseModel):
+    """The JSON object the LLM is asked to return for one answer"""
+
+    status: Literal["Correct", "Partially Correct", "Incorrect"]
+    score: int = Field(..., ge=0, le=100)
+    feedback: str = ""
+    reasoning: str = ""
+    suggestions: str = ""
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def _normalize_status(cls, value):
+        # Models vary the case and spacing ("partially correct", "Partially_Correct")
+        if isinstance(value, str):
+            key = " ".join(value.replace("_", " ").split()).lower()
+            for status in EVALUATION_STATUSES:
+                if key == status.lower():
+                    return status
+        return value
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def _round_score(cls, value):
+        # "85", 85.0, 84.6 and "85/100" are all a score of 85
+        if isinstance(value, str):
+            value = value.split("/")[0].strip()
+        try:
+            return round(float(value))
+        except (TypeError, ValueError):
+            return value
+
+    @field_validator("feedback", "reasoning", "suggestions", mode="before")
+    @classmethod
+    def _join_lists(cls, value):
+        # Suggestions in particular often come back as a list of strings
+        if isinstance(value, list):
+            return " ".join(str(item) for item in value)
+        return "" if value is None else value
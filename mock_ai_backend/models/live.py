@@ -0,0 +1,28 @@
+# models/live.py
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import List, Literal, Optional, Union
+
+
+class LiveStart(BaseModel):
+    """First message of a live interview WebSocket (see routes/live.py)"""
+
+    type: Literal["start"]
+    question: str = Field(..., min_length=1)
+    question_index: int = Field(0, ge=0)
+    session_id: Optional[str] = None
+    sample_rate: int = Field(16000, gt=0, le=192000, description="PCM sample rate of the audio messages")
+    jd_keywords: Optional[Union[List[str], str]] = None
+    detailed_feedback: bool = False
+
+    @field_validator("question", mode="before")
+    @classmethod
+    def _strip_question(cls, value):
+        return value.strip() if isinstance(value, str) else value
+
+
+def describe_validation_error(error: ValidationError) -> str:
+    """One line per invalid field, e.g. "sample_rate: Input should be greater than 0" """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'message'}: {err['msg']}" for err in error.errors()
+    )
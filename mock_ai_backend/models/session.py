@@ -0,0 +1,47 @@
+# models/session.py
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+# Metric columns stored per answer (and averaged per session)
+METRIC_FIELDS = ("eye_contact", "smile", "posture", "confidence", "hand_movement", "head_nod")
+
+# Columns a client may project in list/detail reads. Heavy JSON blobs are only
+# returned when asked for explicitly, so history screens stay cheap.
+SESSION_FIELDS = (
+    "id", "title", "status", "created_at", "updated_at",
+    "question_count", "answer_count", "overall_score", "summary"
+)
+SESSION_DEFAULT_FIELDS = (
+    "id", "title", "status", "created_at", "question_count", "answer_count", "overall_score"
+)
+
+ANSWER_FIELDS = (
+    "question_index", "question", "created_at", *METRIC_FIELDS,
+    "score", "transcript", "analysis", "evaluation", "feedback", "timeline"
+)
+ANSWER_DEFAULT_FIELDS = ("question_index", "question", "created_at", *METRIC_FIELDS, "score")
+
+# Fields stored as JSON text
+JSON_FIELDS = ("summary", "analysis", "evaluation", "feedback", "timeline")
+
+
+class SessionCreate(BaseModel):
+    title: Optional[str] = None
+    questions: List[str] = Field(default_factory=list)
+
+
+class SessionPage(BaseModel):
+    sessions: List[dict]
+    next_cursor: Optional[str] = None
+
+
+def parse_fields(fields: Optional[str], allowed: tuple, default: tuple) -> tuple:
+    """Turn a comma-separated ``fields`` query value into a validated projection"""
+    if not fields:
+        return default
+    requested = tuple(f.strip() for f in fields.split(",") if f.strip())
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
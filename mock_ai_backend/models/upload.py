@@ -0,0 +1,20 @@
+# models/upload.py
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class UploadInit(BaseModel):
+    size: int = Field(..., gt=0, description="Total file size in bytes")
+    filename: Optional[str] = None
+    chunk_size: Optional[int] = Field(None, gt=0, description="Requested chunk size; the server may adjust it")
+    sha256: Optional[str] = Field(None, description="Optional hex digest of the whole file, checked at finalize")
+
+
+class UploadFinalize(BaseModel):
+    question: str
+    question_index: int = Field(..., ge=0)
+    session_id: Optional[str] = None
+    include_timings: bool = False
+    jd_keywords: Optional[List[str]] = Field(None, description="Job-description keywords for transcript coverage")
+    detailed_feedback: bool = Field(False, description="Always request the LLM answer evaluation in the background")
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-import hashlib
-import secrets
+from services.auth_store import (
+    get_user_store,
+    get_current_user,
+    bearer_scheme,
+    session_cache,
+    hash_password_async,
+    verify_password_async
+)
 
 router = APIRouter()
 
@@ -22,48 +30,33 @@ class UserResponse(BaseModel):
     name: str
     token: Optional[str] = None
 
-# Simple in-memory storage (replace with your database later)
-users_db = {}
-
-def hash_password(password: str) -> str:
-    """Simple password hashing"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def generate_token() -> str:
-    """Generate a simple token"""
-    return secrets.token_urlsafe(32)
-
 @router.post("/signup", response_model=UserResponse)
 async def signup(user_data: UserSignup):
     """User signup endpoint"""
     try:
-        # Check if user already exists
-        if user_data.email in users_db:
+        store = get_user_store()
+
+        # Check if user already exists (store calls are SQLite I/O, so they run off the event loop)
+        if await run_in_threadpool(store.get_user_by_email, user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User with this email already exists"
             )
         
-        # Create new user
-        user_id = secrets.token_urlsafe(8)
-        hashed_password = hash_password(user_data.password)
-        token = generate_token()
-        
-        # Store user
-        users_db[user_data.email] = {
-            "id": user_id,
-            "email": user_data.email,
-            "name": user_data.name,
-            "password": hashed_password,
-            "token": token
-        }
+        # Create new user (hashing runs off the event loop)
+        hashed_password = await hash_password_async(user_data.password)
+        try:
+            user = await run_in_threadpool(store.create_user, user_data.email, user_data.name, hashed_password)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        token = await run_in_threadpool(store.create_session, user["id"])
         
         print(f"User created: {user_data.email}")  # Debug log
         
         return UserResponse(
-            id=user_id,
-            email=user_data.email,
-            name=user_data.name,
+            id=user["id"],
+            email=user["email"],
+            name=user["name"],
             token=token
         )
         
@@ -82,28 +75,27 @@ async def login(user_data: UserLogin):
     try:
         print(f"Login attempt for: {user_data.email}")  # Debug log
         
-        # Check if user exists
-        if user_data.email not in users_db:
+        store = get_user_store()
+
+        # Check if user exists (store calls are SQLite I/O, so they run off the event loop)
+        user = await run_in_threadpool(store.get_user_by_email, user_data.email)
+        if user is None:
             print(f"User not found: {user_data.email}")  # Debug log
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
-        user = users_db[user_data.email]
-        hashed_password = hash_password(user_data.password)
-        
-        # Verify password
-        if user["password"] != hashed_password:
+        # Verify password (hashing runs off the event loop)
+        if not await verify_password_async(user_data.password, user["password_hash"]):
             print(f"Invalid password for: {user_data.email}")  # Debug log
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
-        # Generate new token
-        token = generate_token()
-        users_db[user_data.email]["token"] = token
+        # Generate new session token
+        token = await run_in_threadpool(store.create_session, user["id"])
         
         print(f"Login successful for: {user_data.email}")  # Debug log
         
@@ -124,15 +116,24 @@ async def login(user_data: UserLogin):
         )
 
 @router.post("/logout")
-async def logout():
+async def logout(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)):
     """User logout endpoint"""
+    if credentials:
+        await run_in_threadpool(get_user_store().delete_session, credentials.credentials)
+        await run_in_threadpool(session_cache.invalidate, credentials.credentials)
     return {"message": "Logged out successfully"}
 
+@router.get("/me", response_model=UserResponse)
+async def me(user: dict = Depends(get_current_user)):
+    """Current user for a bearer token"""
+    return UserResponse(id=user["id"], email=user["email"], name=user["name"])
+
 # Debug endpoint to see registered users
 @router.get("/debug/users")
 async def debug_users():
     """Debug endpoint - remove in production"""
+    emails = await run_in_threadpool(get_user_store().list_emails)
     return {
-        "total_users": len(users_db),
-        "emails": list(users_db.keys())
+        "total_users": len(emails),
+        "emails": emails
     }
\ No newline at end of file
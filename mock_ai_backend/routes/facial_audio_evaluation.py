@@ -4,23 +4,61 @@ import logging
 import traceback
 import tempfile
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Depends, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import asyncio
 from datetime import datetime
 
 # Import your existing modules
 try:
-    from script.predict_emotion import predict_emotions_on_frames
-    from utils.video_analysis_utils import analyze_video
     from services.feedback_generator import generate_feedback
-    from services.audio_to_text import convert_voice_to_text
-    from services.answer_checker import evaluate_answer
+    from services.answer_evaluator import evaluate_tiered, get_evaluation_jobs, start_llm_evaluation
+    from services.model_registry import registry
+    from services.tracing import trace_stage, traced, start_request_trace, SlowRequestProfiler
+    from services.admission import (
+        single_admission,
+        interview_admission,
+        client_key,
+        run_in_analysis_executor
+    )
+    from services.auth_store import get_optional_user
+    from services.session_store import get_session_store
+    from services.batch_stream import (
+        BatchAggregate,
+        BatchStreamError,
+        MemoryBudget,
+        MultipartVideoStream,
+        BATCH_MAX_VIDEOS,
+        BATCH_MEMORY_BUDGET_MB,
+        encode_event,
+        estimate_video_memory
+    )
+    from services.video_normalizer import normalize_video
+    from services.scratch_space import ScratchDir, ScratchQuotaExceeded, get_scratch_manager
+    from services.transcript_analytics import (
+        analyze_transcript,
+        audio_duration,
+        merge_feedback,
+        normalize_keywords,
+        speech_feedback
+    )
 except ImportError as e:
     logging.error(f"Failed to import required modules: {e}")
     raise
 
+# TensorFlow/Keras, MediaPipe and moviepy-backed modules are loaded on first use
+# (or by the background preload) so importing this router stays cheap
+def predict_emotions_on_frames(file_paths):
+    return registry.get("emotion_prediction").predict_emotions_on_frames(file_paths)
+
+def analyze_video(video_path: str) -> dict:
+    return registry.get("video_analysis").analyze_video(video_path)
+
+def convert_voice_to_text(video_path: str, audio_path: str = None) -> str:
+    return registry.get("speech_to_text").convert_voice_to_text(video_path, audio_path)
+
 router = APIRouter()
 
 # Enhanced logging configuration
@@ -30,6 +68,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Direct multipart uploads; larger recordings go through the resumable /uploads API
+MAX_VIDEO_SIZE = 100 * 1024 * 1024  # 100MB limit
+
 class VideoProcessingError(Exception):
     """Custom exception for video processing errors"""
     pass
@@ -57,6 +98,7 @@ def validate_video_file(file_path: str) -> bool:
         logger.error(f"Video file validation failed: {e}")
         return False
 
+@traced("emotion")
 def safe_predict_emotions(video_path: str) -> List[dict]:
     """Safely predict emotions with error handling"""
     try:
@@ -74,6 +116,7 @@ def safe_predict_emotions(video_path: str) -> List[dict]:
             "error": f"Emotion prediction failed: {str(e)}"
         }]
 
+@traced("multimodal")
 def safe_analyze_video(video_path: str) -> dict:
     """Safely analyze video with error handling"""
     try:
@@ -94,11 +137,12 @@ def safe_analyze_video(video_path: str) -> dict:
             "error": f"Video analysis failed: {str(e)}"
         }
 
-def safe_convert_voice_to_text(video_path: str) -> str:
+@traced("transcription")
+def safe_convert_voice_to_text(video_path: str, audio_path: str = None) -> str:
     """Safely convert voice to text with error handling"""
     try:
         logger.info(f"🎤 Starting audio conversion for: {video_path}")
-        transcript = convert_voice_to_text(video_path)
+        transcript = convert_voice_to_text(video_path, audio_path)
         logger.info(f"✅ Audio conversion completed: {len(transcript) if transcript else 0} characters")
         return transcript if transcript else ""
     except Exception as e:
@@ -106,8 +150,14 @@ def safe_convert_voice_to_text(video_path: str) -> str:
         logger.error(f"❌ Traceback: {traceback.format_exc()}")
         return ""
 
-def safe_evaluate_answer(question: str, transcript: str) -> dict:
-    """Safely evaluate answer with error handling"""
+@traced("answer_evaluation")
+def safe_evaluate_answer(question: str, transcript: str, detailed: bool = False, jd_keywords=None,
+                         start_llm: bool = True) -> dict:
+    """
+    Safely evaluate answer with error handling. Returns the local score at once;
+    an uncertain (or ``detailed``) answer also gets a background LLM job whose
+    result is polled at /emotion/evaluations/{llm_job_id}.
+    """
     try:
         if not transcript or transcript.strip() == "":
             return {
@@ -119,8 +169,8 @@ def safe_evaluate_answer(question: str, transcript: str) -> dict:
             }
         
         logger.info(f"📝 Starting answer evaluation...")
-        result = evaluate_answer(question, transcript)
-        logger.info(f"✅ Answer evaluation completed with score: {result.get('score', 0)}")
+        result = evaluate_tiered(question, transcript, detailed=detailed, jd_keywords=jd_keywords, start=start_llm)
+        logger.info(f"✅ Answer evaluation completed with score: {result.get('score', 0)} ({result.get('tier')})")
         return result
     except Exception as e:
         logger.error(f"❌ Answer evaluation failed: {str(e)}")
@@ -133,6 +183,18 @@ def safe_evaluate_answer(question: str, transcript: str) -> dict:
             "suggestions": "Please try again later"
         }
 
+@traced("transcript_analytics")
+def safe_analyze_transcript(transcript: str, media_path: str = None, jd_keywords=None, duration: float = None) -> dict:
+    """Local filler/pace/JD keyword metrics for a transcript (no LLM call)"""
+    try:
+        if duration is None:
+            duration = audio_duration(media_path)
+        return analyze_transcript(transcript, duration, jd_keywords)
+    except Exception as e:
+        logger.error(f"❌ Transcript analytics failed: {str(e)}")
+        return {}
+
+@traced("feedback")
 def safe_generate_feedback(analysis: dict) -> dict:
     """Safely generate feedback with error handling"""
     try:
@@ -155,43 +217,216 @@ def safe_generate_feedback(analysis: dict) -> dict:
             "suggestions": ["Please try again later"]
         }
 
-def create_safe_temp_directory() -> str:
-    """Create a safe temporary directory with proper permissions"""
+def create_safe_temp_directory(prefix: str = "interview_video", expected_bytes: Optional[int] = None) -> ScratchDir:
+    """
+    Isolated per-request scratch directory (tmpfs for small inputs, disk when the
+    size is unknown); 507 when scratch quota is exhausted
+    """
     try:
-        # Use system temp directory for better reliability
-        temp_dir = tempfile.mkdtemp(prefix="interview_video_")
-        logger.info(f"Created temporary directory: {temp_dir}")
-        return temp_dir
-    except Exception as e:
-        logger.error(f"Failed to create temp directory: {e}")
-        # Fallback to current directory
-        fallback_dir = os.path.join(os.getcwd(), "temp_single_upload")
-        os.makedirs(fallback_dir, exist_ok=True)
-        return fallback_dir
-
-def cleanup_temp_files(temp_dir: str, file_path: str = None):
-    """Safely cleanup temporary files and directories"""
+        temp_dir = get_scratch_manager().allocate(prefix, expected_bytes)
+    except ScratchQuotaExceeded as e:
+        logger.error(f"❌ {e}")
+        raise HTTPException(status_code=507, detail="Server is out of scratch space, please retry later")
+    logger.info(f"Created temporary directory: {temp_dir} ({temp_dir.tier})")
+    return temp_dir
+
+def cleanup_temp_files(temp_dir, file_path: str = None):
+    """Hand temporary files/directories to the background cleaner (never blocks the caller)"""
     try:
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
-            logger.info(f"Removed temp file: {file_path}")
-        
-        if temp_dir and os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            logger.info(f"Removed temp directory: {temp_dir}")
+        manager = get_scratch_manager()
+        if temp_dir:
+            manager.release(temp_dir)  # Removes everything inside, including file_path
+        elif file_path:
+            manager.discard(file_path)
     except Exception as e:
         logger.warning(f"Cleanup warning (non-critical): {e}")
 
+def save_upload_file(source, file_path: str, max_size: int, too_large_detail: str) -> int:
+    """Copy an uploaded (spooled) file to ``file_path`` in 1MB blocks; blocking, so call it off the event loop"""
+    file_size = 0
+    with open(file_path, "wb") as buffer:
+        while chunk := source.read(1024 * 1024):
+            file_size += len(chunk)
+            if file_size > max_size:
+                raise HTTPException(status_code=413, detail=too_large_detail)
+            buffer.write(chunk)
+    return file_size
+
+def analysis_inputs(file_path: str):
+    """Proxy video + speech WAV for the analyzers (the original file if normalization is off or fails)"""
+    with trace_stage("normalize"):
+        return normalize_video(file_path)
+
+def run_single_analysis(file_path: str, question: str, jd_keywords: list = None, detailed: bool = False) -> tuple:
+    """Blocking analysis pipeline for one answer video (runs on the shared analysis executor)"""
+    with SlowRequestProfiler("analyze_single"), analysis_inputs(file_path) as media:
+        # Run all analysis steps with individual error handling
+        multimodal_result = safe_analyze_video(media.video_path)
+        # Emotions come from the same batched face-emotion pass as confidence
+        emotion_result = multimodal_result.pop("emotion", None)
+        if emotion_result is None:
+            emotion_result = safe_predict_emotions(media.video_path)
+        timeline = multimodal_result.pop("timeline", [])
+        transcript = safe_convert_voice_to_text(file_path, media.audio_path)
+        transcript_analytics = safe_analyze_transcript(transcript, media.audio_path or file_path, jd_keywords)
+
+        # Combine analysis results
+        combined_analysis = {
+            "emotion": emotion_result,
+            "transcript": transcript,
+            "eye_contact": multimodal_result.get("eye_contact", 0.0),
+            "smile": multimodal_result.get("smile", 0.0),
+            "posture": multimodal_result.get("posture", 0.0),
+            "confidence": multimodal_result.get("confidence", 0.0),
+            "hand_movement": multimodal_result.get("hand_movement", 0.0),
+            "head_nod": multimodal_result.get("head_nod", 0.0),
+            # None (not 0.0) whenever nods could not be measured: analysis failed, too
+            # few head-pose samples, or sampling below the nod band's Nyquist rate
+            "nod_frequency": multimodal_result.get("nod_frequency"),
+            "nod_amplitude": multimodal_result.get("nod_amplitude"),
+            "face_presence": multimodal_result.get("face_presence", 0.0),
+            "multiple_faces": multimodal_result.get("multiple_faces", 0.0),
+            "transcript_analytics": transcript_analytics
+        }
+
+        # Evaluate answer; any LLM job is started by the caller once the answer is stored
+        answer_evaluation = safe_evaluate_answer(question, transcript, detailed, jd_keywords, start_llm=False)
+
+        # Generate feedback (speech metrics add their own points, independent of the LLM)
+        feedback = merge_feedback(safe_generate_feedback(combined_analysis), speech_feedback(transcript_analytics))
+
+        return combined_analysis, answer_evaluation, feedback, timeline
+
+async def analyze_video_file(file_path: str, original_filename: str, file_size: int, question: str,
+                             question_index: int, session_id: Optional[str] = None,
+                             user: Optional[dict] = None, jd_keywords: list = None,
+                             detailed: bool = False) -> dict:
+    """
+    Analyze an already saved, validated answer video in place and build the
+    analyze-single response. The caller owns (and removes) the file.
+    """
+    try:
+        logger.info(f"🎬 Starting video processing pipeline...")
+
+        # Heavy work runs on the shared executor so the event loop stays responsive
+        combined_analysis, answer_evaluation, feedback, timeline = await run_in_analysis_executor(
+            run_single_analysis, file_path, question, jd_keywords, detailed
+        )
+
+        # Persist the answer so history screens never need to re-run the models;
+        # the session's running aggregate comes back for instant overall feedback
+        session_summary = None
+        if session_id:
+            with trace_stage("persist_answer"):
+                session_summary = await run_in_threadpool(
+                    get_session_store().add_answer,
+                    session_id, user["id"], question_index, question,
+                    combined_analysis, answer_evaluation, feedback, timeline
+                )
+            if session_summary is None:
+                logger.warning(f"⚠️ Session {session_id} not found for user {user['id']}, answer not saved")
+
+        # The LLM result replaces the provisional score in the stored answer when it arrives
+        session_target = (session_id, user["id"], question_index) if session_summary is not None else None
+        start_llm_evaluation(answer_evaluation, session_target)
+
+        # Success response
+        response_data = {
+            "success": True,
+            "question": question,
+            "question_index": question_index,
+            "video_name": original_filename,
+            "analysis": combined_analysis,
+            "answer_evaluation": answer_evaluation,
+            "feedback": feedback,
+            "session_id": session_id,
+            "session_summary": session_summary,
+            "timestamp": datetime.now().timestamp(),
+            "processing_status": "completed",
+            "file_size": file_size,
+            "processing_time": datetime.now().isoformat()
+        }
+
+        logger.info(f"✅ Single video analysis completed successfully for question {question_index}")
+        return response_data
+
+    except Exception as processing_error:
+        logger.error(f"❌ Video processing pipeline failed: {str(processing_error)}")
+        logger.error(f"❌ Processing traceback: {traceback.format_exc()}")
+
+        # Return partial results with error information
+        return {
+            "success": False,
+            "question": question,
+            "question_index": question_index,
+            "video_name": original_filename,
+            "error": f"Processing failed: {str(processing_error)}",
+            "analysis": {
+                "emotion": [],
+                "transcript": "",
+                "eye_contact": 0.0,
+                "smile": 0.0,
+                "posture": 0.0,
+                "confidence": 0.0,
+                "hand_movement": 0.0,
+                "head_nod": 0.0,
+                "processing_error": str(processing_error)
+            },
+            "answer_evaluation": {
+                "status": "Error",
+                "score": 0,
+                "feedback": "Video processing failed",
+                "reasoning": str(processing_error),
+                "suggestions": "Please try recording again"
+            },
+            "feedback": {
+                "overall_score": 0,
+                "strengths": [],
+                "weaknesses": ["Video processing failed"],
+                "suggestions": ["Please try recording again"]
+            },
+            "timestamp": datetime.now().timestamp(),
+            "processing_status": "failed",
+            "file_size": file_size
+        }
+
 # NEW ENDPOINT: Enhanced Single Video Analysis
 @router.post("/analyze-single")
 async def analyze_single_video(
+    request: Request,
     video: UploadFile = File(...),
     question: str = Form(...),
-    question_index: int = Form(...)
+    question_index: int = Form(...),
+    include_timings: bool = Form(False),
+    session_id: Optional[str] = Form(None),
+    jd_keywords: Optional[str] = Form(None),
+    detailed_feedback: bool = Form(False),
+    user: Optional[dict] = Depends(get_optional_user)
 ):
     """
-    Enhanced single video analysis endpoint with comprehensive error handling
+    Enhanced single video analysis endpoint with comprehensive error handling.
+    ``jd_keywords`` (a JSON array such as /jd/upload's keywords, or comma-separated)
+    adds job-description keyword coverage to the transcript analytics.
+    ``detailed_feedback`` always requests the LLM evaluation in the background.
     """
+    if session_id and user is None:
+        raise HTTPException(status_code=401, detail="Sign in to save answers to a session")
+
+    trace = start_request_trace()
+    with trace_stage("request.analyze_single"):
+        async with single_admission.admit(await client_key(request)):
+            response = await _analyze_single_video(
+                video, question, question_index, session_id, user, normalize_keywords(jd_keywords),
+                detailed_feedback
+            )
+
+    if include_timings and isinstance(response, dict):
+        response["timings"] = trace.as_dict()
+    return response
+
+async def _analyze_single_video(video: UploadFile, question: str, question_index: int,
+                                session_id: Optional[str] = None, user: Optional[dict] = None,
+                                jd_keywords: list = None, detailed: bool = False) -> dict:
     temp_dir = None
     file_path = None
     
@@ -210,129 +445,46 @@ async def analyze_single_video(
         logger.info(f"📁 Video file: {video.filename}, Content type: {video.content_type}")
         
         # Create secure temp directory
-        temp_dir = create_safe_temp_directory()
+        temp_dir = create_safe_temp_directory("single_video", video.size)
         
         # Generate safe filename
         original_filename = video.filename or f"question_{question_index}_video.mp4"
         safe_filename = f"video_{question_index}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
         file_path = os.path.join(temp_dir, safe_filename)
         
-        # Save uploaded video with size check
-        max_file_size = 100 * 1024 * 1024  # 100MB limit
-        file_size = 0
-        
+        # Save uploaded video with size check (off the event loop)
         try:
-            with open(file_path, "wb") as buffer:
-                while chunk := await video.read(8192):  # Read in 8KB chunks
-                    file_size += len(chunk)
-                    if file_size > max_file_size:
-                        raise HTTPException(status_code=413, detail="File size too large (max 100MB)")
-                    buffer.write(chunk)
+            with trace_stage("save_upload"):
+                await video.seek(0)
+                file_size = await asyncio.to_thread(
+                    save_upload_file, video.file, file_path, MAX_VIDEO_SIZE, "File size too large (max 100MB)"
+                )
             
             logger.info(f"✅ Video saved successfully: {file_path} ({file_size} bytes)")
             
+        except HTTPException:
+            raise
         except Exception as e:
             cleanup_temp_files(temp_dir, file_path)
             logger.error(f"❌ Failed to save video file: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to save video: {str(e)}")
         
         # Validate video file
-        if not validate_video_file(file_path):
+        with trace_stage("validate"):
+            is_valid = validate_video_file(file_path)
+        if not is_valid:
             cleanup_temp_files(temp_dir, file_path)
             raise HTTPException(status_code=400, detail="Invalid or corrupted video file")
         
-        # Process video analysis with timeout
+        # Process video analysis
         try:
-            logger.info(f"🎬 Starting video processing pipeline...")
-            
-            # Run all analysis steps with individual error handling
-            emotion_result = safe_predict_emotions(file_path)
-            multimodal_result = safe_analyze_video(file_path)
-            transcript = safe_convert_voice_to_text(file_path)
-            
-            # Combine analysis results
-            combined_analysis = {
-                "emotion": emotion_result,
-                "transcript": transcript,
-                "eye_contact": multimodal_result.get("eye_contact", 0.0),
-                "smile": multimodal_result.get("smile", 0.0),
-                "posture": multimodal_result.get("posture", 0.0),
-                "confidence": multimodal_result.get("confidence", 0.0),
-                "hand_movement": multimodal_result.get("hand_movement", 0.0),
-                "head_nod": multimodal_result.get("head_nod", 0.0)
-            }
-            
-            # Evaluate answer
-            answer_evaluation = safe_evaluate_answer(question, transcript)
-            
-            # Generate feedback
-            feedback = safe_generate_feedback(combined_analysis)
-            
-            # Success response
-            response_data = {
-                "success": True,
-                "question": question,
-                "question_index": question_index,
-                "video_name": original_filename,
-                "analysis": combined_analysis,
-                "answer_evaluation": answer_evaluation,
-                "feedback": feedback,
-                "timestamp": datetime.now().timestamp(),
-                "processing_status": "completed",
-                "file_size": file_size,
-                "processing_time": datetime.now().isoformat()
-            }
-            
-            logger.info(f"✅ Single video analysis completed successfully for question {question_index}")
-            
-            # Cleanup before returning
-            cleanup_temp_files(temp_dir, file_path)
-            
-            return response_data
-            
-        except Exception as processing_error:
-            logger.error(f"❌ Video processing pipeline failed: {str(processing_error)}")
-            logger.error(f"❌ Processing traceback: {traceback.format_exc()}")
-            
-            # Cleanup on error
+            return await analyze_video_file(
+                file_path, original_filename, file_size, question, question_index, session_id, user,
+                jd_keywords, detailed
+            )
+        finally:
             cleanup_temp_files(temp_dir, file_path)
             
-            # Return partial results with error information
-            return {
-                "success": False,
-                "question": question,
-                "question_index": question_index,
-                "video_name": original_filename,
-                "error": f"Processing failed: {str(processing_error)}",
-                "analysis": {
-                    "emotion": [],
-                    "transcript": "",
-                    "eye_contact": 0.0,
-                    "smile": 0.0,
-                    "posture": 0.0,
-                    "confidence": 0.0,
-                    "hand_movement": 0.0,
-                    "head_nod": 0.0,
-                    "processing_error": str(processing_error)
-                },
-                "answer_evaluation": {
-                    "status": "Error",
-                    "score": 0,
-                    "feedback": "Video processing failed",
-                    "reasoning": str(processing_error),
-                    "suggestions": "Please try recording again"
-                },
-                "feedback": {
-                    "overall_score": 0,
-                    "strengths": [],
-                    "weaknesses": ["Video processing failed"],
-                    "suggestions": ["Please try recording again"]
-                },
-                "timestamp": datetime.now().timestamp(),
-                "processing_status": "failed",
-                "file_size": file_size if 'file_size' in locals() else 0
-            }
-            
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         cleanup_temp_files(temp_dir, file_path)
@@ -372,33 +524,10 @@ def average_analysis(all_results: List[dict]) -> dict:
     if not all_results:
         return {}
 
-    num = len(all_results)
-    keys = ["eye_contact", "smile", "posture", "confidence", "hand_movement", "head_nod"]
-    avg = {k: 0.0 for k in keys}
-
-    for result in all_results:
-        analysis = result["analysis"]
-        for key in keys:
-            avg[key] += analysis.get(key, 0.0)
-
-    for key in keys:
-        avg[key] = round(avg[key] / num, 2)
-
-    all_emotions = []
-    all_transcripts = []
-
+    aggregate = BatchAggregate()
     for result in all_results:
-        analysis = result["analysis"]
-        if analysis.get("emotion"):
-            all_emotions.extend(analysis["emotion"])
-        if analysis.get("transcript"):
-            all_transcripts.append(analysis["transcript"])
-
-    avg["emotion"] = all_emotions
-    avg["transcripts"] = all_transcripts
-    avg["combined_transcript"] = " ".join(all_transcripts) if all_transcripts else ""
-
-    return avg
+        aggregate.add(result["analysis"])
+    return aggregate.analysis()
 
 def process_single_video(video_path: str, index: int) -> dict:
     """Process a single video file (used for batch processing)"""
@@ -408,14 +537,20 @@ def process_single_video(video_path: str, index: int) -> dict:
         if not validate_video_file(video_path):
             raise VideoProcessingError(f"Invalid video file: {video_path}")
 
-        emotion_result = safe_predict_emotions(video_path)
-        multimodal_result = safe_analyze_video(video_path)
-        transcript = safe_convert_voice_to_text(video_path)
+        with analysis_inputs(video_path) as media:
+            multimodal_result = safe_analyze_video(media.video_path)
+            multimodal_result.pop("timeline", None)
+            emotion_result = multimodal_result.pop("emotion", None)
+            if emotion_result is None:
+                emotion_result = safe_predict_emotions(media.video_path)
+            transcript = safe_convert_voice_to_text(video_path, media.audio_path)
+            transcript_analytics = safe_analyze_transcript(transcript, media.audio_path or video_path)
 
         combined_analysis = {
             "emotion": emotion_result,
             "transcript": transcript,
-            **multimodal_result
+            **multimodal_result,
+            "transcript_analytics": transcript_analytics
         }
 
         return {
@@ -435,12 +570,19 @@ def process_single_video(video_path: str, index: int) -> dict:
 # EXISTING ENDPOINT: Multiple Videos Analysis (enhanced with better error handling)
 @router.post("/analyze-interview")
 async def analyze_interview(
+    request: Request,
     videos: List[UploadFile] = File(...),
-    question: str = Form(...)
+    question: str = Form(...),
+    include_timings: bool = Form(False)
 ):
     """
     Analyze multiple videos for interview assessment (batch processing)
     """
+    async with interview_admission.admit(await client_key(request)):
+        return await _analyze_interview(videos, question, include_timings)
+
+async def _analyze_interview(videos: List[UploadFile], question: str, include_timings: bool) -> dict:
+    trace = start_request_trace()
     temp_dir = None
     file_paths = []
     
@@ -448,12 +590,14 @@ async def analyze_interview(
         if not videos:
             raise HTTPException(status_code=400, detail="No video files provided")
         
-        if len(videos) > 10:  # Reasonable limit
-            raise HTTPException(status_code=400, detail="Too many videos (max 10)")
+        if len(videos) > BATCH_MAX_VIDEOS:  # Reasonable limit
+            raise HTTPException(status_code=400, detail=f"Too many videos (max {BATCH_MAX_VIDEOS})")
         
         logger.info(f"🎯 Starting batch interview analysis for {len(videos)} video(s)")
         
-        temp_dir = create_safe_temp_directory()
+        temp_dir = create_safe_temp_directory(
+            "batch_interview", sum(MAX_VIDEO_SIZE if video.size is None else video.size for video in videos)
+        )
         file_paths = []
 
         # Save all videos first
@@ -462,8 +606,9 @@ async def analyze_interview(
             safe_filename = f"batch_video_{i}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
             file_path = os.path.join(temp_dir, safe_filename)
             
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(video.file, buffer)
+            await asyncio.to_thread(
+                save_upload_file, video.file, file_path, MAX_VIDEO_SIZE, f"{filename} is too large (max 100MB)"
+            )
             
             if validate_video_file(file_path):
                 file_paths.append(file_path)
@@ -473,12 +618,11 @@ async def analyze_interview(
         if not file_paths:
             raise HTTPException(status_code=400, detail="No valid video files found")
 
-        # Process videos in parallel
-        all_results = []
-        with ThreadPoolExecutor(max_workers=3) as executor:  # Limit concurrent processing
-            futures = [executor.submit(process_single_video, path, i) for i, path in enumerate(file_paths)]
-            for future in as_completed(futures):
-                all_results.append(future.result())
+        # Process videos in parallel on the shared executor (bounded across all requests)
+        all_results = await asyncio.gather(*(
+            run_in_analysis_executor(process_single_video, path, i)
+            for i, path in enumerate(file_paths)
+        ))
 
         # Clean up files
         cleanup_temp_files(temp_dir)
@@ -489,9 +633,11 @@ async def analyze_interview(
 
         avg_analysis = average_analysis(successful_results)
         feedback = safe_generate_feedback(avg_analysis)
-        answer_evaluation = safe_evaluate_answer(question, avg_analysis.get("combined_transcript", ""))
+        answer_evaluation = await run_in_analysis_executor(
+            safe_evaluate_answer, question, avg_analysis.get("combined_transcript", "")
+        )
 
-        return {
+        response = {
             "question": question,
             "videos_processed": len(successful_results),
             "total_videos": len(videos),
@@ -508,6 +654,9 @@ async def analyze_interview(
             "timestamp": datetime.now().timestamp(),
             "processing_status": "completed"
         }
+        if include_timings:
+            response["timings"] = trace.as_dict()
+        return response
 
     except HTTPException:
         cleanup_temp_files(temp_dir)
@@ -517,6 +666,161 @@ async def analyze_interview(
         cleanup_temp_files(temp_dir)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+# Streaming batch: videos are analyzed as each one finishes uploading and
+# per-video results are sent as NDJSON lines (or SSE events) as they complete
+@router.post("/analyze-interview/stream")
+async def analyze_interview_stream(request: Request, output_format: Optional[str] = Query(None, alias="format")):
+    """
+    Streamed batch interview analysis. The multipart body carries the same
+    fields as /analyze-interview (videos, question, include_timings); events:
+    accepted (upload of a video finished), result (its analysis plus the running
+    aggregate), error, and a final summary with feedback and evaluation.
+    """
+    caller = await client_key(request)
+    await interview_admission.precheck(caller)
+    sse = output_format == "sse" or (output_format is None and "text/event-stream" in request.headers.get("accept", ""))
+    return StreamingResponse(
+        _stream_interview(request, caller, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _stream_interview(request: Request, caller: str, sse: bool):
+    trace = start_request_trace()
+    temp_dir = None
+    tasks = []
+    receiver = None
+
+    try:
+        async with interview_admission.admit(caller):
+            # Without a Content-Length (chunked body) reserve the most the reader will accept
+            max_bytes = MAX_VIDEO_SIZE * BATCH_MAX_VIDEOS
+            content_length = request.headers.get("content-length", "")
+            temp_dir = create_safe_temp_directory(
+                "batch_stream", min(int(content_length), max_bytes) if content_length.isdigit() else max_bytes
+            )
+            budget = MemoryBudget(BATCH_MEMORY_BUDGET_MB * 2**20)
+            queue = asyncio.Queue()
+            fields = {}
+
+            async def analyze(index: int, video_name: str, path: str):
+                try:
+                    nbytes = await asyncio.to_thread(estimate_video_memory, path)
+                    async with budget.reserve(nbytes):
+                        result = await run_in_analysis_executor(process_single_video, path, index)
+                except Exception as e:
+                    logger.error(f"❌ Error analyzing video {index + 1}: {str(e)}")
+                    result = {"video_index": index + 1, "error": f"Failed to process video {index + 1}: {str(e)}",
+                              "analysis": None}
+                finally:
+                    # The upload is not needed once analyzed; free the disk right away
+                    cleanup_temp_files(None, path)
+                result["video_name"] = video_name
+                await queue.put(("result", result))
+
+            async def receive():
+                try:
+                    reader = MultipartVideoStream(request, temp_dir, MAX_VIDEO_SIZE)
+                    async for event in reader.events():
+                        if event[0] == "field":
+                            fields[event[1]] = event[2]
+                            continue
+                        _, _, filename, path, size = event
+                        index = len(tasks)
+                        logger.info(f"📥 Batch video {index + 1} uploaded: {filename} ({size} bytes)")
+                        await queue.put(("accepted", {"video_index": index + 1, "video_name": filename, "size": size}))
+                        tasks.append(asyncio.create_task(analyze(index, filename, path)))
+                    await queue.put(("uploaded", None))
+                except BatchStreamError as e:
+                    await queue.put(("error", {"status_code": e.status_code, "detail": str(e)}))
+                except Exception as e:
+                    logger.error(f"❌ Failed to read batch upload: {e}")
+                    await queue.put(("error", {"status_code": 400, "detail": f"Failed to read upload: {str(e)}"}))
+
+            receiver = asyncio.create_task(receive())
+            aggregate = BatchAggregate()
+            individual_results = []
+            uploaded = False
+            completed = 0
+
+            while not (uploaded and completed == len(tasks)):
+                kind, payload = await queue.get()
+                if kind == "uploaded":
+                    uploaded = True
+                elif kind == "error":
+                    yield encode_event({"event": "error", **payload}, sse)
+                    return
+                elif kind == "accepted":
+                    yield encode_event({"event": "accepted", **payload}, sse)
+                else:
+                    completed += 1
+                    analysis = payload.get("analysis")
+                    if analysis is not None:
+                        # Fold into the aggregate; the per-video analysis is not kept
+                        aggregate.add(analysis)
+                        individual_results.append({
+                            "video_index": payload["video_index"],
+                            "video_name": payload["video_name"],
+                            "has_transcript": bool(analysis.get("transcript"))
+                        })
+                    yield encode_event({
+                        "event": "result",
+                        **payload,
+                        "completed": completed,
+                        "aggregate": {"videos": aggregate.videos, **aggregate.aggregator.averages()}
+                    }, sse)
+
+            question = (fields.get("question") or "").strip()
+            if not tasks:
+                yield encode_event({"event": "error", "status_code": 400, "detail": "No video files provided"}, sse)
+                return
+            if not question:
+                yield encode_event({"event": "error", "status_code": 400, "detail": "Question is required"}, sse)
+                return
+            if not aggregate.videos:
+                yield encode_event({"event": "error", "status_code": 500, "detail": "No valid analysis results found."}, sse)
+                return
+
+            avg_analysis = aggregate.analysis()
+            feedback = safe_generate_feedback(avg_analysis)
+            answer_evaluation = await run_in_analysis_executor(
+                safe_evaluate_answer, question, avg_analysis.get("combined_transcript", "")
+            )
+            summary = {
+                "event": "summary",
+                "question": question,
+                "videos_processed": aggregate.videos,
+                "total_videos": len(tasks),
+                "analysis": avg_analysis,
+                "feedback": feedback,
+                "answer_evaluation": answer_evaluation,
+                "individual_results": individual_results,
+                "timestamp": datetime.now().timestamp(),
+                "processing_status": "completed"
+            }
+            if fields.get("include_timings", "").lower() in ("1", "true", "yes", "on"):
+                summary["timings"] = trace.as_dict()
+            logger.info(f"✅ Streamed batch analysis completed: {aggregate.videos}/{len(tasks)} video(s)")
+            yield encode_event(summary, sse)
+
+    except HTTPException as e:
+        # Admission rejections once the stream has started
+        yield encode_event({"event": "error", "status_code": e.status_code, "detail": e.detail}, sse)
+    finally:
+        # Client gone or batch aborted: stop reading and drop pending videos
+        for task in ([receiver] if receiver else []) + tasks:
+            task.cancel()
+        cleanup_temp_files(temp_dir)
+
+# Background LLM evaluation of a provisional (locally scored) answer
+@router.get("/evaluations/{job_id}")
+async def get_llm_evaluation(job_id: str):
+    """Status of an ``llm_job_id`` from an answer_evaluation: pending, running, completed or failed"""
+    job = await asyncio.to_thread(get_evaluation_jobs().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    return job
+
 # Health check endpoint
 @router.get("/health")
 async def health_check():
@@ -548,6 +852,7 @@ async def get_system_info():
             "memory_total": psutil.virtual_memory().total,
             "memory_available": psutil.virtual_memory().available,
             "disk_usage": psutil.disk_usage('/').percent,
+            "scratch": get_scratch_manager().status(),
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
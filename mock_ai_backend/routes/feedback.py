@@ -1,7 +1,12 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any
-from services.feedback_generator import generate_feedback, summarize_results
+import numpy as np
+from services.feedback_generator import (
+    FEEDBACK_METRICS,
+    generate_feedback_batch,
+    summarize_matrix
+)
 
 router = APIRouter()
 
@@ -21,9 +26,12 @@ class FeedbackRequest(BaseModel):
 
 @router.post("/generate")
 async def get_feedback(data: FeedbackRequest):
-    result_dicts = [item.dict() for item in data.results]
-    summarized = summarize_results(result_dicts)
-    feedback = generate_feedback(summarized)
+    if not data.results:
+        return {"result": {}, "feedback": generate_feedback_batch(np.full((1, len(FEEDBACK_METRICS)), np.nan))[0]}
+
+    matrix = np.array([[getattr(item, m) for m in FEEDBACK_METRICS] for item in data.results], dtype=np.float64)
+    summarized = summarize_matrix(matrix)
+    feedback = generate_feedback_batch(np.array([list(summarized.values())]))[0]
     return {
         "result": summarized,
         "feedback": feedback
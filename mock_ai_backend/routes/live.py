@@ -0,0 +1,363 @@
+# routes/live.py
+#
+# Live interview mode: the client streams downscaled JPEG frames and PCM audio
+# while answering, landmark metrics are computed as frames arrive and throttled
+# indicators are pushed back. When the stream ends the final aggregate only
+# needs the batched emotion pass, so it is sent almost immediately; the
+# transcript with its local speech metrics and then the answer evaluation follow.
+#
+# Protocol (one WebSocket per answer, /live/interview?token=<bearer token>):
+#   client → {"type": "start", "question": str, "question_index": int,
+#             "session_id": str | null, "sample_rate": 16000, "jd_keywords": [str] | null,
+#             "detailed_feedback": bool}
+#   client → binary: 1 byte kind (1 = JPEG frame, 2 = PCM s16le mono audio)
+#            + 8 byte little-endian float64 timestamp (seconds since start) + payload
+#   client → {"type": "end"}
+#   server → {"type": "ready"}
+#            {"type": "indicators", "t", "eye_contact", "posture", "smile", ..., "face"}
+#            {"type": "final", "analysis", "feedback", "frames", "dropped_frames"}
+#            {"type": "transcript", "transcript", "transcript_analytics", "feedback"}
+#            {"type": "evaluation", "transcript", "answer_evaluation", "session_summary"}
+#            {"type": "llm_evaluation", "llm_job_id", "status", "answer_evaluation"}
+#              (only when the local evaluation was provisional; the socket stays open for it)
+#            {"type": "error", "detail"} before closing (e.g. an invalid start message, see models/live.py,
+#              or a frame/audio stream over its size limit, closed with 1009)
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+import wave
+from typing import Optional
+
+import cv2
+import numpy as np
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from models.live import LiveStart, describe_validation_error
+from routes.facial_audio_evaluation import (
+    safe_analyze_transcript,
+    safe_convert_voice_to_text,
+    safe_evaluate_answer,
+    safe_generate_feedback
+)
+from services.admission import AdmissionRejected, live_admission, run_in_analysis_executor
+from services.answer_evaluator import start_llm_evaluation
+from services.auth_store import lookup_session
+from services.model_registry import registry
+from services.scratch_space import get_scratch_manager
+from services.transcript_analytics import merge_feedback, normalize_keywords, speech_feedback
+from services.session_store import get_session_store
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+LIVE_ANALYSIS_FPS = float(os.getenv("LIVE_ANALYSIS_FPS", "2"))        # Frames analyzed per second of video
+LIVE_UPDATE_INTERVAL = float(os.getenv("LIVE_UPDATE_INTERVAL", "0.5"))  # Min seconds between indicator pushes
+LIVE_MAX_SECONDS = float(os.getenv("LIVE_MAX_SECONDS", "600"))
+LIVE_INDICATOR_WINDOW = int(os.getenv("LIVE_INDICATOR_WINDOW", "5"))    # Frames averaged per indicator
+LIVE_MAX_FRAME_BYTES = int(os.getenv("LIVE_MAX_FRAME_BYTES", str(2 * 1024 * 1024)))  # Per JPEG frame
+
+MESSAGE_FRAME = 1
+MESSAGE_AUDIO = 2
+HEADER = struct.Struct("<Bd")
+
+# Close codes
+POLICY_VIOLATION = 1008
+MESSAGE_TOO_BIG = 1009
+TRY_AGAIN_LATER = 1013
+
+
+class LiveStreamError(Exception):
+    """The client broke the stream's limits; reported as an error message before closing"""
+
+    def __init__(self, detail: str, close_code: int = POLICY_VIOLATION):
+        super().__init__(detail)
+        self.detail = detail
+        self.close_code = close_code
+
+
+def _decode_jpeg(payload: bytes):
+    return cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+async def _send(websocket: WebSocket, message: dict):
+    """Send one JSON message; a failed send means the client is gone"""
+    try:
+        await websocket.send_json(message)
+    except WebSocketDisconnect:
+        raise
+    except Exception as e:
+        raise WebSocketDisconnect(1006) from e
+
+
+class LiveStream:
+    """State of one streamed answer: the incremental analyzer plus buffered audio"""
+
+    def __init__(self, websocket: WebSocket, sample_rate: int):
+        self.websocket = websocket
+        self.sample_rate = sample_rate
+        self.max_audio_bytes = int(sample_rate * 2 * LIVE_MAX_SECONDS)  # s16le mono
+        self.analyzer = None
+        self.audio = bytearray()
+        self.frames_received = 0
+        self.dropped_frames = 0
+        self.last_accepted_t = None
+        self.last_update = 0.0
+
+        # Latest-frame slot: if analysis falls behind, older pending frames are
+        # replaced instead of queueing up (tracking copes with skipped frames)
+        self._pending = None
+        self._frame_ready = asyncio.Event()
+        self._closed = False
+        self._worker = None
+        # The frame worker pushes indicators while the handler sends results: one sender at a time
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, message: dict):
+        async with self._send_lock:
+            await _send(self.websocket, message)
+
+    async def open(self):
+        video_analysis = registry.get("video_analysis")
+        self.analyzer = await run_in_analysis_executor(
+            video_analysis.FrameAnalyzer, LIVE_ANALYSIS_FPS, LIVE_MAX_SECONDS
+        )
+        self._worker = asyncio.create_task(self._analyze_frames())
+
+    def add_frame(self, t: float, payload: bytes):
+        if len(payload) > LIVE_MAX_FRAME_BYTES:
+            raise LiveStreamError(f"Frame larger than {LIVE_MAX_FRAME_BYTES} bytes", MESSAGE_TOO_BIG)
+        self.frames_received += 1
+        # Throttle to the analysis rate using the client's capture timestamps
+        if self.last_accepted_t is not None and t - self.last_accepted_t < 1.0 / LIVE_ANALYSIS_FPS:
+            self.dropped_frames += 1
+            return
+        if self._pending is not None:
+            self.dropped_frames += 1
+        self.last_accepted_t = t
+        self._pending = (t, payload)
+        self._frame_ready.set()
+
+    def add_audio(self, payload: bytes):
+        if len(self.audio) + len(payload) > self.max_audio_bytes:
+            raise LiveStreamError(f"Audio longer than {LIVE_MAX_SECONDS:g} seconds", MESSAGE_TOO_BIG)
+        self.audio += payload
+
+    async def _analyze_frames(self):
+        while True:
+            if self._pending is None:
+                if self._closed:
+                    return
+                await self._frame_ready.wait()
+                self._frame_ready.clear()
+                continue
+            t, payload = self._pending
+            self._pending = None
+
+            try:
+                await run_in_analysis_executor(self._analyze_one, t, payload)
+            except Exception as e:
+                logger.warning(f"⚠️ Live frame at {t:.2f}s failed: {e}")
+                continue
+
+            now = time.monotonic()
+            if now - self.last_update >= LIVE_UPDATE_INTERVAL:
+                self.last_update = now
+                indicators = self.analyzer.recent(LIVE_INDICATOR_WINDOW)
+                await self.send({"type": "indicators", "t": round(t, 2), **indicators})
+
+    def _analyze_one(self, t: float, payload: bytes):
+        frame = _decode_jpeg(payload)
+        if frame is None:
+            raise ValueError("Invalid JPEG frame")
+        self.analyzer.add_frame(frame, t)
+
+    async def drain(self):
+        """Wait until the frame that is in flight (and any pending one) is analyzed"""
+        self._closed = True
+        self._frame_ready.set()
+        if self._worker is not None:
+            await self._worker
+
+    def write_wav(self, path: str):
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(bytes(self.audio))
+
+    async def close(self):
+        if self._worker is not None:
+            if not self._worker.done():
+                self._worker.cancel()
+            elif not self._worker.cancelled():
+                self._worker.exception()  # A failed indicator send when the handler stopped first
+        if self.analyzer is not None:
+            await run_in_analysis_executor(self.analyzer.close)
+
+
+async def _receive_stream(websocket: WebSocket, stream: LiveStream):
+    """Feed binary frame/audio messages to the stream until the client sends "end" """
+    started = time.monotonic()
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+
+        data = message.get("bytes")
+        if data is not None:
+            if len(data) < HEADER.size:
+                continue
+            kind, t = HEADER.unpack_from(data)
+            payload = data[HEADER.size:]
+            if kind == MESSAGE_FRAME:
+                stream.add_frame(t, payload)
+            elif kind == MESSAGE_AUDIO:
+                stream.add_audio(payload)
+        elif message.get("text"):
+            try:
+                control = json.loads(message["text"])
+            except ValueError:
+                continue
+            if isinstance(control, dict) and control.get("type") == "end":
+                return
+
+        if time.monotonic() - started > LIVE_MAX_SECONDS:
+            await stream.send({"type": "error", "detail": "Maximum answer length reached"})
+            return
+
+
+@router.websocket("/interview")
+async def live_interview(websocket: WebSocket, token: Optional[str] = Query(None)):
+    user = await run_in_threadpool(lookup_session, token) if token else None
+    caller = f"user:{user['id']}" if user else (websocket.client.host if websocket.client else "anonymous")
+
+    await websocket.accept()
+    try:
+        start = LiveStart.model_validate(await websocket.receive_json())
+    except WebSocketDisconnect:
+        return
+    except ValidationError as e:
+        await websocket.send_json({"type": "error", "detail": f"Invalid start message: {describe_validation_error(e)}"})
+        await websocket.close(code=POLICY_VIOLATION)
+        return
+    except Exception:
+        await websocket.send_json({"type": "error", "detail": "First message must be a JSON start message"})
+        await websocket.close(code=POLICY_VIOLATION)
+        return
+
+    question_index = start.question_index
+    session_id = start.session_id
+    if session_id and user is None:
+        await websocket.send_json({"type": "error", "detail": "Sign in to save answers to a session"})
+        await websocket.close(code=POLICY_VIOLATION)
+        return
+
+    try:
+        async with live_admission.admit(caller):
+            llm_job = await _run_live_interview(websocket, user, start.question, question_index, session_id,
+                                                start.sample_rate, normalize_keywords(start.jd_keywords),
+                                                start.detailed_feedback)
+        # The LLM result is pushed after the admission slot has been released
+        if llm_job is not None:
+            job_id, future = llm_job
+            llm_result = await asyncio.wrap_future(future)
+            await _send(websocket, {
+                "type": "llm_evaluation",
+                "llm_job_id": job_id,
+                "status": "completed" if llm_result else "failed",
+                "answer_evaluation": llm_result
+            })
+        await websocket.close()
+        logger.info(f"✅ Live interview completed for question {question_index}")
+    except AdmissionRejected as e:
+        await websocket.send_json({"type": "error", "detail": e.detail, "retry_after": e.headers["Retry-After"]})
+        await websocket.close(code=TRY_AGAIN_LATER)
+    except LiveStreamError as e:
+        logger.warning(f"⚠️ Live interview stream rejected (question {question_index}): {e.detail}")
+        try:
+            await _send(websocket, {"type": "error", "detail": e.detail})
+            await websocket.close(code=e.close_code)
+        except WebSocketDisconnect:
+            pass
+    except WebSocketDisconnect:
+        logger.info(f"🔌 Live interview client disconnected (question {question_index})")
+
+
+async def _run_live_interview(websocket: WebSocket, user: Optional[dict], question: str, question_index: int,
+                              session_id: Optional[str], sample_rate: int, jd_keywords: list = None,
+                              detailed: bool = False) -> Optional[tuple]:
+    """Stream, analyze and evaluate one answer; returns (llm_job_id, future) when an LLM evaluation is pending"""
+    stream = LiveStream(websocket, sample_rate)
+    scratch = None
+    try:
+        await stream.open()
+        await stream.send({"type": "ready"})
+        logger.info(f"🎥 Live interview started for question {question_index}")
+
+        await _receive_stream(websocket, stream)
+
+        # Frames were analyzed while the candidate spoke; only the batched pass is left
+        await stream.drain()
+        analysis = await run_in_analysis_executor(stream.analyzer.finish)
+        timeline = analysis.pop("timeline", [])
+        feedback = safe_generate_feedback(analysis)
+        await stream.send({
+            "type": "final",
+            "analysis": analysis,
+            "feedback": feedback,
+            "frames": stream.analyzer.frames_processed,
+            "dropped_frames": stream.dropped_frames
+        })
+
+        transcript = ""
+        if stream.audio:
+            scratch = get_scratch_manager().allocate("live_audio", len(stream.audio) + 44)
+            wav_path = scratch.file("answer.wav")
+            await run_in_threadpool(stream.write_wav, wav_path)
+            transcript = await run_in_analysis_executor(safe_convert_voice_to_text, wav_path, wav_path)
+        duration = len(stream.audio) / (2.0 * stream.sample_rate)
+        transcript_analytics = safe_analyze_transcript(transcript, None, jd_keywords, duration)
+        feedback = merge_feedback(feedback, speech_feedback(transcript_analytics))
+        analysis["transcript"] = transcript
+        analysis["transcript_analytics"] = transcript_analytics
+        # Speech metrics are local, so they arrive before the (slower) LLM evaluation
+        await stream.send({
+            "type": "transcript",
+            "transcript": transcript,
+            "transcript_analytics": transcript_analytics,
+            "feedback": feedback
+        })
+
+        answer_evaluation = await run_in_analysis_executor(
+            safe_evaluate_answer, question, transcript, detailed, jd_keywords, False
+        )
+
+        session_summary = None
+        if session_id:
+            # SQLite write transaction: off the event loop like every other blocking call here
+            session_summary = await run_in_threadpool(
+                get_session_store().add_answer, session_id, user["id"], question_index, question,
+                analysis, answer_evaluation, feedback, timeline
+            )
+
+        await stream.send({
+            "type": "evaluation",
+            "transcript": transcript,
+            "answer_evaluation": answer_evaluation,
+            "session_summary": session_summary
+        })
+
+        llm_job = start_llm_evaluation(
+            answer_evaluation, (session_id, user["id"], question_index) if session_summary is not None else None
+        )
+        return (answer_evaluation["llm_job_id"], llm_job) if llm_job is not None else None
+    finally:
+        await stream.close()
+        if scratch is not None:
+            scratch.close()
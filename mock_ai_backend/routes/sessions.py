@@ -0,0 +1,93 @@
+# routes/sessions.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from models.session import (
+    SessionCreate,
+    SessionPage,
+    SESSION_FIELDS,
+    SESSION_DEFAULT_FIELDS,
+    ANSWER_FIELDS,
+    ANSWER_DEFAULT_FIELDS,
+    parse_fields
+)
+from services.auth_store import get_current_user
+from services.session_store import get_session_store
+
+router = APIRouter()
+
+
+def _fields(fields: Optional[str], allowed: tuple, default: tuple) -> tuple:
+    try:
+        return parse_fields(fields, allowed, default)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("")
+def create_session(data: SessionCreate, user: dict = Depends(get_current_user)):
+    """Start a new interview session"""
+    return get_session_store().create_session(user["id"], data.title, data.questions)
+
+
+@router.get("", response_model=SessionPage)
+def list_sessions(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated session fields to return"),
+    user: dict = Depends(get_current_user)
+):
+    """Newest-first session history, paginated with an opaque cursor"""
+    projection = _fields(fields, SESSION_FIELDS, SESSION_DEFAULT_FIELDS)
+    try:
+        sessions, next_cursor = get_session_store().list_sessions(user["id"], limit, cursor, projection)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"sessions": sessions, "next_cursor": next_cursor}
+
+
+@router.get("/{session_id}")
+def get_session(
+    session_id: str,
+    fields: Optional[str] = None,
+    answer_fields: Optional[str] = Query(None, description="Comma-separated answer fields, or 'none'"),
+    user: dict = Depends(get_current_user)
+):
+    """One session with its questions and (projected) answers"""
+    projection = _fields(fields, SESSION_FIELDS, SESSION_DEFAULT_FIELDS)
+    answer_projection = None if answer_fields == "none" else _fields(answer_fields, ANSWER_FIELDS, ANSWER_DEFAULT_FIELDS)
+    session = get_session_store().get_session(session_id, user["id"], projection, answer_projection)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
+@router.get("/{session_id}/answers/{question_index}")
+def get_answer(
+    session_id: str,
+    question_index: int,
+    fields: Optional[str] = None,
+    user: dict = Depends(get_current_user)
+):
+    """Stored analysis for one answer; request ``timeline``/``analysis`` explicitly for the heavy fields"""
+    projection = _fields(fields, ANSWER_FIELDS, ANSWER_DEFAULT_FIELDS)
+    answer = get_session_store().get_answer(session_id, user["id"], question_index, projection)
+    if answer is None:
+        raise HTTPException(status_code=404, detail="Answer not found")
+    return answer
+
+
+@router.post("/{session_id}/complete")
+def complete_session(session_id: str, user: dict = Depends(get_current_user)):
+    """Finish a session; returns the final aggregate and feedback kept up to date per answer"""
+    summary = get_session_store().complete_session(session_id, user["id"])
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": session_id, "status": "completed", "summary": summary}
+
+
+@router.delete("/{session_id}")
+def delete_session(session_id: str, user: dict = Depends(get_current_user)):
+    if not get_session_store().delete_session(session_id, user["id"]):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"message": "Session deleted"}
@@ -0,0 +1,132 @@
+# routes/uploads.py
+
+import hashlib
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from models.upload import UploadInit, UploadFinalize
+from routes.facial_audio_evaluation import analyze_video_file, validate_video_file
+from services.admission import single_admission, upload_init_admission, client_key
+from services.auth_store import get_optional_user
+from services.tracing import start_request_trace, trace_stage
+from services.transcript_analytics import normalize_keywords
+from services.upload_store import UploadError, UPLOAD_CHUNK_SIZE, get_upload_store, write_chunk_at
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def _user_id(user: Optional[dict]) -> Optional[str]:
+    return user["id"] if user else None
+
+
+async def _call(func, *args):
+    """Run a blocking store call off the event loop, mapping UploadError to HTTP errors"""
+    try:
+        return await run_in_threadpool(func, *args)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("")
+async def init_upload(data: UploadInit, request: Request, user: Optional[dict] = Depends(get_optional_user)):
+    """
+    Start a resumable upload; the file is preallocated and chunks can be sent in any order.
+    Unfinished uploads count against a per-caller and a global storage quota.
+    """
+    caller = await client_key(request)
+    async with upload_init_admission.admit(caller):
+        status = await _call(
+            get_upload_store().init_upload,
+            data.size, data.filename, _user_id(user), data.chunk_size or UPLOAD_CHUNK_SIZE, data.sha256, caller
+        )
+    logger.info(f"📦 Upload {status['upload_id']} started: {data.size} bytes in {status['chunk_count']} chunk(s)")
+    return status
+
+
+@router.get("/{upload_id}")
+async def upload_status(upload_id: str, user: Optional[dict] = Depends(get_optional_user)):
+    """Which chunks are still missing, so a client can resume after a dropped connection"""
+    return await _call(get_upload_store().status, upload_id, _user_id(user))
+
+
+@router.put("/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    checksum: str = Header(..., alias="X-Chunk-Sha256"),
+    user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Upload one chunk as the raw request body at ``offset``. The chunk is only
+    recorded once its SHA-256 matches the ``X-Chunk-Sha256`` header; a failed
+    or interrupted chunk is simply sent again.
+    """
+    store = get_upload_store()
+    chunk_index, expected, path = await _call(store.chunk_bounds, upload_id, _user_id(user), offset)
+
+    data = bytearray()
+    digest = hashlib.sha256()
+    async for piece in request.stream():
+        if len(data) + len(piece) > expected:
+            raise HTTPException(status_code=400, detail=f"Chunk larger than expected {expected} bytes")
+        data += piece
+        digest.update(piece)
+
+    if len(data) != expected:
+        raise HTTPException(status_code=400, detail=f"Chunk {chunk_index} must be {expected} bytes, got {len(data)}")
+    if digest.hexdigest() != checksum.strip().lower():
+        raise HTTPException(status_code=422, detail=f"Checksum mismatch for chunk {chunk_index}")
+
+    await run_in_threadpool(write_chunk_at, path, offset, data)
+    return await _call(store.record_chunk, upload_id, chunk_index, digest.hexdigest())
+
+
+@router.post("/{upload_id}/finalize")
+async def finalize_upload(
+    upload_id: str,
+    data: UploadFinalize,
+    request: Request,
+    user: Optional[dict] = Depends(get_optional_user)
+):
+    """Analyze the assembled upload in place (same response as /emotion/analyze-single)"""
+    if not data.question.strip():
+        raise HTTPException(status_code=400, detail="Question is required")
+    if data.session_id and user is None:
+        raise HTTPException(status_code=401, detail="Sign in to save answers to a session")
+
+    store = get_upload_store()
+    trace = start_request_trace()
+    with trace_stage("request.analyze_single"):
+        async with single_admission.admit(await client_key(request)):
+            upload = await _call(store.finalize, upload_id, _user_id(user))
+            try:
+                with trace_stage("validate"):
+                    is_valid = validate_video_file(upload["path"])
+                if not is_valid:
+                    raise HTTPException(status_code=400, detail="Invalid or corrupted video file")
+
+                logger.info(f"🎯 Analyzing finalized upload {upload_id} for question {data.question_index}")
+                response = await analyze_video_file(
+                    upload["path"], upload["filename"] or f"question_{data.question_index}_video.mp4",
+                    upload["size"], data.question, data.question_index, data.session_id, user,
+                    normalize_keywords(data.jd_keywords), data.detailed_feedback
+                )
+            finally:
+                await run_in_threadpool(store.delete, upload_id)
+
+    if data.include_timings:
+        response["timings"] = trace.as_dict()
+    return response
+
+
+@router.delete("/{upload_id}")
+async def cancel_upload(upload_id: str, user: Optional[dict] = Depends(get_optional_user)):
+    store = get_upload_store()
+    await _call(store.status, upload_id, _user_id(user))  # Ownership / existence check
+    await run_in_threadpool(store.delete, upload_id)
+    return {"message": "Upload cancelled"}
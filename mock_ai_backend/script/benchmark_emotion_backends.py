@@ -0,0 +1,134 @@
+# script/benchmark_emotion_backends.py
+#
+# Compares the facial emotion backends (EMOTION_MODEL_BACKEND) on accuracy
+# against cost. Accuracy comes from a labelled image folder in the training
+# layout (<dir>/<Label>/*.png, e.g. data/facial_emotion/test); cost is model
+# load time, per-image latency and, with --video, the time to score a whole
+# video through the shared single-decode path.
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.benchmark_emotion_backends
+#   python -m script.benchmark_emotion_backends --backends keras onnx fer --limit 100 --video clip.mp4
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+results_dir = os.path.join(backend_dir, 'benchmark_results')
+default_dataset = os.path.join(backend_dir, 'data', 'facial_emotion', 'test')
+
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+from services.emotion_detector import DETECTORS, EMOTION_LABELS, create_emotion_detector, detect_video_emotions
+
+
+def load_dataset(dataset_dir: str, limit: int):
+    """48x48 grayscale images and label indices, at most ``limit`` per label"""
+    images, labels = [], []
+    for index, label in enumerate(EMOTION_LABELS):
+        paths = []
+        for ext in ("png", "jpg", "jpeg"):
+            paths.extend(glob.glob(os.path.join(dataset_dir, label, f"*.{ext}")))
+        for path in sorted(paths)[:limit]:
+            img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if img is not None:
+                images.append(cv2.resize(img, (48, 48)))
+                labels.append(index)
+    return images, np.array(labels, dtype=np.intp)
+
+
+def as_frame(crop, size: int) -> np.ndarray:
+    """Tight dataset crops give face detectors nothing to find; pad and upscale into a small BGR frame"""
+    face = cv2.resize(crop, (size // 2, size // 2), interpolation=cv2.INTER_CUBIC)
+    pad = size // 4
+    frame = cv2.copyMakeBorder(face, pad, pad, pad, pad, cv2.BORDER_REPLICATE)
+    return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+
+def bench_backend(backend: str, images, labels, frame_size: int, batch_size: int, video: str = None) -> dict:
+    start = time.perf_counter()
+    detector = create_emotion_detector(backend)
+    load_time = time.perf_counter() - start
+
+    frames = [as_frame(img, frame_size) for img in images] if detector.needs_frames else None
+    detector.predict(images[:1], frames[:1] if frames else None)  # Warm-up
+
+    probabilities = []
+    start = time.perf_counter()
+    for i in range(0, len(images), batch_size):
+        probabilities.append(detector.predict(images[i:i + batch_size], frames[i:i + batch_size] if frames else None))
+    elapsed = time.perf_counter() - start
+    probabilities = np.concatenate(probabilities) if probabilities else np.zeros((0, len(EMOTION_LABELS)))
+
+    detected = probabilities.any(axis=1)
+    predicted = probabilities.argmax(axis=1)
+    result = {
+        "images": len(images),
+        "load_time_s": round(load_time, 3),
+        "ms_per_image": round(elapsed / max(1, len(images)) * 1000, 3),
+        "detection_rate": round(float(detected.mean()), 4) if len(images) else 0.0,
+        # Images where the backend found no face count as wrong
+        "accuracy": round(float((predicted[detected] == labels[detected]).sum() / max(1, len(images))), 4),
+        "accuracy_on_detected": round(float((predicted[detected] == labels[detected]).mean()), 4) if detected.any() else 0.0,
+        "per_label_accuracy": {
+            label: round(float((predicted[labels == i] == i).mean()), 4)
+            for i, label in enumerate(EMOTION_LABELS) if (labels == i).any()
+        },
+    }
+
+    if video:
+        start = time.perf_counter()
+        scored = detect_video_emotions(video, frame_interval=10, detector=detector)
+        result["video_s"] = round(time.perf_counter() - start, 3)
+        result["video_faces"] = len(scored)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare facial emotion backends on accuracy and cost")
+    parser.add_argument("--backends", nargs="+", default=list(DETECTORS), choices=list(DETECTORS))
+    parser.add_argument("--dataset", default=default_dataset, help="Labelled folder: <dir>/<Label>/*.png")
+    parser.add_argument("--limit", type=int, default=200, help="Images per label")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--frame-size", type=int, default=192, help="Frame size for backends with their own face detection")
+    parser.add_argument("--video", help="Also time scoring this video end to end")
+    parser.add_argument("--output", help="Results JSON path (default: benchmark_results/emotion-backends-<timestamp>.json)")
+    args = parser.parse_args()
+
+    images, labels = load_dataset(args.dataset, args.limit)
+    if not images:
+        sys.exit(f"❌ No labelled images found in {args.dataset}")
+    print(f"🖼️ {len(images)} labelled images from {args.dataset}")
+
+    results = {}
+    for backend in args.backends:
+        try:
+            results[backend] = bench_backend(backend, images, labels, args.frame_size, args.batch_size, args.video)
+        except Exception as e:
+            print(f"  ⚠️ {backend}: {e}")
+            results[backend] = {"error": str(e)}
+            continue
+        r = results[backend]
+        print(f"  🎭 {backend:9s} acc={r['accuracy']:.3f} detected={r['detection_rate']:.2f} "
+              f"{r['ms_per_image']:.2f}ms/img load={r['load_time_s']:.1f}s"
+              + (f" video={r['video_s']:.2f}s" if "video_s" in r else ""))
+
+    output = args.output or os.path.join(results_dir, f"emotion-backends-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"timestamp": datetime.now().isoformat(), "dataset": args.dataset, "results": results}, f, indent=2)
+    print(f"✅ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
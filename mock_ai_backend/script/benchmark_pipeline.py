@@ -0,0 +1,415 @@
+# script/benchmark_pipeline.py
+#
+# Reproducible benchmark for the /emotion analysis pipeline.
+#
+# Generates synthetic interview videos locally (an OpenCV-drawn face with a
+# silent or tone audio track), times each pipeline stage and the full
+# /emotion/analyze-single request through a TestClient with the network
+# services stubbed (speech recognition, and Together AI through the in-process
+# replay stub of services/llm_stub.py), and saves the results as JSON so runs
+# can be compared over time.
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.benchmark_pipeline
+#   python -m script.benchmark_pipeline --seconds 20 --concurrency 1 2 4 8 --compare benchmark_results/old.json
+#   python -m script.benchmark_pipeline --llm-latency lognormal:800,0.5 --llm-error-rate 0.05
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+results_dir = os.path.join(backend_dir, 'benchmark_results')
+
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+os.environ.setdefault("PRELOAD_MODELS", "false")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+STUB_TRANSCRIPT = "I have three years of experience building REST APIs with Python and FastAPI"
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+def _draw_face(frame, t: float):
+    """Draw a simple face that drifts, nods and smiles over time"""
+    h, w = frame.shape[:2]
+    cx = int(w / 2 + 20 * np.sin(t * 0.7))
+    cy = int(h / 2 + 8 * np.sin(t * 2 * np.pi * 1.2))  # ~1.2 Hz nod
+    rx, ry = w // 8, h // 5
+
+    cv2.ellipse(frame, (cx, cy), (rx, ry), 0, 0, 360, (150, 180, 220), -1)
+    for dx in (-rx // 2, rx // 2):
+        cv2.circle(frame, (cx + dx, cy - ry // 4), max(3, rx // 8), (40, 40, 40), -1)
+    cv2.line(frame, (cx, cy - ry // 8), (cx, cy + ry // 6), (110, 130, 170), 3)
+
+    smile = int(ry // 6 * (0.5 + 0.5 * np.sin(t * 0.5)))
+    cv2.ellipse(frame, (cx, cy + ry // 2), (rx // 2, max(1, smile)), 0, 0, 180, (60, 60, 160), 3)
+
+    # Torso so pose has shoulders to find
+    cv2.rectangle(frame, (cx - rx * 2, cy + ry + 10), (cx + rx * 2, h), (90, 60, 40), -1)
+
+
+def _write_audio(path: str, seconds: float, audio: str, sample_rate: int = 16000):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    if audio == "tone":
+        samples = (0.2 * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16)
+    else:
+        samples = np.zeros_like(t, dtype=np.int16)
+
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+
+
+def make_synthetic_video(path: str, seconds: float = 10, fps: int = 30, size=(1280, 720), audio: str = "tone") -> dict:
+    """Write an mp4 with a drawn face and a silent/tone audio track; returns its metadata"""
+    w, h = size
+    work_dir = tempfile.mkdtemp(prefix="bench_video_")
+    silent_path = os.path.join(work_dir, "video.mp4")
+    audio_path = os.path.join(work_dir, "audio.wav")
+
+    writer = cv2.VideoWriter(silent_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+    frame = np.empty((h, w, 3), dtype=np.uint8)
+    n_frames = int(seconds * fps)
+    for i in range(n_frames):
+        frame[:] = (200, 200, 200)
+        _draw_face(frame, i / fps)
+        writer.write(frame)
+    writer.release()
+
+    _write_audio(audio_path, seconds, audio)
+
+    from services.video_normalizer import find_ffmpeg
+
+    ffmpeg = find_ffmpeg()
+    if ffmpeg:
+        subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-i", silent_path, "-i", audio_path,
+             "-c:v", "copy", "-c:a", "aac", "-shortest", path],
+            check=True
+        )
+    else:
+        print("⚠️ ffmpeg not found, synthetic video has no audio track")
+        shutil.copyfile(silent_path, path)
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return {"path": path, "seconds": seconds, "fps": fps, "width": w, "height": h, "frames": n_frames, "audio": audio}
+
+
+# ---------------------------------------------------------------------------
+# Network stubs
+# ---------------------------------------------------------------------------
+
+def install_network_stubs(llm_latency: str = "fixed:0", llm_error_rate: float = 0.0):
+    """Replace Google speech recognition with a fixed transcript and replay LLM responses in-process"""
+    import speech_recognition as sr
+    from services.llm_stub import LLM_PROVIDER, configure_stub_llm
+
+    sr.Recognizer.recognize_google = lambda self, audio_data, language=None, **kwargs: STUB_TRANSCRIPT
+
+    if LLM_PROVIDER != "stub":
+        print(f"⚠️ LLM_PROVIDER={LLM_PROVIDER}: answer evaluation will call the real LLM")
+    return configure_stub_llm(latency=llm_latency, error_rate=llm_error_rate, seed=0)
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+class PeakRSS:
+    """Samples process RSS in a background thread and keeps the peak"""
+
+    def __init__(self, interval: float = 0.05):
+        import psutil
+        self.process = psutil.Process()
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.process.memory_info().rss
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def latency_stats(latencies) -> dict:
+    return {
+        "runs": len(latencies),
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "mean_s": round(statistics.mean(latencies), 4) if latencies else 0.0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_stages(video: dict, repeats: int) -> dict:
+    """Time each pipeline stage on its own, on the original upload and on the normalized proxy"""
+    from routes import facial_audio_evaluation as evaluation_route
+    from services.video_normalizer import normalize_video
+
+    media = normalize_video(video["path"])
+    stages = {
+        "predict_emotions_on_frames": lambda: evaluation_route.predict_emotions_on_frames([video["path"]]),
+        "analyze_video": lambda: evaluation_route.analyze_video(video["path"]),
+        "convert_voice_to_text": lambda: evaluation_route.convert_voice_to_text(video["path"]),
+    }
+    if media.normalized:
+        stages.update({
+            "normalize_video": lambda: normalize_video(video["path"]).cleanup(),
+            "analyze_video_proxy": lambda: evaluation_route.analyze_video(media.video_path),
+            "convert_voice_to_text_wav": lambda: evaluation_route.convert_voice_to_text(video["path"], media.audio_path),
+        })
+
+    results = {}
+    for name, fn in stages.items():
+        fn()  # Warm-up (model loading is reported separately)
+        latencies = []
+        with PeakRSS() as rss:
+            for _ in range(repeats):
+                start = time.perf_counter()
+                fn()
+                latencies.append(time.perf_counter() - start)
+        stats = latency_stats(latencies)
+        stats["video_fps"] = round(video["frames"] / stats["p50_s"], 1) if stats["p50_s"] else 0.0
+        stats["peak_rss_mb"] = round(rss.peak / 2**20, 1)
+        results[name] = stats
+        print(f"  🔬 {name:28s} p50={stats['p50_s']:.3f}s p95={stats['p95_s']:.3f}s fps={stats['video_fps']}")
+    media.cleanup()
+    return results
+
+
+def bench_frame_loop(video: dict, max_frames: int = 120) -> dict:
+    """
+    Allocation cost of the model-free part of the frame loop (decode, fit, RGB
+    conversion, face crop) with buffer reuse off and on: tracemalloc peak,
+    transient bytes allocated per frame, time per frame and peak RSS.
+    """
+    from utils import frame_buffers
+    from utils.frame_buffers import BufferPool, CropBatch, FrameRing
+    from utils.video_analysis_utils import fit_within
+
+    results = {}
+    default = frame_buffers.FRAME_BUFFER_REUSE
+    try:
+        for reuse in (False, True):
+            frame_buffers.FRAME_BUFFER_REUSE = reuse
+            cap = cv2.VideoCapture(video["path"])
+            ring, buffers, crops = FrameRing(), BufferPool(), CropBatch(capacity=max_frames)
+            transient, frames = [], 0
+            tracemalloc.start()
+            start = time.perf_counter()
+            with PeakRSS() as rss:
+                while frames < max_frames and cap.grab():
+                    before = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+                    ret, frame = ring.retrieve(cap)
+                    if not ret:
+                        break
+                    frame = fit_within(frame, buffers=buffers)
+                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buffers.get("rgb", frame.shape))
+                    h, w = rgb.shape[:2]
+                    face = cv2.resize(frame[h // 4:3 * h // 4, w // 4:3 * w // 4], (48, 48),
+                                      dst=buffers.get("crop_bgr", (48, 48, 3)))
+                    crops.commit(cv2.cvtColor(face, cv2.COLOR_BGR2GRAY, dst=crops.next_slot()))
+                    transient.append(tracemalloc.get_traced_memory()[1] - before)
+                    frames += 1
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            cap.release()
+
+            key = "reuse" if reuse else "allocate"
+            results[key] = {
+                "frames": frames,
+                "ms_per_frame": round(elapsed / max(1, frames) * 1000, 3),
+                "transient_kb_per_frame": round(statistics.mean(transient) / 1024, 1) if transient else 0.0,
+                "tracemalloc_peak_kb": round(peak / 1024, 1),
+                "peak_rss_mb": round(rss.peak / 2**20, 1),
+            }
+            r = results[key]
+            print(f"  🧮 {key:8s} {r['ms_per_frame']:.2f}ms/frame transient={r['transient_kb_per_frame']}KB/frame "
+                  f"peak={r['tracemalloc_peak_kb']}KB rss={r['peak_rss_mb']}MB")
+    finally:
+        frame_buffers.FRAME_BUFFER_REUSE = default
+    return results
+
+
+def bench_requests(client, video: dict, concurrency_levels, requests_per_level: int) -> dict:
+    """Time the full /emotion/analyze-single request at several concurrency levels"""
+    with open(video["path"], "rb") as f:
+        payload = f.read()
+
+    def one_request(i: int) -> float:
+        start = time.perf_counter()
+        response = client.post(
+            "/emotion/analyze-single",
+            files={"video": ("bench.mp4", payload, "video/mp4")},
+            data={"question": "Tell me about your experience", "question_index": str(i)}
+        )
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200 or not response.json().get("success"):
+            raise RuntimeError(f"Request failed: {response.status_code} {response.text[:200]}")
+        return elapsed
+
+    results = {}
+    for level in concurrency_levels:
+        total = max(level, requests_per_level)
+        with PeakRSS() as rss:
+            wall_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as executor:
+                latencies = list(executor.map(one_request, range(total)))
+            wall = time.perf_counter() - wall_start
+
+        stats = latency_stats(latencies)
+        stats["throughput_rps"] = round(total / wall, 3)
+        stats["peak_rss_mb"] = round(rss.peak / 2**20, 1)
+        results[str(level)] = stats
+        print(f"  🌐 concurrency={level:<3d} p50={stats['p50_s']:.3f}s p95={stats['p95_s']:.3f}s rps={stats['throughput_rps']}")
+    return results
+
+
+def environment_info() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=backend_dir,
+                                capture_output=True, text=True).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(previous: dict, current: dict):
+    """Print p50 changes against a previous results file"""
+    print("📈 Comparison with previous run (p50):")
+    for section in ("stages", "requests"):
+        for name, stats in current.get(section, {}).items():
+            old = previous.get(section, {}).get(name)
+            if not old or not old.get("p50_s"):
+                continue
+            change = (stats["p50_s"] - old["p50_s"]) / old["p50_s"] * 100
+            print(f"  {section}/{name}: {old['p50_s']:.3f}s → {stats['p50_s']:.3f}s ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /emotion analysis pipeline")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--audio", choices=["tone", "silent"], default="tone")
+    parser.add_argument("--video", help="Use an existing clip instead of generating one")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per stage")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=4, help="Requests per concurrency level")
+    parser.add_argument("--llm-latency", default="fixed:0",
+                        help="Stub LLM time to first token, e.g. fixed:500 or lognormal:800,0.5 (milliseconds)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Share of stub LLM calls that fail")
+    parser.add_argument("--output", help="Results JSON path (default: benchmark_results/pipeline-<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from main import app
+    from services.model_registry import registry
+
+    work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        if args.video:
+            cap = cv2.VideoCapture(args.video)
+            video = {
+                "path": args.video,
+                "fps": cap.get(cv2.CAP_PROP_FPS),
+                "frames": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            }
+            cap.release()
+        else:
+            video = make_synthetic_video(os.path.join(work_dir, "synthetic.mp4"), args.seconds, args.fps,
+                                         (args.width, args.height), args.audio)
+        print(f"🎬 Benchmark video: {video['width']}x{video['height']} @ {video['fps']}fps, {video['frames']} frames")
+
+        stub_llm = install_network_stubs(args.llm_latency, args.llm_error_rate)
+
+        print("📦 Loading models...")
+        registry.preload()
+
+        print("🧮 Frame loop allocations (FRAME_BUFFER_REUSE off vs on)")
+        frame_loop = bench_frame_loop(video)
+
+        print("🔬 Stage timings")
+        stages = bench_stages(video, args.repeats)
+
+        print("🌐 Request timings")
+        with TestClient(app) as client:
+            requests_results = bench_requests(client, video, args.concurrency, args.requests)
+
+        results = {
+            "environment": environment_info(),
+            "video": {k: v for k, v in video.items() if k != "path"},
+            "model_load": registry.status(),
+            "frame_loop": frame_loop,
+            "stages": stages,
+            "requests": requests_results,
+            "stub_llm": {"latency": args.llm_latency, "error_rate": args.llm_error_rate, **stub_llm.stats},
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = args.output or os.path.join(results_dir, f"pipeline-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
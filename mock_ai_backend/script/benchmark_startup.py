@@ -0,0 +1,68 @@
+# script/benchmark_startup.py
+#
+# Measures application startup cost in fresh interpreters:
+#   lazy  - `import main` as uvicorn does (models load on first use / in background)
+#   eager - `import main` followed by loading every registry entry, i.e. what
+#           importing the app cost when models were loaded at import time
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.benchmark_startup --runs 5
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SCENARIOS = {
+    "lazy": "import main",
+    "eager": "import main; from services.model_registry import registry; registry.preload()",
+}
+
+TIMER = """
+import time, json
+start = time.perf_counter()
+{code}
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+
+def run_once(code: str) -> float:
+    env = dict(os.environ, PRELOAD_MODELS="false", TF_CPP_MIN_LOG_LEVEL="3")
+    out = subprocess.run(
+        [sys.executable, "-c", TIMER.format(code=code)],
+        cwd=backend_dir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])["seconds"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app import/startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        timings = [run_once(code) for _ in range(args.runs)]
+        results[name] = {
+            "median_s": round(statistics.median(timings), 3),
+            "min_s": round(min(timings), 3),
+            "max_s": round(max(timings), 3),
+        }
+        print(f"⏱️ {name:5s} median={results[name]['median_s']}s min={results[name]['min_s']}s max={results[name]['max_s']}s")
+
+    speedup = results["eager"]["median_s"] / max(results["lazy"]["median_s"], 1e-9)
+    results["speedup"] = round(speedup, 1)
+    print(f"✅ Lazy startup is {speedup:.1f}x faster than eager model loading")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# script/benchmark_workers.py
+#
+# Throughput of the production server (gunicorn.conf.py) with 1 vs N workers
+# on this machine.
+#
+# For each worker count a real gunicorn master is started with the models
+# preloaded, speech recognition stubbed and the LLM replayed by the in-process
+# stub (services/llm_stub.py), so only the backend's own work is measured.
+# /emotion/analyze-single is then driven at a fixed client concurrency. The
+# report gives requests per second, latency percentiles, admission rejections
+# and memory: summed RSS (counts shared pages once per process) next to summed
+# PSS (shares them out), whose gap is what copy-on-write sharing saves.
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.benchmark_workers
+#   python -m script.benchmark_workers --workers 1 2 4 --concurrency 8 --requests 48 --llm-latency lognormal:800,0.5
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+results_dir = os.path.join(backend_dir, 'benchmark_results')
+
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from script.benchmark_pipeline import environment_info, latency_stats, make_synthetic_video  # noqa: E402
+
+
+def stubbed_app():
+    """gunicorn app factory: the real app with speech recognition and the LLM stubbed"""
+    from script.benchmark_pipeline import install_network_stubs
+    from services.llm_stub import STUB_LLM_ERROR_RATE, STUB_LLM_LATENCY
+
+    install_network_stubs(STUB_LLM_LATENCY, STUB_LLM_ERROR_RATE)
+    from main import app
+    return app
+
+
+def process_memory(pid: int) -> dict:
+    """RSS and PSS in bytes from /proc (Linux)"""
+    memory = {"rss": 0, "pss": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key.lower() in memory:
+                    memory[key.lower()] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return memory
+
+
+def child_pids(pid: int) -> list:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def server_memory(master_pid: int) -> dict:
+    pids = [master_pid] + child_pids(master_pid)
+    usage = [process_memory(pid) for pid in pids]
+    return {
+        "processes": len(pids),
+        "rss_total_mb": round(sum(u["rss"] for u in usage) / 2**20, 1),
+        "pss_total_mb": round(sum(u["pss"] for u in usage) / 2**20, 1),
+    }
+
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "gunicorn", "-c", os.path.join(backend_dir, "gunicorn.conf.py"),
+        "--workers", str(workers), "--bind", f"127.0.0.1:{port}",
+        "script.benchmark_workers:stubbed_app()",
+    ]
+    return subprocess.Popen(command, cwd=backend_dir, env=env, start_new_session=True)
+
+
+def wait_ready(client, proc: subprocess.Popen, timeout: float):
+    """Wait until /ready answers 200 (the worker that answered has every model loaded)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {proc.returncode}")
+        try:
+            if client.get("/ready").status_code == 200:
+                return
+        except Exception:
+            pass
+        time.sleep(1)
+    raise TimeoutError("Server did not become ready")
+
+
+def stop_server(proc: subprocess.Popen):
+    if proc.poll() is None:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+
+
+def drive_load(base_url: str, payload: bytes, concurrency: int, total: int) -> dict:
+    import httpx
+
+    def one_request(i: int):
+        start = time.perf_counter()
+        response = httpx.post(
+            f"{base_url}/emotion/analyze-single",
+            files={"video": ("bench.mp4", payload, "video/mp4")},
+            data={"question": "Tell me about your experience", "question_index": str(i)},
+            timeout=600
+        )
+        ok = response.status_code == 200 and response.json().get("success")
+        return time.perf_counter() - start, response.status_code if not ok else 200
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(one_request, range(total)))
+    wall = time.perf_counter() - wall_start
+
+    latencies = [elapsed for elapsed, status in outcomes if status == 200]
+    stats = latency_stats(latencies)
+    stats["throughput_rps"] = round(len(latencies) / wall, 3)
+    stats["failed"] = {str(status): sum(1 for _, s in outcomes if s == status)
+                       for status in sorted({s for _, s in outcomes if s != 200})}
+    stats["wall_s"] = round(wall, 2)
+    return stats
+
+
+def bench_worker_count(workers: int, args, payload: bytes, env: dict) -> dict:
+    import httpx
+
+    port = args.port + workers
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = start_server(workers, port, env)
+    try:
+        with httpx.Client(base_url=base_url, timeout=10) as client:
+            wait_ready(client, proc, args.startup_timeout)
+        boot_s = round(time.perf_counter() - started, 1)
+        idle_memory = server_memory(proc.pid)
+
+        # Warm every worker (lazy per-worker loads, first-request costs) before measuring
+        drive_load(base_url, payload, workers, workers * 2)
+        stats = drive_load(base_url, payload, args.concurrency, args.requests)
+        stats.update(workers=workers, boot_s=boot_s, memory_idle=idle_memory, memory_loaded=server_memory(proc.pid))
+    finally:
+        stop_server(proc)
+
+    print(f"  ⚙️ workers={workers:<2d} rps={stats['throughput_rps']:<7} p50={stats['p50_s']:.2f}s "
+          f"p95={stats['p95_s']:.2f}s failed={stats['failed'] or 0} "
+          f"RSS={stats['memory_loaded']['rss_total_mb']}MB PSS={stats['memory_loaded']['pss_total_mb']}MB")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare server throughput with 1 vs N gunicorn workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, min(4, os.cpu_count() or 1)])
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client requests")
+    parser.add_argument("--requests", type=int, default=32, help="Measured requests per worker count")
+    parser.add_argument("--seconds", type=float, default=10, help="Length of the synthetic answer video")
+    parser.add_argument("--video", help="Use an existing clip instead of generating one")
+    parser.add_argument("--llm-latency", default="fixed:0", help="Stub LLM time to first token (see services/llm_stub.py)")
+    parser.add_argument("--port", type=int, default=8700, help="Base port (the worker count is added)")
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--output", help="Results JSON path (default: benchmark_results/workers-<timestamp>.json)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_workers_")
+    try:
+        video_path = args.video or make_synthetic_video(
+            os.path.join(work_dir, "synthetic.mp4"), args.seconds, 30, (1280, 720)
+        )["path"]
+        with open(video_path, "rb") as f:
+            payload = f.read()
+
+        results = {"environment": environment_info(), "concurrency": args.concurrency,
+                   "requests": args.requests, "runs": {}}
+        for workers in args.workers:
+            # Admission limits are server-wide totals split between the workers
+            # (services/admission.py), so they are set per run: one running slot per
+            # analysis thread of every worker, and room for each worker to queue the
+            # whole client concurrency. Otherwise every run would be capped at the
+            # same total and the comparison would measure admission, not workers.
+            analysis_workers = int(os.environ.get("ANALYSIS_WORKERS", max(1, (os.cpu_count() or 1) // workers)))
+            env = {
+                **os.environ,
+                "LLM_PROVIDER": "stub",
+                "STUB_LLM_LATENCY": args.llm_latency,
+                "PRELOAD_MODELS": "true",
+                # A fresh database per run, shared by that run's workers
+                "DATABASE_PATH": os.path.join(work_dir, f"workers_{workers}", "mock_ai.db"),
+                "ANALYSIS_WORKERS": str(analysis_workers),
+                "ADMISSION_SINGLE_MAX_CONCURRENT": str(workers * analysis_workers),
+                "ADMISSION_SINGLE_MAX_QUEUE": str(workers * args.concurrency),
+                "ADMISSION_PER_USER_LIMIT": os.environ.get("ADMISSION_PER_USER_LIMIT", str(args.concurrency)),
+            }
+            print(f"🚀 Starting gunicorn with {workers} worker(s)")
+            results["runs"][str(workers)] = bench_worker_count(workers, args, payload, env)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    runs = results["runs"]
+    baseline = runs.get(str(min(args.workers)))
+    if baseline and baseline["throughput_rps"]:
+        for workers, stats in runs.items():
+            stats["speedup"] = round(stats["throughput_rps"] / baseline["throughput_rps"], 2)
+            print(f"📈 {workers} worker(s): {stats['speedup']}x throughput of {min(args.workers)}, "
+                  f"PSS {stats['memory_loaded']['pss_total_mb']}MB vs RSS {stats['memory_loaded']['rss_total_mb']}MB")
+
+    output = args.output or os.path.join(results_dir, f"workers-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
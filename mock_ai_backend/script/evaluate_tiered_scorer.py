@@ -0,0 +1,117 @@
+# script/evaluate_tiered_scorer.py
+#
+# Replays hand-labelled answers (script/evaluation_fixtures.json, with the LLM's
+# status/score as the label) through the local scorer of the tiered answer
+# evaluation and reports how many answers it would route to the LLM and how
+# well the locally resolved ones agree with the LLM. Use it to tune
+# EVALUATION_ROUTING_THRESHOLD. Each threshold is replayed with the fixtures'
+# reference answers and without them (questions that have no stored
+# reference); exits non-zero when agreement drops below --min-agreement.
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.evaluate_tiered_scorer
+#   python -m script.evaluate_tiered_scorer --threshold 0.5 0.6 0.7 --verbose
+#   python -m script.evaluate_tiered_scorer --record    # re-label fixtures with the live LLM (needs TOGETHER_API_KEY)
+
+import argparse
+import json
+import os
+import statistics
+import sys
+
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.answer_evaluator import (  # noqa: E402
+    EVALUATION_ROUTING_THRESHOLD,
+    local_evaluation,
+    needs_llm
+)
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "evaluation_fixtures.json")
+
+
+def load_fixtures(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record_fixtures(path: str, fixtures: list):
+    """Refresh every fixture's label with the current LLM evaluation"""
+    from services.answer_checker import evaluate_answer
+
+    for i, fixture in enumerate(fixtures):
+        result = evaluate_answer(fixture["question"], fixture["answer"])
+        if result.get("status") == "Error":
+            print(f"⚠️ Fixture {i}: {result.get('feedback')} (label kept)")
+            continue
+        fixture["llm_status"] = result["status"]
+        fixture["llm_score"] = result["score"]
+        print(f"📝 Fixture {i}: {result['status']} ({result['score']})")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixtures, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def replay(fixtures: list, threshold: float, verbose: bool = False, use_references: bool = True) -> dict:
+    """
+    ``use_references=False`` scores every answer against its question only, as
+    for questions that were not generated with a stored reference answer.
+    """
+    local, routed = [], 0
+    for fixture in fixtures:
+        reference = fixture.get("reference_answer") if use_references else None
+        evaluation = local_evaluation(fixture["question"], fixture["answer"], reference or None)
+        if needs_llm(evaluation, mode="tiered", threshold=threshold):
+            routed += 1
+            outcome = "→ llm"
+        else:
+            local.append((evaluation, fixture))
+            outcome = "✅" if evaluation["status"] == fixture["llm_status"] else "❌"
+        if verbose:
+            print(f"  {outcome:6s} local {evaluation['status']:17s} {evaluation['score']:3d} "
+                  f"(conf {evaluation['local_confidence']:.2f})  llm {fixture['llm_status']:17s} "
+                  f"{fixture['llm_score']:3d}  {fixture['answer'][:50]}")
+
+    agree = sum(evaluation["status"] == fixture["llm_status"] for evaluation, fixture in local)
+    return {
+        "threshold": threshold,
+        "references": use_references,
+        "fixtures": len(fixtures),
+        "routed_to_llm": routed,
+        "llm_call_rate": round(routed / len(fixtures), 3) if fixtures else 0.0,
+        "resolved_locally": len(local),
+        "status_agreement": round(agree / len(local), 3) if local else 1.0,
+        "score_mae": round(statistics.mean(abs(e["score"] - f["llm_score"]) for e, f in local), 1) if local else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay labelled answers through the local answer scorer")
+    parser.add_argument("--fixtures", default=FIXTURES_PATH)
+    parser.add_argument("--threshold", type=float, nargs="+", default=[EVALUATION_ROUTING_THRESHOLD],
+                        help="Routing confidence threshold(s) to evaluate")
+    parser.add_argument("--min-agreement", type=float, default=0.8,
+                        help="Fail when locally resolved answers agree with the LLM less often than this")
+    parser.add_argument("--record", action="store_true", help="Re-label the fixtures with the live LLM first")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if args.record:
+        record_fixtures(args.fixtures, fixtures)
+
+    failed = False
+    for threshold, use_references in ((t, r) for t in args.threshold for r in (True, False)):
+        print(f"🔎 Routing threshold {threshold}, {'with' if use_references else 'without'} reference answers")
+        report = replay(fixtures, threshold, args.verbose, use_references)
+        print(f"   LLM calls {report['routed_to_llm']}/{report['fixtures']} ({report['llm_call_rate']:.0%}), "
+              f"local agreement {report['status_agreement']:.0%} over {report['resolved_locally']}, "
+              f"score MAE {report['score_mae']}")
+        failed |= report["status_agreement"] < args.min_agreement
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
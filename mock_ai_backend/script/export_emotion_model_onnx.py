@@ -0,0 +1,146 @@
+# script/export_emotion_model_onnx.py
+#
+# Converts models/facial_emotion_model.h5 to ONNX for the ONNX Runtime backend
+# (EMOTION_MODEL_BACKEND=onnx), optionally quantized to int8, and checks that
+# the exported model agrees with the Keras outputs.
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.export_emotion_model_onnx
+#   python -m script.export_emotion_model_onnx --int8 --calibration-dir data/facial_emotion/test
+#
+# Needs tf2onnx (both for Keras 3's native ONNX export on the TensorFlow backend
+# and for the fallback): pip install --no-deps -r requirements-export.txt
+
+import argparse
+import glob
+import os
+import sys
+
+import numpy as np
+
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # 2 = Hide INFO and WARNING
+
+models_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models'))
+keras_model_path = os.path.join(models_dir, 'facial_emotion_model.h5')
+onnx_model_path = os.path.join(models_dir, 'facial_emotion_model.onnx')
+
+INPUT_SHAPE = (48, 48, 1)
+PARITY_TOLERANCE = 1e-4    # Max abs probability diff allowed for the float export
+INT8_MIN_AGREEMENT = 0.95  # Min argmax agreement allowed for int8 exports
+
+
+def export_to_onnx(keras_model, output_path: str):
+    """Export the Keras model with a dynamic batch dimension"""
+    try:
+        import tf2onnx
+    except ImportError:
+        sys.exit("❌ tf2onnx is required for the export: pip install --no-deps -r requirements-export.txt")
+
+    try:
+        # Keras 3 exports ONNX natively
+        keras_model.export(output_path, format="onnx")
+    except (TypeError, ValueError, NotImplementedError):
+        import tensorflow as tf
+
+        spec = (tf.TensorSpec((None, *INPUT_SHAPE), tf.float32, name="input"),)
+        tf2onnx.convert.from_keras(keras_model, input_signature=spec, output_path=output_path)
+
+
+def load_calibration_images(calibration_dir: str, limit: int = 500) -> np.ndarray:
+    """Load grayscale face images (any subfolder layout) as normalized 48x48 inputs"""
+    import cv2
+
+    paths = []
+    for ext in ("png", "jpg", "jpeg"):
+        paths.extend(glob.glob(os.path.join(calibration_dir, "**", f"*.{ext}"), recursive=True))
+
+    images = []
+    for path in sorted(paths)[:limit]:
+        img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if img is not None:
+            images.append(cv2.resize(img, INPUT_SHAPE[:2]))
+
+    if not images:
+        raise ValueError(f"No calibration images found in {calibration_dir}")
+    return np.stack(images).reshape(-1, *INPUT_SHAPE).astype(np.float32) / 255.0
+
+
+def quantize_int8(float_path: str, output_path: str, calibration: np.ndarray = None):
+    """Dynamic int8 weight quantization, or static QDQ quantization when calibration data is given"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic, quantize_static, CalibrationDataReader
+
+    if calibration is None:
+        quantize_dynamic(float_path, output_path, weight_type=QuantType.QInt8)
+        return
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(float_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class Reader(CalibrationDataReader):
+        def __init__(self):
+            self.batches = iter({input_name: calibration[i:i + 1]} for i in range(len(calibration)))
+
+        def get_next(self):
+            return next(self.batches, None)
+
+    quantize_static(float_path, output_path, Reader(), activation_type=QuantType.QInt8, weight_type=QuantType.QInt8)
+
+
+def check_parity(keras_model, onnx_path: str, inputs: np.ndarray) -> dict:
+    """Compare ONNX Runtime outputs against the Keras model on the same inputs"""
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    keras_out = keras_model.predict(inputs, verbose=0)
+    onnx_out = session.run(None, {input_name: inputs})[0]
+
+    return {
+        "max_abs_diff": float(np.max(np.abs(keras_out - onnx_out))),
+        "argmax_agreement": float(np.mean(keras_out.argmax(axis=1) == onnx_out.argmax(axis=1)))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the facial emotion model to ONNX")
+    parser.add_argument("--output", default=onnx_model_path)
+    parser.add_argument("--int8", action="store_true", help="Quantize weights (and activations with --calibration-dir) to int8")
+    parser.add_argument("--calibration-dir", help="Folder of face images for static int8 calibration and parity checks")
+    parser.add_argument("--parity-samples", type=int, default=256)
+    parser.add_argument("--tolerance", type=float, default=PARITY_TOLERANCE, help="Max abs diff allowed for the float export")
+    parser.add_argument("--min-agreement", type=float, default=INT8_MIN_AGREEMENT, help="Min argmax agreement allowed for int8 exports")
+    args = parser.parse_args()
+
+    from keras.models import load_model
+    keras_model = load_model(keras_model_path)
+
+    calibration = load_calibration_images(args.calibration_dir) if args.calibration_dir else None
+
+    float_path = args.output if not args.int8 else args.output.replace(".onnx", ".fp32.onnx")
+    export_to_onnx(keras_model, float_path)
+    print(f"✅ Exported ONNX model: {float_path}")
+
+    if args.int8:
+        quantize_int8(float_path, args.output, calibration)
+        print(f"✅ Quantized int8 model: {args.output}")
+
+    # Parity check against Keras on real faces when available, otherwise random inputs
+    if calibration is not None:
+        samples = calibration[:args.parity_samples]
+    else:
+        samples = np.random.default_rng(0).random((args.parity_samples, *INPUT_SHAPE), dtype=np.float32)
+    parity = check_parity(keras_model, args.output, samples)
+    print(f"📊 Parity vs Keras: max_abs_diff={parity['max_abs_diff']:.6f}, argmax_agreement={parity['argmax_agreement']:.3f}")
+
+    if args.int8:
+        ok = parity["argmax_agreement"] >= args.min_agreement
+    else:
+        ok = parity["max_abs_diff"] <= args.tolerance
+    if not ok:
+        print("❌ Exported model does not match the Keras outputs")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
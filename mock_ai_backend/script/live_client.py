@@ -0,0 +1,218 @@
+# script/live_client.py
+#
+# Scripted client for the live interview WebSocket (/live/interview).
+#
+# Streams a video file (or a generated synthetic one) as downscaled JPEG
+# frames plus 16 kHz PCM audio, optionally paced in real time, prints the live
+# indicators as they arrive and reports how long the final aggregate took
+# after the stream ended.
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.live_client --in-process                      # app in-process, network services stubbed
+#   python -m script.live_client --video answer.mp4 --url ws://localhost:8000/live/interview --realtime
+
+import argparse
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import cv2
+
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+os.environ.setdefault("PRELOAD_MODELS", "false")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+os.environ.setdefault("LLM_PROVIDER", "stub")  # Only affects --in-process
+
+from services.video_normalizer import find_ffmpeg
+
+HEADER = struct.Struct("<Bd")
+MESSAGE_FRAME = 1
+MESSAGE_AUDIO = 2
+SAMPLE_RATE = 16000
+
+
+def read_pcm(video_path: str) -> bytes:
+    """16 kHz mono s16le audio of the video ("" when ffmpeg or the audio track is missing)"""
+    ffmpeg = find_ffmpeg()
+    if not ffmpeg:
+        print("⚠️ ffmpeg not found, streaming without audio")
+        return b""
+    result = subprocess.run(
+        [ffmpeg, "-nostdin", "-loglevel", "error", "-i", video_path, "-vn", "-ac", "1",
+         "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+        capture_output=True
+    )
+    return result.stdout if result.returncode == 0 else b""
+
+
+def iter_messages(video_path: str, send_fps: float, width: int, quality: int):
+    """Yield (timestamp, binary message) pairs: JPEG frames at ``send_fps`` interleaved with audio chunks"""
+    pcm = read_pcm(video_path)
+    bytes_per_second = SAMPLE_RATE * 2
+    audio_sent = 0
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(1, round(fps / send_fps))
+    frame_idx = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            t = frame_idx / fps
+            frame_idx += 1
+
+            # Audio up to this point in time
+            audio_end = min(len(pcm), int(t * bytes_per_second) // 2 * 2)
+            if audio_end > audio_sent:
+                yield t, HEADER.pack(MESSAGE_AUDIO, t) + pcm[audio_sent:audio_end]
+                audio_sent = audio_end
+
+            if (frame_idx - 1) % step:
+                continue
+            h, w = frame.shape[:2]
+            if w > width:
+                frame = cv2.resize(frame, (width, int(h * width / w)), interpolation=cv2.INTER_AREA)
+            ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if ok:
+                yield t, HEADER.pack(MESSAGE_FRAME, t) + jpeg.tobytes()
+    finally:
+        cap.release()
+
+    if audio_sent < len(pcm):
+        t = frame_idx / fps
+        yield t, HEADER.pack(MESSAGE_AUDIO, t) + pcm[audio_sent:]
+
+
+def run_session(ws, args, video_path: str) -> dict:
+    """Drive one answer over an open connection (websockets client or TestClient session)"""
+    messages = []
+    final_received = threading.Event()
+    done = threading.Event()
+    timings = {}
+
+    def receiver():
+        while True:
+            message = json.loads(ws.recv()) if hasattr(ws, "recv") else ws.receive_json()
+            messages.append(message)
+            kind = message.get("type")
+            if kind == "indicators":
+                print(f"  📡 t={message['t']:6.2f}s face={message['face']:8s} eye={message['eye_contact']:.2f} "
+                      f"posture={message['posture']:.2f} smile={message['smile']:.2f}")
+            elif kind == "final":
+                timings["final_after_end_s"] = round(time.perf_counter() - timings["end_sent"], 3)
+                final_received.set()
+                print(f"  🏁 Final aggregate {timings['final_after_end_s']}s after end: "
+                      f"{json.dumps({k: v for k, v in message['analysis'].items() if k != 'emotion'})}")
+            elif kind == "transcript":
+                speech = message.get("transcript_analytics") or {}
+                print(f"  🗣️ Transcript: {speech.get('word_count', 0)} words, "
+                      f"{speech.get('words_per_minute')} wpm, {speech.get('filler_count', 0)} fillers")
+            elif kind == "evaluation":
+                timings["evaluation_after_end_s"] = round(time.perf_counter() - timings["end_sent"], 3)
+                evaluation = message["answer_evaluation"]
+                print(f"  📝 Evaluation {timings['evaluation_after_end_s']}s after end, "
+                      f"score={evaluation.get('score')} ({evaluation.get('tier')})")
+                if not evaluation.get("llm_job_id"):
+                    done.set()
+                    return
+            elif kind == "llm_evaluation":
+                timings["llm_evaluation_after_end_s"] = round(time.perf_counter() - timings["end_sent"], 3)
+                print(f"  🤖 LLM evaluation {timings['llm_evaluation_after_end_s']}s after end: {message['status']}, "
+                      f"score={(message.get('answer_evaluation') or {}).get('score')}")
+                done.set()
+                return
+            elif kind == "error":
+                print(f"  ❌ {message['detail']}")
+                done.set()
+                return
+
+    send_json = (lambda data: ws.send(json.dumps(data))) if hasattr(ws, "recv") else ws.send_json
+    send_bytes = ws.send if hasattr(ws, "recv") else ws.send_bytes
+
+    send_json({"type": "start", "question": args.question, "question_index": args.question_index,
+               "session_id": args.session_id, "sample_rate": SAMPLE_RATE,
+               "detailed_feedback": args.detailed_feedback})
+    ready = json.loads(ws.recv()) if hasattr(ws, "recv") else ws.receive_json()
+    if ready.get("type") != "ready":
+        raise RuntimeError(f"Server refused the stream: {ready}")
+
+    thread = threading.Thread(target=receiver, daemon=True)
+    thread.start()
+
+    started = time.perf_counter()
+    sent = 0
+    for t, data in iter_messages(video_path, args.send_fps, args.width, args.quality):
+        if args.realtime:
+            delay = t - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        send_bytes(data)
+        sent += len(data)
+
+    timings["stream_s"] = round(time.perf_counter() - started, 3)
+    timings["bytes_sent"] = sent
+    timings["end_sent"] = time.perf_counter()
+    send_json({"type": "end"})
+    done.wait(timeout=args.timeout)
+    timings.pop("end_sent")
+    return {"timings": timings, "messages": messages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a recorded answer to the live interview WebSocket")
+    parser.add_argument("--video", help="Video to stream (default: a generated synthetic clip)")
+    parser.add_argument("--seconds", type=float, default=10, help="Length of the synthetic clip")
+    parser.add_argument("--url", default="ws://localhost:8000/live/interview")
+    parser.add_argument("--token", help="Bearer token (needed with --session-id)")
+    parser.add_argument("--in-process", action="store_true", help="Run the app in-process with network services stubbed")
+    parser.add_argument("--question", default="Tell me about yourself")
+    parser.add_argument("--question-index", type=int, default=0)
+    parser.add_argument("--session-id")
+    parser.add_argument("--detailed-feedback", action="store_true", help="Always wait for the LLM evaluation")
+    parser.add_argument("--send-fps", type=float, default=5, help="Frames per second sent to the server")
+    parser.add_argument("--width", type=int, default=480, help="Max JPEG width")
+    parser.add_argument("--quality", type=int, default=70, help="JPEG quality")
+    parser.add_argument("--realtime", action="store_true", help="Pace messages like a live camera")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="live_client_")
+    try:
+        video_path = args.video
+        if not video_path:
+            from script.benchmark_pipeline import make_synthetic_video
+            video_path = make_synthetic_video(os.path.join(work_dir, "answer.mp4"), args.seconds, 30, (1280, 720))["path"]
+
+        query = f"?token={args.token}" if args.token else ""
+        if args.in_process:
+            from fastapi.testclient import TestClient
+            from main import app
+            from script.benchmark_pipeline import install_network_stubs
+
+            install_network_stubs()
+            with TestClient(app) as client, client.websocket_connect(f"/live/interview{query}") as ws:
+                result = run_session(ws, args, video_path)
+        else:
+            from websockets.sync.client import connect
+
+            with connect(args.url + query, max_size=None) as ws:
+                result = run_session(ws, args, video_path)
+
+        print(f"✅ Streamed {result['timings']['bytes_sent']} bytes in {result['timings']['stream_s']}s; "
+              f"final aggregate after {result['timings'].get('final_after_end_s')}s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
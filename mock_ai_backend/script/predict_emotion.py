@@ -3,47 +3,113 @@
 import cv2
 import numpy as np
 import os
-import tensorflow as tf
-from keras.models import load_model
-from keras.preprocessing.image import img_to_array
 
 from utils.smile_utils import estimate_smile
 from utils.eye_contact_utils import estimate_eye_contact
-from utils.hand_movement_utils import estimate_hand_movement
-from utils.head_nod_utils import estimate_head_nod
-from utils.confidence_utils import estimate_confidence
+from utils.frame_buffers import BufferPool, CropBatch, FrameRing
+from services.emotion_detector import (
+    EMOTION_LABELS,
+    get_emotion_detector,
+    sample_frames,
+    whole_frame_crop
+)
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # 2 = Hide INFO and WARNING
 
-# Load emotion model
-model_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models', 'facial_emotion_model.h5'))
-model = load_model(model_path)
-
-def extract_frames(video_path, max_frames=30):
-    cap = cv2.VideoCapture(video_path)
-    frames = []
-    total = 0
-
-    while cap.isOpened() and len(frames) < max_frames:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        total += 1
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        resized = cv2.resize(gray, (48, 48))
-        frames.append(resized)
-
-    cap.release()
-    return frames, total
-
-EMOTION_LABELS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
+models_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models'))
+model_path = os.path.join(models_dir, 'facial_emotion_model.h5')
+onnx_model_path = os.getenv("EMOTION_ONNX_MODEL_PATH", os.path.join(models_dir, 'facial_emotion_model.onnx'))
+
+
+class OnnxEmotionModel:
+    """ONNX Runtime CPU session exposing the same predict() call as the Keras model"""
+
+    def __init__(self, path: str):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = int(os.getenv("ONNX_INTRA_OP_THREADS", "1"))
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch, verbose=0):
+        return self.session.run(None, {self.input_name: np.asarray(batch, dtype=np.float32)})[0]
+
+
+def load_emotion_model(backend: str = "keras"):
+    """Load the 48x48 CNN: "keras" loads the original .h5 model, "onnx" the exported one with ONNX Runtime"""
+    if backend == "onnx":
+        return OnnxEmotionModel(onnx_model_path)
+    if backend != "keras":
+        raise ValueError(f"Unknown emotion model backend: {backend}")
+
+    # TensorFlow/Keras are only imported when the Keras backend is selected
+    from keras.models import load_model
+    return load_model(model_path)
+
+
+def extract_frames(video_path, max_frames=30, keep_color=True):
+    """
+    First ``max_frames`` frames as an (N, 48, 48) grayscale batch, plus the decoded
+    color frames when ``keep_color`` (otherwise decode buffers are reused).
+    """
+    crops = CropBatch(capacity=max_frames)
+    buffers = BufferPool()
+    ring = None if keep_color else FrameRing()
+    color_frames = []
+    for _, frame in sample_frames(video_path, 1, max_frames, ring=ring, buffers=None if keep_color else buffers):
+        crops.commit(whole_frame_crop(frame, dst=crops.next_slot(), buffers=buffers))
+        if keep_color:
+            color_frames.append(frame)
+    return crops.array(), color_frames
+
+def crop_face(frame, face_landmarks, size=48, margin=0.1, dst=None, buffers=None):
+    """
+    Grayscale face crop from an already computed FaceMesh bounding box, sized for the emotion model.
+    Written into ``dst`` (size x size uint8) when given; ``buffers`` is an optional BufferPool.
+    """
+    h, w = frame.shape[:2]
+    points = np.array([(lm.x, lm.y) for lm in face_landmarks.landmark])
+    x_min, y_min = points.min(axis=0)
+    x_max, y_max = points.max(axis=0)
+
+    pad_x = (x_max - x_min) * margin
+    pad_y = (y_max - y_min) * margin
+    x0 = int(max(0, (x_min - pad_x) * w))
+    y0 = int(max(0, (y_min - pad_y) * h))
+    x1 = int(min(w, (x_max + pad_x) * w))
+    y1 = int(min(h, (y_max + pad_y) * h))
+
+    if x1 <= x0 or y1 <= y0:
+        return None
+
+    # Shrink the color ROI first so the gray conversion only touches size x size pixels
+    small = cv2.resize(frame[y0:y1, x0:x1], (size, size),
+                       dst=buffers.get("crop_bgr", (size, size, 3)) if buffers else None)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=dst)
+
+def predict_emotion_probabilities(face_crops, frames=None):
+    """
+    Run the configured emotion backend once over a batch of 48x48 grayscale crops
+    (and the matching BGR frames for backends with their own face detection).
+    Returns (N, 7) probabilities; all-zero rows mean the backend found no face.
+    """
+    # Loaded on first use through the registry instead of at import time
+    return get_emotion_detector().predict(face_crops, frames)
+
+def probabilities_to_emotions(probs) -> dict:
+    """Map one probability row to DeepFace-style lowercase labels in percent"""
+    return {label.lower(): float(p) * 100 for label, p in zip(EMOTION_LABELS, probs)}
 
 def predict_emotions_on_frames(file_paths):
     global detected_emotions
     detected_emotions = []
 
+    detector = get_emotion_detector()
+
     for path in file_paths:
-        frames, total = extract_frames(path)
+        frames, color_frames = extract_frames(path, keep_color=detector.needs_frames)
         smile_frames = 0
         eye_contact_frames = 0
         # hand_movement_frames = 0  # Commented out for now
@@ -51,9 +117,13 @@ def predict_emotions_on_frames(file_paths):
         
         total_frames = len(frames)
 
+        # One batched forward pass instead of a predict call per frame
+        all_preds = detector.predict(frames, color_frames or None)
+
         for frame_idx, frame in enumerate(frames):
-            img = frame.reshape(1, 48, 48, 1) / 255.0
-            preds = model.predict(img, verbose=0)
+            preds = all_preds[frame_idx]
+            if not preds.any():
+                continue  # Backend found no face in this frame
             label_idx = np.argmax(preds)
             label = EMOTION_LABELS[label_idx]
             detected_emotions.append(label)
@@ -0,0 +1,41 @@
+# script/regenerate_session_feedback.py
+#
+# Re-applies services/feedback_generator.FEEDBACK_RULES to every stored interview
+# session, e.g. after a threshold or message change. Sessions are scored in
+# batches with the vectorized rule evaluator, so no model is re-run.
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.regenerate_session_feedback --batch-size 5000
+
+import argparse
+import time
+
+import numpy as np
+
+from services.feedback_generator import FEEDBACK_METRICS, generate_feedback_batch
+from services.session_store import get_session_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate stored session feedback from the current rule table")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    store = get_session_store()
+    start = time.perf_counter()
+    total = 0
+
+    for session_ids, averages in store.iter_session_averages(args.batch_size):
+        matrix = np.array([[a.get(m, np.nan) for m in FEEDBACK_METRICS] for a in averages], dtype=np.float64)
+        feedback = generate_feedback_batch(matrix)
+        if not args.dry_run:
+            store.set_session_feedback(dict(zip(session_ids, feedback)))
+        total += len(session_ids)
+        print(f"🔁 Regenerated feedback for {total} sessions...")
+
+    print(f"✅ Done: {total} sessions in {time.perf_counter() - start:.2f}s{' (dry run)' if args.dry_run else ''}")
+
+
+if __name__ == "__main__":
+    main()
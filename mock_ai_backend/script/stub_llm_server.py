@@ -0,0 +1,63 @@
+# script/stub_llm_server.py
+#
+# Local stand-in for api.together.xyz that replays recorded responses with a
+# configurable latency distribution and error rate, so the backend can be
+# load-tested end to end (over real HTTP) without network access or API cost.
+#
+# Usage (from mock_ai_backend/):
+#   python -m script.stub_llm_server --port 8100 --latency lognormal:800,0.5 --error-rate 0.02
+#   TOGETHER_API_KEY=stub TOGETHER_API_URL=http://127.0.0.1:8100/v1/chat/completions \
+#   TOGETHER_BASE_URL=http://127.0.0.1:8100/v1 uvicorn main:app
+# TOGETHER_API_URL carries answer evaluation (chat completions), TOGETHER_BASE_URL
+# question generation (POST {base}/completions).
+#
+# Record real responses to replay later by running the backend against Together
+# AI with LLM_RECORD_PATH=llm_recordings.jsonl, then pass --recordings llm_recordings.jsonl.
+# For in-process replay without a server, set LLM_PROVIDER=stub instead.
+
+import argparse
+import os
+import sys
+
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from services.llm_stub import (  # noqa: E402
+    STUB_LLM_ERROR_RATE,
+    STUB_LLM_LATENCY,
+    STUB_LLM_RECORDINGS,
+    STUB_LLM_SERVER_HANG,
+    STUB_LLM_TIMEOUT_RATE,
+    STUB_LLM_TOKENS_PER_S,
+    StubLLM,
+    create_stub_app
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded LLM responses on a Together-compatible API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--recordings", default=STUB_LLM_RECORDINGS, help="JSONL recordings (default: built-in samples)")
+    parser.add_argument("--latency", default=STUB_LLM_LATENCY,
+                        help="Time to first token: fixed:ms, uniform:lo,hi, normal:mean,sd or lognormal:median,sigma")
+    parser.add_argument("--tokens-per-s", type=float, default=STUB_LLM_TOKENS_PER_S)
+    parser.add_argument("--error-rate", type=float, default=STUB_LLM_ERROR_RATE)
+    parser.add_argument("--timeout-rate", type=float, default=STUB_LLM_TIMEOUT_RATE)
+    parser.add_argument("--hang", type=float, default=STUB_LLM_SERVER_HANG,
+                        help="Seconds a simulated timeout holds the request (keep above the backend's 45 s timeout)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    stub = StubLLM(args.recordings, args.latency, args.tokens_per_s, args.error_rate, args.timeout_rate, args.seed)
+    print(f"🤖 Stub LLM on http://{args.host}:{args.port}/v1 "
+          f"({sum(len(v) for v in stub.by_kind.values())} recordings, latency {args.latency}, "
+          f"errors {args.error_rate:.0%}, timeouts {args.timeout_rate:.0%})")
+    uvicorn.run(create_stub_app(stub, args.hang), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+# services/admission.py
+
+import asyncio
+import contextvars
+import math
+import os
+import secrets
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from services.database import get_connection, init_schema
+from services.processes import SERVER_PROCESSES, pid_alive
+from services.tracing import metrics
+from services.auth_store import lookup_session
+
+# Heavy analyses across all requests share one pool instead of a pool per request
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "3"))
+ADMISSION_PER_USER_LIMIT = int(os.getenv("ADMISSION_PER_USER_LIMIT", "2"))
+ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "120"))
+# Server processes sharing the limits (SERVER_PROCESSES by default): concurrency
+# and queue limits are totals split between them, and per-user slots are
+# counted across all of them in SQLite
+ADMISSION_PROCESSES = max(1, int(os.getenv("ADMISSION_PROCESSES", str(SERVER_PROCESSES))))
+
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis")
+
+
+async def run_in_analysis_executor(func, *args):
+    """Run blocking analysis work on the shared pool, keeping the request's context (trace)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(analysis_executor, contextvars.copy_context().run, func, *args)
+
+
+async def client_key(request: Request) -> str:
+    """
+    Identify the caller for fairness: the signed-in user when present, otherwise
+    client address. The session lookup can read SQLite on a cache miss, so it
+    runs off the event loop; the key is kept on the request for later callers.
+    """
+    key = getattr(request.state, "client_key", None)
+    if key is not None:
+        return key
+
+    key = request.client.host if request.client else "anonymous"
+    auth = request.headers.get("authorization", "")
+    if auth.lower().startswith("bearer "):
+        user = await run_in_threadpool(lookup_session, auth[7:])
+        if user is not None:
+            key = f"user:{user['id']}"
+    request.state.client_key = key
+    return key
+
+
+class AdmissionSlotStore:
+    """
+    Running and queued admission slots of every worker process, so a caller's
+    per-user limit holds however the load balancer spreads their requests.
+    Rows of a crashed worker are dropped once its PID is gone.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS admission_slots (
+        slot_id TEXT PRIMARY KEY,
+        controller TEXT NOT NULL,
+        user TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_admission_slots_user ON admission_slots(controller, user);
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        init_schema(self.SCHEMA, path)
+
+    @property
+    def conn(self):
+        return get_connection(self.path)
+
+    def _held(self, conn, controller: str, user: str) -> int:
+        return conn.execute(
+            "SELECT COUNT(*) FROM admission_slots WHERE controller = ? AND user = ?", (controller, user)
+        ).fetchone()[0]
+
+    def _purge_dead(self, conn, controller: str, user: str) -> int:
+        pids = [row["pid"] for row in conn.execute(
+            "SELECT DISTINCT pid FROM admission_slots WHERE controller = ? AND user = ?", (controller, user)
+        )]
+        dead = [pid for pid in pids if pid != os.getpid() and not pid_alive(pid)]
+        for pid in dead:
+            conn.execute("DELETE FROM admission_slots WHERE pid = ?", (pid,))
+        return len(dead)
+
+    def held(self, controller: str, user: str) -> int:
+        return self._held(self.conn, controller, user)
+
+    def acquire(self, controller: str, user: str, limit: int):
+        """Take a slot for ``user``; returns its id, or None when the user already holds ``limit``"""
+        with self.conn as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            held = self._held(conn, controller, user)
+            if held >= limit and self._purge_dead(conn, controller, user):
+                held = self._held(conn, controller, user)
+            if held >= limit:
+                return None
+            slot_id = secrets.token_hex(8)
+            conn.execute(
+                "INSERT INTO admission_slots (slot_id, controller, user, pid, created_at) VALUES (?, ?, ?, ?, ?)",
+                (slot_id, controller, user, os.getpid(), time.time())
+            )
+            return slot_id
+
+    def release(self, slot_id: str):
+        self.conn.execute("DELETE FROM admission_slots WHERE slot_id = ?", (slot_id,))
+
+    def clear(self):
+        """Forget every slot (server start, before any worker admits a request)"""
+        self.conn.execute("DELETE FROM admission_slots")
+
+
+_slots = None
+_slots_lock = threading.Lock()
+
+
+def get_admission_slots() -> AdmissionSlotStore:
+    global _slots
+    if _slots is None:
+        with _slots_lock:
+            if _slots is None:
+                _slots = AdmissionSlotStore()
+    return _slots
+
+
+class AdmissionRejected(HTTPException):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(status_code=status_code, detail=detail, headers={"Retry-After": str(retry_after)})
+
+
+class AdmissionController:
+    """
+    Bounded concurrency for one endpoint class.
+
+    At most ``max_concurrent`` requests run at once and at most ``max_queue``
+    wait; beyond that requests are rejected immediately with 503 and a
+    Retry-After estimate. Each caller may hold at most ``per_user_limit``
+    running+queued slots (429 beyond that), and freed slots go to the waiting
+    caller with the fewest running requests, so one client cannot starve others.
+
+    With ``processes`` > 1 the concurrency and queue limits are deployment-wide
+    totals split evenly between the processes (at least one running slot
+    each), and the per-user limit is enforced across all of them through
+    AdmissionSlotStore.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int,
+                 per_user_limit: int = ADMISSION_PER_USER_LIMIT, max_wait: float = ADMISSION_MAX_WAIT,
+                 processes: int = ADMISSION_PROCESSES):
+        self.name = name
+        self.processes = max(1, processes)
+        self.max_concurrent = max(1, math.ceil(max_concurrent / self.processes))
+        self.max_queue = max(0, math.ceil(max_queue / self.processes))
+        self.per_user_limit = max(1, per_user_limit)
+        self.max_wait = max_wait
+        self.shared = self.processes > 1
+
+        self._active = 0
+        self._active_by_user = Counter()
+        self._waiting = OrderedDict()  # user -> deque of futures, in arrival order
+        self._queued = 0
+        self._avg_service_time = 5.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the recent average service time"""
+        waves = (self._queued + 1) / self.max_concurrent
+        return max(1, math.ceil(waves * self._avg_service_time))
+
+    def _held_locally(self, user: str) -> int:
+        return self._active_by_user[user] + len(self._waiting.get(user, ()))
+
+    def _reject_user(self):
+        raise AdmissionRejected(429, f"Too many concurrent {self.name} requests for this user", self.retry_after())
+
+    def check(self, user: str):
+        """Raise AdmissionRejected if this request should not even be queued (this process's view)"""
+        if self._held_locally(user) >= self.per_user_limit:
+            self._reject_user()
+        if self._active >= self.max_concurrent and self._queued >= self.max_queue:
+            raise AdmissionRejected(503, f"Server busy: {self.name} queue is full", self.retry_after())
+
+    async def precheck(self, user: str):
+        """``check`` plus the user's slots in every other process (SQLite, off the event loop)"""
+        self.check(user)
+        if self.shared and await run_in_threadpool(get_admission_slots().held, self.name, user) >= self.per_user_limit:
+            self._reject_user()
+
+    async def precheck_response(self, user: str):
+        """Fast rejection before the upload body is read; returns a response or None"""
+        try:
+            await self.precheck(user)
+        except AdmissionRejected as e:
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
+        return None
+
+    def _grant_next(self):
+        while self._active < self.max_concurrent and self._waiting:
+            # Fairness: the waiting user with the fewest running requests goes first,
+            # ties broken by arrival order
+            user = min(self._waiting, key=lambda u: self._active_by_user[u])
+            queue = self._waiting[user]
+            future = queue.popleft()
+            if not queue:
+                del self._waiting[user]
+            else:
+                self._waiting.move_to_end(user)
+            self._queued -= 1
+            if future.cancelled():
+                continue
+            self._active += 1
+            self._active_by_user[user] += 1
+            future.set_result(True)
+
+    def _release(self, user: str, service_time: float):
+        self._active -= 1
+        self._active_by_user[user] -= 1
+        if self._active_by_user[user] <= 0:
+            del self._active_by_user[user]
+        self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * service_time
+        self._grant_next()
+
+    def _remove_waiter(self, user: str, future):
+        queue = self._waiting.get(user)
+        if queue and future in queue:
+            queue.remove(future)
+            self._queued -= 1
+            if not queue:
+                del self._waiting[user]
+
+    @asynccontextmanager
+    async def admit(self, user: str):
+        self.check(user)
+        slot_id = None
+        if self.shared:
+            slot_id = await run_in_threadpool(get_admission_slots().acquire, self.name, user, self.per_user_limit)
+            if slot_id is None:
+                self._reject_user()
+        try:
+            async with self._admit_locally(user) as queue_time:
+                yield queue_time
+        finally:
+            if slot_id is not None:
+                # Shielded: a cancelled request still gives its slot back
+                await asyncio.shield(run_in_threadpool(get_admission_slots().release, slot_id))
+
+    @asynccontextmanager
+    async def _admit_locally(self, user: str):
+        self.check(user)  # Again: the shared slot lookup yielded to the event loop
+        queued_at = time.perf_counter()
+
+        if self._active < self.max_concurrent and not self._waiting:
+            self._active += 1
+            self._active_by_user[user] += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._waiting.setdefault(user, deque()).append(future)
+            self._queued += 1
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                if future.done():
+                    # Granted just as the wait expired
+                    self._release(user, 0.0)
+                else:
+                    future.cancel()
+                    self._remove_waiter(user, future)
+                raise AdmissionRejected(503, f"Timed out waiting for a {self.name} slot", self.retry_after())
+            except asyncio.CancelledError:
+                # Client went away while queued
+                if future.done() and not future.cancelled():
+                    self._release(user, 0.0)
+                else:
+                    future.cancel()
+                    self._remove_waiter(user, future)
+                raise
+
+        queue_time = time.perf_counter() - queued_at
+        metrics.observe(f"admission.{self.name}.queue", queue_time)
+        started = time.perf_counter()
+        try:
+            yield queue_time
+        finally:
+            self._release(user, time.perf_counter() - started)
+
+    def status(self) -> dict:
+        return {
+            "active": self._active,
+            "queued": self._queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "processes": self.processes,
+            "avg_service_time": round(self._avg_service_time, 2)
+        }
+
+
+# Endpoint classes
+single_admission = AdmissionController(
+    "analyze_single",
+    max_concurrent=int(os.getenv("ADMISSION_SINGLE_MAX_CONCURRENT", "2")),
+    max_queue=int(os.getenv("ADMISSION_SINGLE_MAX_QUEUE", "8")),
+)
+interview_admission = AdmissionController(
+    "analyze_interview",
+    max_concurrent=int(os.getenv("ADMISSION_INTERVIEW_MAX_CONCURRENT", "1")),
+    max_queue=int(os.getenv("ADMISSION_INTERVIEW_MAX_QUEUE", "2")),
+)
+# Live interview streams hold their slot for the whole answer, so they never queue
+live_admission = AdmissionController(
+    "live_interview",
+    max_concurrent=int(os.getenv("ADMISSION_LIVE_MAX_CONCURRENT", "4")),
+    max_queue=0,
+    per_user_limit=1,
+)
+
+# Upload inits preallocate up to UPLOAD_MAX_SIZE on disk each, so they are bounded too
+upload_init_admission = AdmissionController(
+    "upload_init",
+    max_concurrent=int(os.getenv("ADMISSION_UPLOAD_INIT_MAX_CONCURRENT", "4")),
+    max_queue=int(os.getenv("ADMISSION_UPLOAD_INIT_MAX_QUEUE", "16")),
+)
+
+ADMISSION_BY_PATH = {
+    "/emotion/analyze-single": single_admission,
+    "/emotion/analyze-interview": interview_admission,
+    "/emotion/analyze-interview/stream": interview_admission,
+    "/uploads": upload_init_admission,
+}
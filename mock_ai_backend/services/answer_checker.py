@@ -6,11 +6,16 @@ import json
 import logging
 from dotenv import load_dotenv
 
+from models.evaluation import AnswerEvaluation
+from services.json_stream import JsonObjectExtractor
+from services.llm_stub import LLM_PROVIDER, get_stub_llm, record_response
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-TOGETHER_API_URL = "https://api.together.xyz/v1/chat/completions"
+# Point at script/stub_llm_server.py for load tests against a local replay server
+TOGETHER_API_URL = os.getenv("TOGETHER_API_URL", "https://api.together.xyz/v1/chat/completions")
 TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
 
 # Available serverless models (no dedicated endpoint required)
@@ -25,13 +30,53 @@ AVAILABLE_MODELS = [
 # Use the first available model
 MODEL = AVAILABLE_MODELS[0]  # NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO
 
+
+def post_completion(*args, **kwargs):
+    """``requests.post``, or the in-process replay stub when LLM_PROVIDER=stub"""
+    if LLM_PROVIDER == "stub":
+        return get_stub_llm().post(*args, **kwargs)
+    return requests.post(*args, **kwargs)
+
+
+def stream_completion(response):
+    """Content deltas of a streamed (server-sent events) chat completion"""
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        try:
+            choices = json.loads(data).get("choices") or []
+        except ValueError:
+            continue
+        if choices:
+            yield (choices[0].get("delta") or {}).get("content") or ""
+
+
+def read_evaluation(response) -> tuple:
+    """
+    Feed the streamed completion to the JSON extractor and stop reading (which
+    ends the generation) as soon as a valid evaluation object has closed.
+    Returns (AnswerEvaluation or None, extractor).
+    """
+    extractor = JsonObjectExtractor(AnswerEvaluation)
+    try:
+        for delta in stream_completion(response):
+            if extractor.feed(delta) is not None:
+                break
+    finally:
+        response.close()
+    return extractor.result or extractor.finish(), extractor
+
+
 def evaluate_answer(question: str, answer: str) -> dict:
     """
     Evaluate if the answer is correct for the given question
     Returns detailed evaluation with score and feedback
     """
     try:
-        if not TOGETHER_API_KEY:
+        if not TOGETHER_API_KEY and LLM_PROVIDER != "stub":
             raise Exception("TOGETHER_API_KEY environment variable not set")
             
         headers = {
@@ -65,13 +110,14 @@ Be concise but thorough in your evaluation."""
                 {"role": "user", "content": f"Question: {question}\nAnswer: {answer}"}
             ],
             "temperature": 0.3,
-            "max_tokens": 500  # Reduced for better performance
+            "max_tokens": 500,  # Reduced for better performance
+            "stream": True  # Parsed as it arrives; generation stops once the JSON object closes
         }
 
         logger.info(f"📝 Evaluating answer using model: {MODEL}")
         logger.info(f"📋 Question: {question[:50]}...")
         
-        response = requests.post(TOGETHER_API_URL, headers=headers, data=json.dumps(payload), timeout=45)
+        response = post_completion(TOGETHER_API_URL, headers=headers, data=json.dumps(payload), timeout=45, stream=True)
 
         if response.status_code != 200:
             logger.error(f"❌ Together AI API error: {response.status_code}")
@@ -81,50 +127,29 @@ Be concise but thorough in your evaluation."""
             if response.status_code == 400 and len(AVAILABLE_MODELS) > 1:
                 logger.info("🔄 Trying with alternative model...")
                 payload["model"] = AVAILABLE_MODELS[1]  # Try second model
-                response = requests.post(TOGETHER_API_URL, headers=headers, data=json.dumps(payload), timeout=45)
+                response = post_completion(TOGETHER_API_URL, headers=headers, data=json.dumps(payload), timeout=45, stream=True)
                 
                 if response.status_code != 200:
                     raise Exception(f"Together AI evaluation failed with multiple models: {response.text}")
             else:
                 raise Exception(f"Together AI evaluation failed: {response.text}")
 
-        result = response.json()
-        
-        if 'choices' not in result or not result['choices']:
-            raise Exception("Invalid response format from Together AI")
-            
-        evaluation_text = result['choices'][0]['message']['content']
-        
-        try:
-            # Try to parse as JSON
-            evaluation_json = json.loads(evaluation_text)
-            logger.info(f"✅ Answer evaluation completed: {evaluation_json.get('status', 'Unknown')}")
-            return evaluation_json
-        except json.JSONDecodeError:
-            # If JSON parsing fails, create structured response from text
-            logger.warning("⚠️ AI response was not valid JSON, parsing text response")
-            
-            # Try to extract meaningful information from text
-            status = "Partially Correct"
-            score = 60  # Default score
-            
-            # Simple text analysis to determine status
-            text_lower = evaluation_text.lower()
-            if "correct" in text_lower and "incorrect" not in text_lower:
-                status = "Correct"
-                score = 80
-            elif "incorrect" in text_lower:
-                status = "Incorrect"
-                score = 30
-                
+        evaluation, extractor = read_evaluation(response)
+        record_response("chat", f"{system_prompt}\nQuestion: {question}\nAnswer: {answer}", extractor.text)
+        if evaluation is None:
+            # No guessing from keywords in free text: the caller keeps its own (local) score
+            logger.warning(f"⚠️ AI response contained no valid evaluation JSON: {extractor.errors[:3]}")
             return {
-                "status": status,
-                "score": score,
-                "feedback": evaluation_text[:500],  # Limit feedback length
-                "reasoning": "Extracted from text response due to format issue",
-                "suggestions": "Please provide more specific answers for better evaluation"
+                "status": "Error",
+                "score": 0,
+                "feedback": "The evaluation could not be read from the AI response.",
+                "reasoning": "No valid evaluation JSON in the model output",
+                "suggestions": "Please try again"
             }
 
+        logger.info(f"✅ Answer evaluation completed: {evaluation.status} ({len(extractor.text)} chars streamed)")
+        return evaluation.model_dump()
+
     except requests.exceptions.Timeout:
         logger.error("⏰ Together AI API timeout")
         return {
@@ -157,7 +182,7 @@ Be concise but thorough in your evaluation."""
 def test_together_api():
     """Test function to check if Together AI API is working"""
     try:
-        if not TOGETHER_API_KEY:
+        if not TOGETHER_API_KEY and LLM_PROVIDER != "stub":
             return False, "TOGETHER_API_KEY not set"
             
         headers = {
@@ -171,7 +196,7 @@ def test_together_api():
             "max_tokens": 50
         }
         
-        response = requests.post(TOGETHER_API_URL, headers=headers, data=json.dumps(test_payload), timeout=30)
+        response = post_completion(TOGETHER_API_URL, headers=headers, data=json.dumps(test_payload), timeout=30)
         
         if response.status_code == 200:
             return True, "API working correctly"
@@ -0,0 +1,380 @@
+# services/answer_evaluator.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from services.answer_checker import evaluate_answer
+from services.database import get_connection, init_schema
+from services.session_store import get_session_store
+from services.transcript_analytics import analyze_transcript
+
+logger = logging.getLogger(__name__)
+
+# tiered: local score first, LLM only when the local scorer is unsure (or detail is asked for)
+# llm:    every answer waits for the LLM (previous behaviour)
+# local:  never call the LLM
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "tiered").lower()
+# Local scores with a confidence below this are routed to the LLM (0 = never, 1 = always)
+EVALUATION_ROUTING_THRESHOLD = float(os.getenv("EVALUATION_ROUTING_THRESHOLD", "0.6"))
+LLM_EVALUATION_WORKERS = int(os.getenv("LLM_EVALUATION_WORKERS", "4"))
+# Jobs still pending after this long were lost (worker restart) and are reported as failed
+EVALUATION_JOB_TIMEOUT = int(os.getenv("EVALUATION_JOB_TIMEOUT", "300"))
+
+MIN_ANSWER_WORDS = 5
+# Char n-gram similarity to the reference answer: unrelated text lands around
+# 0.15, a paraphrase above 0.6. In between (on topic, but right or wrong?) only
+# the LLM can tell, so local confidence falls to zero inside this band.
+OFF_TOPIC_SIMILARITY = 0.25
+MATCHING_SIMILARITY = 0.45
+# Without a reference answer, similarity to the question only tells whether the
+# answer is on topic, not whether it is right: the local score is trusted only
+# for clearly off-topic answers (below this similarity, touching no keyword)
+NO_REFERENCE_OFF_TOPIC_SIMILARITY = 0.1
+
+_STOPWORDS = {
+    "about", "after", "also", "been", "being", "could", "describe", "does", "explain", "from", "have",
+    "give", "example", "tell", "that", "their", "there", "these", "they", "this", "what", "when",
+    "where", "which", "while", "with", "would", "your", "yourself", "time", "how", "why", "some",
+}
+
+# Network calls run here, never on the analysis executor
+llm_executor = ThreadPoolExecutor(max_workers=LLM_EVALUATION_WORKERS, thread_name_prefix="llm")
+
+_vectorizer = None
+_vectorizer_lock = threading.Lock()
+
+
+def _embed(texts: list) -> np.ndarray:
+    """
+    L2-normalized hashed character n-gram vectors: no model to load, stable
+    across processes and tolerant of speech-recognition misspellings.
+    """
+    global _vectorizer
+    if _vectorizer is None:
+        with _vectorizer_lock:
+            if _vectorizer is None:
+                from sklearn.feature_extraction.text import HashingVectorizer
+                _vectorizer = HashingVectorizer(
+                    analyzer="char_wb", ngram_range=(3, 5), n_features=2**18, alternate_sign=False, norm="l2"
+                )
+    return _vectorizer.transform(texts)
+
+
+def similarity(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    vectors = _embed([a, b])
+    return float(vectors[0].multiply(vectors[1]).sum())
+
+
+def reference_keywords(question: str, reference_answer: Optional[str] = None, jd_keywords=None) -> list:
+    """Content words of the question/reference (plus JD keywords) the answer is expected to touch"""
+    words = re.findall(r"[a-zA-Z][a-zA-Z+#.]{3,}", f"{question} {reference_answer or ''}".lower())
+    keywords = [w.rstrip(".") for w in words if w.rstrip(".") not in _STOPWORDS]
+    return list(dict.fromkeys(list(jd_keywords or []) + keywords))
+
+
+def status_for_score(score: float) -> str:
+    if score >= 70:
+        return "Correct"
+    if score >= 40:
+        return "Partially Correct"
+    return "Incorrect"
+
+
+def local_score(question: str, answer: str, reference_answer: Optional[str] = None, jd_keywords=None) -> dict:
+    """
+    Cheap provisional score: embedding similarity to the reference answer (or
+    the question) plus keyword coverage, damped for short answers.
+    ``confidence`` is high only for too-short and clearly off-topic answers and
+    for close paraphrases of the reference.
+    """
+    keywords = reference_keywords(question, reference_answer, jd_keywords)
+    stats = analyze_transcript(answer, keywords=keywords)
+    words = stats["word_count"]
+    coverage = stats.get("keywords", {}).get("coverage", 0.0)
+
+    if words < MIN_ANSWER_WORDS:
+        return {"score": 5 * words, "confidence": 0.9, "similarity": 0.0, "keyword_coverage": coverage,
+                "word_count": words}
+
+    sim = similarity(answer, reference_answer or question)
+    sim_score = float(np.clip((sim - 0.15) / 0.45, 0.0, 1.0))
+    length = min(1.0, words / 40.0)
+    raw = (0.7 * sim_score + 0.3 * coverage) * (0.7 + 0.3 * length)
+    score = round(100 * raw)
+
+    if reference_answer:
+        confidence = float(np.clip(max((OFF_TOPIC_SIMILARITY - sim) / 0.1, (sim - MATCHING_SIMILARITY) / 0.2), 0.0, 1.0))
+    elif sim < NO_REFERENCE_OFF_TOPIC_SIMILARITY and coverage == 0:
+        confidence = 0.9
+    else:
+        confidence = 0.0
+    return {"score": score, "confidence": round(confidence, 2), "similarity": round(sim, 3),
+            "keyword_coverage": coverage, "word_count": words}
+
+
+def local_evaluation(question: str, answer: str, reference_answer: Optional[str] = None, jd_keywords=None) -> dict:
+    """``evaluate_answer``-shaped result from the local scorer"""
+    scored = local_score(question, answer, reference_answer, jd_keywords)
+    status = status_for_score(scored["score"])
+    if scored["word_count"] < MIN_ANSWER_WORDS:
+        feedback = "The answer is too short to evaluate."
+        suggestions = "Give a complete answer with an example"
+    elif scored["keyword_coverage"] < 0.3:
+        feedback = "The answer touches few of the topics the question asks about."
+        suggestions = "Address the question directly and mention the key concepts"
+    else:
+        feedback = "The answer covers the main topics of the question."
+        suggestions = "Add a concrete example to strengthen the answer"
+    return {
+        "status": status,
+        "score": scored["score"],
+        "feedback": feedback,
+        "reasoning": (f"Local estimate: similarity {scored['similarity']}, "
+                      f"keyword coverage {scored['keyword_coverage']}"),
+        "suggestions": suggestions,
+        "tier": "local",
+        "local_confidence": scored["confidence"],
+    }
+
+
+def needs_llm(evaluation: dict, detailed: bool = False, mode: str = None,
+              threshold: float = None) -> bool:
+    """Route to the LLM when asked for detail or when the local scorer is unsure"""
+    mode = mode or EVALUATION_MODE
+    threshold = EVALUATION_ROUTING_THRESHOLD if threshold is None else threshold
+    if mode == "local":
+        return False
+    if mode == "llm" or detailed:
+        return True
+    return evaluation.get("local_confidence", 0.0) < threshold
+
+
+class EvaluationJobStore:
+    """Background LLM evaluations in SQLite, so any worker can report a job's result"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS evaluation_jobs (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        question TEXT NOT NULL,
+        transcript TEXT NOT NULL,
+        result TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_time ON evaluation_jobs(created_at);
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        init_schema(self.SCHEMA, path)
+
+    @property
+    def conn(self):
+        return get_connection(self.path)
+
+    def create(self, question: str, transcript: str) -> str:
+        job_id = secrets.token_urlsafe(12)
+        now = time.time()
+        self.conn.execute(
+            "INSERT INTO evaluation_jobs (id, status, question, transcript, created_at, updated_at) VALUES (?, 'pending', ?, ?, ?, ?)",
+            (job_id, question, transcript, now, now)
+        )
+        return job_id
+
+    def claim(self, job_id: str) -> Optional[dict]:
+        """Move a pending job to running; None if another worker already took it"""
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT question, transcript FROM evaluation_jobs WHERE id = ? AND status = 'pending'", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE evaluation_jobs SET status = 'running', updated_at = ? WHERE id = ?",
+                         (time.time(), job_id))
+        return dict(row)
+
+    def finish(self, job_id: str, status: str, result: dict):
+        self.conn.execute(
+            "UPDATE evaluation_jobs SET status = ?, result = ?, updated_at = ? WHERE id = ?",
+            (status, json.dumps(result), time.time(), job_id)
+        )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        row = self.conn.execute(
+            "SELECT id, status, result, created_at, updated_at FROM evaluation_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = {"job_id": row["id"], "status": row["status"],
+               "result": json.loads(row["result"]) if row["result"] else None}
+        if job["status"] in ("pending", "running") and time.time() - row["updated_at"] > EVALUATION_JOB_TIMEOUT:
+            job["status"] = "failed"  # Lost with a restarted worker
+        return job
+
+    def cleanup(self, max_age: float = 7 * 24 * 3600) -> int:
+        return self.conn.execute(
+            "DELETE FROM evaluation_jobs WHERE created_at < ?", (time.time() - max_age,)
+        ).rowcount
+
+
+def question_key(question: str) -> str:
+    """Hash of a question ignoring its list numbering, case and spacing"""
+    text = re.sub(r"^\s*\d+\s*[.)]\s*", "", question or "")
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+class ReferenceAnswerStore:
+    """
+    Model answers written alongside generated questions, looked up by the
+    question text an answer is submitted with, so the local scorer can compare
+    against a reference without the client sending one.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS reference_answers (
+        question_key TEXT PRIMARY KEY,
+        question TEXT NOT NULL,
+        reference_answer TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_reference_answers_time ON reference_answers(created_at);
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        init_schema(self.SCHEMA, path)
+
+    @property
+    def conn(self):
+        return get_connection(self.path)
+
+    def put_many(self, pairs: list):
+        """Store (question, reference_answer) pairs; a regenerated question replaces its reference"""
+        now = time.time()
+        rows = [(question_key(q), q, ref.strip(), now) for q, ref in pairs if q and ref and ref.strip()]
+        if rows:
+            with self.conn as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("INSERT OR REPLACE INTO reference_answers VALUES (?, ?, ?, ?)", rows)
+
+    def get(self, question: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT reference_answer FROM reference_answers WHERE question_key = ?", (question_key(question),)
+        ).fetchone()
+        return row["reference_answer"] if row else None
+
+    def cleanup(self, max_age: float = 90 * 24 * 3600) -> int:
+        return self.conn.execute(
+            "DELETE FROM reference_answers WHERE created_at < ?", (time.time() - max_age,)
+        ).rowcount
+
+
+_store = None
+_store_lock = threading.Lock()
+_references = None
+
+
+def get_evaluation_jobs() -> EvaluationJobStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EvaluationJobStore()
+    return _store
+
+
+def get_reference_answers() -> ReferenceAnswerStore:
+    global _references
+    if _references is None:
+        with _store_lock:
+            if _references is None:
+                _references = ReferenceAnswerStore()
+    return _references
+
+
+def find_reference_answer(question: str) -> Optional[str]:
+    """The stored model answer for a generated question, or None (never raises)"""
+    try:
+        return get_reference_answers().get(question)
+    except Exception as e:
+        logger.warning(f"⚠️ Reference answer lookup failed: {e}")
+        return None
+
+
+def _run_llm_job(job_id: str, session_target: Optional[tuple]) -> Optional[dict]:
+    store = get_evaluation_jobs()
+    job = store.claim(job_id)
+    if job is None:
+        return None
+    try:
+        result = {**evaluate_answer(job["question"], job["transcript"]), "tier": "llm"}
+    except Exception as e:
+        logger.error(f"❌ LLM evaluation job {job_id} failed: {e}")
+        store.finish(job_id, "failed", {"error": str(e)})
+        return None
+    if result.get("status") == "Error":
+        # Keep the provisional local evaluation; record why the LLM did not replace it
+        store.finish(job_id, "failed", result)
+        return None
+
+    store.finish(job_id, "completed", result)
+    if session_target:
+        session_id, user_id, question_index = session_target
+        get_session_store().set_answer_evaluation(session_id, user_id, question_index, result)
+    logger.info(f"✅ LLM evaluation job {job_id} completed: {result.get('status')} ({result.get('score')})")
+    return result
+
+
+def start_llm_evaluation(evaluation: dict, session_target: Optional[tuple] = None):
+    """
+    Run the LLM job recorded in ``evaluation["llm_job_id"]`` in the background.
+    ``session_target`` is (session_id, user_id, question_index) of a stored
+    answer whose evaluation the LLM result should replace. Returns the future.
+    """
+    job_id = evaluation.get("llm_job_id")
+    if not job_id or evaluation.get("llm_status") != "pending":
+        return None
+    return llm_executor.submit(_run_llm_job, job_id, session_target)
+
+
+def evaluate_tiered(question: str, transcript: str, detailed: bool = False, reference_answer: Optional[str] = None,
+                    jd_keywords=None, start: bool = True) -> dict:
+    """
+    Immediate evaluation. In tiered mode this is the local score, marked
+    ``provisional`` with an ``llm_job_id`` when the LLM will refine it; the job
+    starts right away unless ``start`` is False (the caller then calls
+    ``start_llm_evaluation`` once the answer is stored).
+    """
+    if EVALUATION_MODE == "llm":
+        # Callers run on the analysis executor: the network call itself goes to the LLM pool
+        result = llm_executor.submit(evaluate_answer, question, transcript).result()
+        return {**result, "tier": "llm"}
+
+    if reference_answer is None:
+        reference_answer = find_reference_answer(question)
+    evaluation = local_evaluation(question, transcript, reference_answer, jd_keywords)
+    if not needs_llm(evaluation, detailed):
+        evaluation["provisional"] = False
+        return evaluation
+
+    evaluation["provisional"] = True
+    evaluation["llm_job_id"] = get_evaluation_jobs().create(question, transcript)
+    evaluation["llm_status"] = "pending"
+    if start:
+        start_llm_evaluation(evaluation)
+    return evaluation
@@ -1,13 +1,13 @@
 # services/voice_to_text.py
 
 import os
-import tempfile
-import shutil
 from pydub import AudioSegment
 import speech_recognition as sr
 import moviepy.editor as mp
 import logging
 
+from services.scratch_space import get_scratch_manager
+
 logger = logging.getLogger(__name__)
 
 def extract_audio_from_video(video_path: str, audio_path: str):
@@ -19,57 +19,50 @@ def extract_audio_from_video(video_path: str, audio_path: str):
     except Exception as e:
         raise Exception(f"Audio extraction failed: {str(e)}")
 
-def convert_voice_to_text(video_path: str) -> str:
+def convert_voice_to_text(video_path: str, audio_path: str = None) -> str:
     """
     Convert video file to text
-    Now accepts video file path instead of UploadFile
+    Now accepts video file path instead of UploadFile.
+    ``audio_path`` is an already extracted track (e.g. the normalizer's 16kHz mono WAV).
     """
+    # Per-call scratch directory: concurrent requests never share (or delete) each other's files
+    scratch = get_scratch_manager().allocate("voice", os.path.getsize(audio_path or video_path))
     try:
-        temp_dir = "temp_voice"
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        # Extract audio from video
-        audio_path = os.path.join(temp_dir, "temp_audio.wav")
-        extract_audio_from_video(video_path, audio_path)
+        if audio_path is None:
+            # Extract audio from video
+            audio_path = scratch.file("temp_audio.wav")
+            extract_audio_from_video(video_path, audio_path)
         
-        # Convert to mono 16kHz for better recognition
+        # Convert to mono 16kHz for better recognition (a no-op for normalized audio)
         audio = AudioSegment.from_file(audio_path)
         audio = audio.set_channels(1).set_frame_rate(16000)
         
         # Create temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_wav:
-            audio.export(temp_wav.name, format="wav")
-            
-            # Initialize speech recognizer
-            recognizer = sr.Recognizer()
+        temp_wav = scratch.file("recognize.wav")
+        audio.export(temp_wav, format="wav")
+        
+        # Initialize speech recognizer
+        recognizer = sr.Recognizer()
+        
+        with sr.AudioFile(temp_wav) as source:
+            # Adjust for ambient noise
+            recognizer.adjust_for_ambient_noise(source)
+            audio_data = recognizer.record(source)
             
-            with sr.AudioFile(temp_wav.name) as source:
-                # Adjust for ambient noise
-                recognizer.adjust_for_ambient_noise(source)
-                audio_data = recognizer.record(source)
-                
+            try:
+                # First try Urdu
+                text = recognizer.recognize_google(audio_data, language="ur-PK")
+                logger.info(f"🎤 Urdu text recognized: {text[:50]}...")
+                return text
+            except sr.UnknownValueError:
+                # If Urdu fails, try English
                 try:
-                    # First try Urdu
-                    text = recognizer.recognize_google(audio_data, language="ur-PK")
-                    logger.info(f"🎤 Urdu text recognized: {text[:50]}...")
+                    text = recognizer.recognize_google(audio_data, language="en-US")
+                    logger.info(f"🎤 English text recognized: {text[:50]}...")
                     return text
                 except sr.UnknownValueError:
-                    # If Urdu fails, try English
-                    try:
-                        text = recognizer.recognize_google(audio_data, language="en-US")
-                        logger.info(f"🎤 English text recognized: {text[:50]}...")
-                        return text
-                    except sr.UnknownValueError:
-                        logger.warning("🎤 No speech could be recognized")
-                        return ""
-            
-            # Clean up temp file
-            if os.path.exists(temp_wav.name):
-                os.unlink(temp_wav.name)
-                
-        # Clean up audio file
-        if os.path.exists(audio_path):
-            os.remove(audio_path)
+                    logger.warning("🎤 No speech could be recognized")
+                    return ""
             
     except sr.UnknownValueError:
         logger.warning("🎤 Speech recognition could not understand audio")
@@ -81,9 +74,5 @@ def convert_voice_to_text(video_path: str) -> str:
         logger.error(f"🎤 Voice to text conversion error: {str(e)}")
         raise Exception(f"Voice to text conversion error: {str(e)}")
     finally:
-        # Clean up temp directory
-        if os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass
\ No newline at end of file
+        # Removed in the background; the caller's own audio_path is never touched
+        scratch.close()
@@ -0,0 +1,299 @@
+# services/auth_store.py
+
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from services.database import DATABASE_PATH, get_connection, init_schema
+
+AUTH_STORE = os.getenv("AUTH_STORE", "sqlite").lower()
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(7 * 24 * 3600)))  # seconds
+
+# PBKDF2-SHA256 cost; raise as hardware allows, existing hashes keep their own cost
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "310000"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "60"))  # seconds a cached lookup is trusted
+# Replaced on every logout so other worker processes drop their cached sessions
+SESSION_REVOCATION_FILE = os.getenv("SESSION_REVOCATION_FILE", DATABASE_PATH + ".revoked")
+
+
+# ---------------------------------------------------------------------------
+# Password hashing
+# ---------------------------------------------------------------------------
+
+# Hashing is deliberately slow, so it runs off the event loop on a small bounded pool
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password")
+
+
+def hash_password(password: str, iterations: int = PASSWORD_HASH_ITERATIONS) -> str:
+    """Salted PBKDF2-SHA256, stored as pbkdf2_sha256$iterations$salt$hash"""
+    salt = secrets.token_hex(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), iterations)
+    return f"pbkdf2_sha256${iterations}${salt}${digest.hex()}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    try:
+        algorithm, iterations, salt, expected = stored.split("$")
+    except ValueError:
+        return False
+    if algorithm != "pbkdf2_sha256":
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(password_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(password_executor, verify_password, password, stored)
+
+
+def _token_key(token: str) -> str:
+    # Only token hashes are stored, so a leaked database does not leak live sessions
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+
+class UserStore(ABC):
+    """Users and bearer-token sessions; implement this to back auth with another database"""
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def create_user(self, email: str, name: str, password_hash: str) -> dict:
+        """Create a user; raises ValueError if the email is taken"""
+
+    @abstractmethod
+    def create_session(self, user_id: str, ttl: int = SESSION_TTL) -> str:
+        """Create a session and return its bearer token"""
+
+    @abstractmethod
+    def get_session(self, token: str) -> Optional[dict]:
+        """Return the user for a live token (with ``expires_at``), or None"""
+
+    @abstractmethod
+    def delete_session(self, token: str):
+        ...
+
+    @abstractmethod
+    def purge_expired_sessions(self) -> int:
+        ...
+
+    @abstractmethod
+    def list_emails(self) -> list:
+        ...
+
+
+class SQLiteUserStore(UserStore):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        email TEXT NOT NULL UNIQUE,
+        name TEXT NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS auth_sessions (
+        token_hash TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        expires_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_auth_sessions_user ON auth_sessions(user_id);
+    CREATE INDEX IF NOT EXISTS idx_auth_sessions_expiry ON auth_sessions(expires_at);
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        init_schema(self.SCHEMA, path)
+
+    @property
+    def conn(self):
+        return get_connection(self.path)
+
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        row = self.conn.execute(
+            "SELECT id, email, name, password_hash FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def create_user(self, email: str, name: str, password_hash: str) -> dict:
+        user = {"id": secrets.token_urlsafe(8), "email": email, "name": name, "password_hash": password_hash}
+        try:
+            self.conn.execute(
+                "INSERT INTO users (id, email, name, password_hash, created_at) VALUES (?, ?, ?, ?, ?)",
+                (user["id"], email, name, password_hash, time.time())
+            )
+        except Exception as e:
+            if "UNIQUE" in str(e):
+                raise ValueError("User with this email already exists")
+            raise
+        return user
+
+    def create_session(self, user_id: str, ttl: int = SESSION_TTL) -> str:
+        token = secrets.token_urlsafe(32)
+        self.conn.execute(
+            "INSERT INTO auth_sessions (token_hash, user_id, expires_at) VALUES (?, ?, ?)",
+            (_token_key(token), user_id, time.time() + ttl)
+        )
+        return token
+
+    def get_session(self, token: str) -> Optional[dict]:
+        # Primary-key lookup on the token hash: no scan over users
+        row = self.conn.execute(
+            """
+            SELECT u.id, u.email, u.name, s.expires_at
+            FROM auth_sessions s JOIN users u ON u.id = s.user_id
+            WHERE s.token_hash = ? AND s.expires_at > ?
+            """,
+            (_token_key(token), time.time())
+        ).fetchone()
+        return dict(row) if row else None
+
+    def delete_session(self, token: str):
+        self.conn.execute("DELETE FROM auth_sessions WHERE token_hash = ?", (_token_key(token),))
+
+    def purge_expired_sessions(self) -> int:
+        return self.conn.execute("DELETE FROM auth_sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def list_emails(self) -> list:
+        return [row["email"] for row in self.conn.execute("SELECT email FROM users ORDER BY created_at")]
+
+
+STORES = {
+    "sqlite": SQLiteUserStore,
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_user_store() -> UserStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if AUTH_STORE not in STORES:
+                    raise ValueError(f"Unknown AUTH_STORE: {AUTH_STORE}")
+                _store = STORES[AUTH_STORE]()
+    return _store
+
+
+# ---------------------------------------------------------------------------
+# Cached session lookup
+# ---------------------------------------------------------------------------
+
+class SessionCache:
+    """
+    Thread-safe LRU of token -> user, entries trusted for SESSION_CACHE_TTL seconds.
+
+    A logout in any worker process replaces the shared revocation file; every
+    cache notices the change on its next lookup (one stat call) and starts
+    over, so a revoked token is never served from another worker's cache.
+    """
+
+    def __init__(self, max_size: int = SESSION_CACHE_SIZE, ttl: float = SESSION_CACHE_TTL,
+                 revocation_file: str = SESSION_REVOCATION_FILE):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.revocation_file = revocation_file
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._revocation_mark = self._read_revocation_mark()
+
+    def _read_revocation_mark(self):
+        try:
+            stat = os.stat(self.revocation_file)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def get(self, token: str) -> Optional[dict]:
+        now = time.time()
+        mark = self._read_revocation_mark()
+        with self._lock:
+            if mark != self._revocation_mark:
+                self._entries.clear()
+                self._revocation_mark = mark
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            user, cached_until = entry
+            if cached_until <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return user
+
+    def put(self, token: str, user: dict):
+        # Never trust the cache past the session's own expiry
+        cached_until = min(time.time() + self.ttl, user.get("expires_at", float("inf")))
+        with self._lock:
+            self._entries[token] = (user, cached_until)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+        try:
+            os.makedirs(os.path.dirname(self.revocation_file) or ".", exist_ok=True)
+            temp_path = f"{self.revocation_file}.{secrets.token_hex(4)}.tmp"
+            with open(temp_path, "w") as f:
+                f.write(secrets.token_hex(8))
+            os.replace(temp_path, self.revocation_file)  # New inode: a change every process can see
+        except OSError as e:
+            print(f"⚠️ Could not publish session revocation: {e}")
+
+
+session_cache = SessionCache()
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def lookup_session(token: str) -> Optional[dict]:
+    user = session_cache.get(token)
+    if user is None:
+        user = get_user_store().get_session(token)
+        if user is not None:
+            session_cache.put(token, user)
+    return user
+
+
+def get_optional_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> Optional[dict]:
+    """Dependency: the authenticated user, or None for anonymous requests"""
+    if credentials is None:
+        return None
+    return lookup_session(credentials.credentials)
+
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> dict:
+    """Dependency for routes that require a valid bearer token"""
+    user = lookup_session(credentials.credentials) if credentials else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return user
@@ -0,0 +1,240 @@
+# services/batch_stream.py
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from services.interview_aggregator import InterviewAggregator
+from utils.frame_buffers import FRAME_RING_SIZE
+
+# Per-request memory budget for videos being decoded/analyzed at the same time
+BATCH_MEMORY_BUDGET_MB = int(os.getenv("BATCH_MEMORY_BUDGET_MB", "768"))
+# Fixed per-video working set on top of decode buffers (ffmpeg, model activations, audio)
+BATCH_VIDEO_BASE_MB = int(os.getenv("BATCH_VIDEO_BASE_MB", "200"))
+# Decoded frames alive per video: the decode ring plus resize/RGB/crop buffers
+BATCH_FRAMES_IN_FLIGHT = FRAME_RING_SIZE + 4
+BATCH_MAX_VIDEOS = int(os.getenv("BATCH_MAX_VIDEOS", "10"))
+
+
+class BatchStreamError(Exception):
+    """A streamed batch request that has to stop (bad body, too many or too large videos)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class MemoryBudget:
+    """
+    Weighted async semaphore over bytes.
+
+    A video reserves its estimated working set before it is decoded and
+    returns it when done, so the number of videos in flight adapts to their
+    resolution. A single video larger than the whole budget still runs, alone.
+    """
+
+    def __init__(self, total_bytes: int):
+        self.total = max(1, total_bytes)
+        self.available = self.total
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, nbytes: int):
+        nbytes = min(max(1, nbytes), self.total)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.available >= nbytes)
+            self.available -= nbytes
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.available += nbytes
+                self._condition.notify_all()
+
+
+def estimate_video_memory(video_path: str) -> int:
+    """Bytes one video is expected to hold while it is analyzed, from its frame size"""
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 1280
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 720
+    finally:
+        cap.release()
+    return BATCH_VIDEO_BASE_MB * 2**20 + width * height * 3 * BATCH_FRAMES_IN_FLIGHT
+
+
+class MultipartVideoStream:
+    """
+    Incremental multipart/form-data reader that writes each file part straight
+    to ``dest_dir`` and reports it as soon as its last byte has arrived, instead
+    of waiting for the whole request body like ``request.form()``. The parser
+    only queues file operations; they run on a worker thread after each
+    received chunk, so disk writes never block the event loop.
+
+    ``events`` yields ("field", name, value) and ("file", name, filename, path, size).
+    """
+
+    def __init__(self, request, dest_dir: str, max_file_size: int, max_files: int = BATCH_MAX_VIDEOS):
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise BatchStreamError("Expected a multipart/form-data body")
+        self.request = request
+        self.dest_dir = dest_dir
+        self.max_file_size = max_file_size
+        self.max_files = max_files
+        self.parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+        self.files = 0
+        self._ready = []
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._part = None
+        self._file_ops = []   # ("open" | "write" | "close", part, data) in parser order
+        self._writing = None  # File part whose file is open
+
+    def _on_part_begin(self):
+        self._disposition = b""
+        self._part = None
+
+    def _on_header_field(self, data, start, end):
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" not in options:
+            self._part = {"kind": "field", "name": name, "data": bytearray()}
+            return
+
+        self.files += 1
+        if self.files > self.max_files:
+            raise BatchStreamError(f"Too many videos (max {self.max_files})")
+        filename = options[b"filename"].decode("utf-8", "replace")
+        path = os.path.join(self.dest_dir, f"batch_video_{self.files - 1}{os.path.splitext(filename)[1] or '.mp4'}")
+        self._part = {"kind": "file", "name": name, "filename": filename, "path": path, "size": 0, "file": None}
+        self._file_ops.append(("open", self._part, None))
+
+    def _on_part_data(self, data, start, end):
+        part = self._part
+        if part["kind"] == "field":
+            if len(part["data"]) + end - start > 64 * 1024:
+                raise BatchStreamError(f"Form field {part['name']} is too large")
+            part["data"] += data[start:end]
+            return
+        part["size"] += end - start
+        if part["size"] > self.max_file_size:
+            raise BatchStreamError(
+                f"{part['filename']} is too large (max {self.max_file_size // 2**20}MB)", status_code=413
+            )
+        self._file_ops.append(("write", part, data[start:end]))
+
+    def _on_part_end(self):
+        part, self._part = self._part, None
+        if part["kind"] == "field":
+            self._ready.append(("field", part["name"], part["data"].decode("utf-8", "replace")))
+        else:
+            self._file_ops.append(("close", part, None))
+            self._ready.append(("file", part["name"], part["filename"], part["path"], part["size"]))
+
+    def _run_file_ops(self):
+        """Apply the queued file operations (on a worker thread)"""
+        ops, self._file_ops = self._file_ops, []
+        for op, part, data in ops:
+            if op == "open":
+                part["file"] = open(part["path"], "wb")
+                self._writing = part
+            elif op == "write":
+                part["file"].write(data)
+            else:
+                part["file"].close()
+                self._writing = None
+
+    def close(self):
+        self._file_ops = []
+        if self._writing is not None:
+            self._writing["file"].close()
+            self._writing = None
+
+    async def _flush(self):
+        # Events are only reported once their file is complete on disk
+        if self._file_ops:
+            await asyncio.to_thread(self._run_file_ops)
+        while self._ready:
+            yield self._ready.pop(0)
+
+    async def events(self):
+        try:
+            async for chunk in self.request.stream():
+                self.parser.write(chunk)
+                async for event in self._flush():
+                    yield event
+            self.parser.finalize()
+            async for event in self._flush():
+                yield event
+        finally:
+            self.close()
+
+
+class BatchAggregate:
+    """
+    Interview-level aggregate over per-video analyses, folded in one video at a
+    time so a batch never has to hold every analysis until the end.
+    """
+
+    KEYS = ("eye_contact", "smile", "posture", "confidence", "hand_movement", "head_nod")
+
+    def __init__(self):
+        self.aggregator = InterviewAggregator()
+        self.emotions = []
+        self.transcripts = []
+
+    def add(self, analysis: dict):
+        self.aggregator.add({key: analysis.get(key, 0.0) for key in self.KEYS})
+        if analysis.get("emotion"):
+            self.emotions.extend(analysis["emotion"])
+        if analysis.get("transcript"):
+            self.transcripts.append(analysis["transcript"])
+
+    @property
+    def videos(self) -> int:
+        return self.aggregator.answers
+
+    def analysis(self) -> dict:
+        """Averages in the analyze-interview response shape"""
+        averages = self.aggregator.averages()
+        return {
+            **{key: averages.get(key, 0.0) for key in self.KEYS},
+            "emotion": list(self.emotions),
+            "transcripts": list(self.transcripts),
+            "combined_transcript": " ".join(self.transcripts)
+        }
+
+
+def encode_event(event: dict, sse: bool) -> bytes:
+    """One NDJSON line, or one Server-Sent Event named after the event type"""
+    data = json.dumps(event, default=str)
+    if sse:
+        return f"event: {event['event']}\ndata: {data}\n\n".encode()
+    return (data + "\n").encode()
@@ -0,0 +1,48 @@
+# services/database.py
+
+import os
+import sqlite3
+import threading
+
+# One SQLite file shared by every uvicorn worker on the host
+DATABASE_PATH = os.getenv(
+    "DATABASE_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'mock_ai.db'))
+)
+
+_local = threading.local()
+
+
+def _forget_connections():
+    # SQLite connections must not cross fork(): a worker forked from a
+    # preloaded master opens its own
+    global _local
+    _local = threading.local()
+
+
+os.register_at_fork(after_in_child=_forget_connections)
+
+
+def get_connection(path: str = None) -> sqlite3.Connection:
+    """Per-thread SQLite connection (connections must not be shared across threads)"""
+    path = path or DATABASE_PATH
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(path)
+    if conn is None:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)  # Autocommit; use explicit transactions
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers in other workers proceed while one writer commits
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        connections[path] = conn
+    return conn
+
+
+def init_schema(schema_sql: str, path: str = None):
+    get_connection(path).executescript(schema_sql)
@@ -0,0 +1,209 @@
+# services/emotion_detector.py
+
+import os
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+
+from services.model_registry import registry
+
+# Which facial emotion backend every pipeline uses: keras | onnx | fer | deepface
+EMOTION_MODEL_BACKEND = os.getenv("EMOTION_MODEL_BACKEND", "keras").lower()
+FER_USE_MTCNN = os.getenv("FER_USE_MTCNN", "true").lower() in ("1", "true", "yes")
+DEEPFACE_DETECTOR_BACKEND = os.getenv("DEEPFACE_DETECTOR_BACKEND", "opencv")
+
+# Canonical label order for every backend's probability rows
+EMOTION_LABELS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
+_LABEL_INDEX = {label.lower(): i for i, label in enumerate(EMOTION_LABELS)}
+
+
+class EmotionDetector(ABC):
+    """
+    One facial emotion backend.
+
+    ``predict`` takes the already decoded inputs of a video: 48x48 grayscale
+    face crops and, for backends that run their own face detection
+    (``needs_frames``), the matching BGR frames. It returns an (N, 7)
+    probability matrix in EMOTION_LABELS order; rows are all zero where the
+    backend found no face.
+    """
+
+    name = ""
+    needs_frames = False
+
+    @abstractmethod
+    def predict(self, face_crops: list, frames: list = None) -> np.ndarray:
+        pass
+
+    @staticmethod
+    def _empty(n: int = 0) -> np.ndarray:
+        return np.zeros((n, len(EMOTION_LABELS)), dtype=np.float32)
+
+    @staticmethod
+    def _scores_to_row(scores: dict, scale: float = 1.0) -> np.ndarray:
+        """Map a {label: score} dict from a third-party library to one canonical row"""
+        row = np.zeros(len(EMOTION_LABELS), dtype=np.float32)
+        for label, score in scores.items():
+            index = _LABEL_INDEX.get(label.lower())
+            if index is not None:
+                row[index] = float(score) / scale
+        return row
+
+
+class CropModelDetector(EmotionDetector):
+    """The project's 48x48 CNN (Keras .h5 or its ONNX export), batched over face crops"""
+
+    def __init__(self, backend: str):
+        from script.predict_emotion import load_emotion_model
+        self.name = backend
+        self.model = load_emotion_model(backend)
+
+    def predict(self, face_crops: list, frames: list = None) -> np.ndarray:
+        if len(face_crops) == 0:
+            return self._empty()
+        # One float32 copy of the (N, 48, 48) uint8 batch, normalized in place
+        batch = np.array(face_crops, dtype=np.float32).reshape(-1, 48, 48, 1)
+        batch *= 1.0 / 255.0
+        return np.asarray(self.model.predict(batch, verbose=0), dtype=np.float32)
+
+
+class FerDetector(EmotionDetector):
+    """FER (optionally with MTCNN face detection); one detector instance per process"""
+
+    name = "fer"
+    needs_frames = True
+
+    def __init__(self, mtcnn: bool = FER_USE_MTCNN):
+        from fer import FER
+        self.detector = FER(mtcnn=mtcnn)
+
+    def predict(self, face_crops: list, frames: list = None) -> np.ndarray:
+        if frames is None:
+            raise ValueError("The fer backend needs decoded frames")
+        rows = self._empty(len(frames))
+        for i, frame in enumerate(frames):
+            faces = self.detector.detect_emotions(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if faces:
+                # Primary face: the largest box
+                face = max(faces, key=lambda f: f["box"][2] * f["box"][3])
+                rows[i] = self._scores_to_row(face["emotions"])
+        return rows
+
+
+class DeepFaceDetector(EmotionDetector):
+    """DeepFace emotion model; the model is built once and reused for every call"""
+
+    name = "deepface"
+    needs_frames = True
+
+    def __init__(self, detector_backend: str = DEEPFACE_DETECTOR_BACKEND):
+        from deepface import DeepFace
+        self.deepface = DeepFace
+        self.detector_backend = detector_backend
+        DeepFace.build_model(task="facial_attribute", model_name="Emotion")
+
+    def predict(self, face_crops: list, frames: list = None) -> np.ndarray:
+        if frames is None:
+            raise ValueError("The deepface backend needs decoded frames")
+        rows = self._empty(len(frames))
+        for i, frame in enumerate(frames):
+            try:
+                analysis = self.deepface.analyze(
+                    frame, actions=["emotion"], enforce_detection=True,
+                    detector_backend=self.detector_backend, silent=True
+                )
+            except ValueError:
+                continue  # No face detected
+            if isinstance(analysis, list):
+                analysis = max(analysis, key=lambda a: a["region"]["w"] * a["region"]["h"])
+            rows[i] = self._scores_to_row(analysis["emotion"], scale=100.0)  # DeepFace reports percent
+        return rows
+
+
+DETECTORS = {
+    "keras": lambda: CropModelDetector("keras"),
+    "onnx": lambda: CropModelDetector("onnx"),
+    "fer": FerDetector,
+    "deepface": DeepFaceDetector,
+}
+
+
+def create_emotion_detector(backend: str = EMOTION_MODEL_BACKEND) -> EmotionDetector:
+    if backend not in DETECTORS:
+        raise ValueError(f"Unknown EMOTION_MODEL_BACKEND: {backend} (expected one of {', '.join(DETECTORS)})")
+    return DETECTORS[backend]()
+
+
+def get_emotion_detector() -> EmotionDetector:
+    """Process-wide detector for the configured backend (loaded once through the registry)"""
+    return registry.get("emotion_detector")
+
+
+def sample_frames(video_path: str, frame_interval: int = 10, max_frames: int = None, max_width: int = 640,
+                  ring=None, buffers=None):
+    """
+    Decode a video once and yield (frame_index, BGR frame) for every
+    ``frame_interval``-th frame, downscaled to at most ``max_width``.
+    With a FrameRing / BufferPool the frames are decoded and resized into
+    reused buffers, so a yielded frame is only valid until the next one.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Failed to open video file: {video_path}")
+    frame_idx = 0
+    sampled = 0
+    try:
+        while True:
+            # grab() skips decoding-to-BGR of frames that are not sampled
+            if not cap.grab():
+                break
+            if frame_idx % frame_interval == 0:
+                ret, frame = ring.retrieve(cap) if ring is not None else cap.retrieve()
+                if not ret:
+                    break
+                h, w = frame.shape[:2]
+                if w > max_width:
+                    size = (max_width, int(h * max_width / w))
+                    dst = buffers.get("sampled", (size[1], size[0], 3)) if buffers else None
+                    frame = cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_AREA)
+                yield frame_idx, frame
+                sampled += 1
+                if max_frames and sampled >= max_frames:
+                    break
+            frame_idx += 1
+    finally:
+        cap.release()
+
+
+def whole_frame_crop(frame, dst=None, buffers=None) -> np.ndarray:
+    """48x48 grayscale input from a full frame, for callers without face landmarks"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=buffers.get("gray", frame.shape[:2]) if buffers else None)
+    return cv2.resize(gray, (48, 48), dst=dst)
+
+
+def detect_video_emotions(video_path: str, frame_interval: int = 10, max_frames: int = None,
+                          detector: EmotionDetector = None) -> list:
+    """
+    Per-sampled-frame emotion scores for a whole video with one decode:
+    a list of {label_lowercase: probability} dicts for frames with a detected face.
+    Raises ValueError if the video cannot be opened.
+    """
+    from utils.frame_buffers import BufferPool, CropBatch, FrameRing
+
+    detector = detector or get_emotion_detector()
+    crops = CropBatch()
+    buffers = BufferPool()
+    frames = []
+    # Decode buffers are only reused when the backend does not keep the frames
+    reuse = not detector.needs_frames
+    for _, frame in sample_frames(video_path, frame_interval, max_frames,
+                                  ring=FrameRing() if reuse else None, buffers=buffers if reuse else None):
+        crops.commit(whole_frame_crop(frame, dst=crops.next_slot(), buffers=buffers))
+        if detector.needs_frames:
+            frames.append(frame)
+    probabilities = detector.predict(crops.array(), frames if detector.needs_frames else None)
+    return [
+        {label.lower(): float(p) for label, p in zip(EMOTION_LABELS, row)}
+        for row in probabilities if row.any()
+    ]
@@ -1,8 +1,7 @@
-import cv2
-import numpy as np
-from fer import FER
 from collections import Counter
 
+from services.emotion_detector import detect_video_emotions
+
 def get_most_frequent_emotion(emotions):
     if not emotions:
         return "N/A"
@@ -11,42 +10,13 @@ def get_most_frequent_emotion(emotions):
     return most_common
 
 def analyze_video(video_path):
-    detector = FER(mtcnn=True)
-    cap = cv2.VideoCapture(video_path)
-
-    if not cap.isOpened():
+    # Shared detector (EMOTION_MODEL_BACKEND, e.g. fer) instead of a new FER(mtcnn=True) per call
+    try:
+        results = detect_video_emotions(video_path, frame_interval=10)
+    except ValueError:
         return {"error": f"Unable to open video file: {video_path}"}
 
-    results = []
-    dominant_emotions = []
-
-    frame_count = 0
-    success = True
-
-    while success:
-        success, frame = cap.read()
-        if not success:
-            break
-
-        # Skip every other frame to improve performance
-        if frame_count % 10 != 0:
-            frame_count += 1
-            continue
-
-        try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            emotions = detector.detect_emotions(rgb_frame)
-
-            if emotions:
-                top_emotion = max(emotions[0]["emotions"], key=emotions[0]["emotions"].get)
-                results.append(emotions[0]["emotions"])
-                dominant_emotions.append(top_emotion)
-        except Exception as e:
-            print(f"Error processing frame {frame_count}: {e}")
-
-        frame_count += 1
-
-    cap.release()
+    dominant_emotions = [max(emotions, key=emotions.get) for emotions in results]
 
     return {
         "emotions": results,
@@ -1,82 +1,129 @@
+import numpy as np
+
+FEEDBACK_METRICS = ["eye_contact", "smile", "confidence", "posture", "hand_movement", "head_nod"]
+
+# Declarative feedback rules, evaluated in order. Each rule compares one metric
+# against a threshold and adds the messages under "pass" or "fail".
+FEEDBACK_RULES = [
+    {
+        "metric": "eye_contact", "op": ">=", "threshold": 0.7,
+        "pass": {"strengths": ["Maintains good eye contact"]},
+        "fail": {"weaknesses": ["Poor eye contact"],
+                 "suggestions": ["Try to maintain eye contact to build connection"]},
+    },
+    {
+        "metric": "smile", "op": ">=", "threshold": 0.7,
+        "pass": {"strengths": ["Friendly smile"]},
+        "fail": {"suggestions": ["Smile occasionally to appear more approachable"]},
+    },
+    {
+        # Voice Emotion / Confidence
+        "metric": "confidence", "op": ">=", "threshold": 0.75,
+        "pass": {"strengths": ["Confident speaking"]},
+        "fail": {"suggestions": ["Work on projecting more confidence in speech"]},
+    },
+    {
+        "metric": "posture", "op": ">=", "threshold": 0.7,
+        "pass": {"strengths": ["Professional posture"]},
+        "fail": {"suggestions": ["Maintain upright posture for confidence"]},
+    },
+    {
+        "metric": "hand_movement", "op": ">=", "threshold": 0.6,
+        "pass": {"strengths": ["Good hand gestures"]},
+        "fail": {"suggestions": ["Use expressive but controlled hand gestures"]},
+    },
+    {
+        "metric": "head_nod", "op": "<", "threshold": 0.3,
+        "pass": {"suggestions": ["Nod occasionally to show engagement"]},
+        "fail": {},
+    },
+]
+
+GENERAL_SUGGESTIONS = ["Practice concise answers", "Maintain steady body posture"]
+
+FEEDBACK_CATEGORIES = ("strengths", "weaknesses", "suggestions")
+
+_OPS = {">=": np.greater_equal, ">": np.greater, "<=": np.less_equal, "<": np.less}
+
+
+def _compile_rules(rules):
+    """Flatten the rule table into message catalogue arrays for vectorized evaluation"""
+    messages, categories, rule_index, on_pass = [], [], [], []
+    for i, rule in enumerate(rules):
+        for outcome in ("pass", "fail"):
+            for category in FEEDBACK_CATEGORIES:
+                for message in rule.get(outcome, {}).get(category, []):
+                    messages.append(message)
+                    categories.append(category)
+                    rule_index.append(i)
+                    on_pass.append(outcome == "pass")
+    return messages, np.array(categories), np.array(rule_index, dtype=np.intp), np.array(on_pass, dtype=bool)
+
+
+_MESSAGES, _CATEGORIES, _RULE_INDEX, _ON_PASS = _compile_rules(FEEDBACK_RULES)
+
+
+def results_to_matrix(results: list, metrics=FEEDBACK_METRICS, default: float = 0.0) -> np.ndarray:
+    """(N x metrics) float matrix from result dicts; missing metrics use ``default``"""
+    return np.array([[r.get(m, default) for m in metrics] for r in results], dtype=np.float64).reshape(-1, len(metrics))
+
+
+def evaluate_rules(matrix: np.ndarray, metrics=FEEDBACK_METRICS, rules=FEEDBACK_RULES) -> np.ndarray:
+    """(N x rules) boolean matrix: whether each row passes each rule, in one vectorized pass"""
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(-1, len(metrics))
+    column = {m: i for i, m in enumerate(metrics)}
+    passed = np.empty((matrix.shape[0], len(rules)), dtype=bool)
+    for j, rule in enumerate(rules):
+        passed[:, j] = _OPS[rule["op"]](matrix[:, column[rule["metric"]]], rule["threshold"])
+    return passed
+
+
+def generate_feedback_batch(matrix: np.ndarray, metrics=FEEDBACK_METRICS, confidence_default: float = 0.5) -> list:
+    """
+    Feedback for every row of an (N x metrics) matrix with one rule evaluation.
+    Rows may be NaN for unknown metrics: rules treat them as 0 and
+    confidence_score falls back to ``confidence_default``.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(-1, len(metrics))
+    passed = evaluate_rules(np.nan_to_num(matrix, nan=0.0), metrics)
+
+    # (N x messages): a message applies when its rule outcome matches
+    selected = passed[:, _RULE_INDEX] == _ON_PASS
+
+    confidence = matrix[:, list(metrics).index("confidence")] if "confidence" in metrics else np.full(len(matrix), np.nan)
+    confidence = np.where(np.isnan(confidence), confidence_default, confidence)
+
+    feedback_list = []
+    for row, conf in zip(selected, confidence.tolist()):
+        feedback = {category: [] for category in FEEDBACK_CATEGORIES}
+        for k in np.flatnonzero(row):
+            feedback[_CATEGORIES[k]].append(_MESSAGES[k])
+        feedback["suggestions"].extend(GENERAL_SUGGESTIONS)
+        feedback["confidence_score"] = conf
+        feedback_list.append(feedback)
+    return feedback_list
+
+
+def summarize_matrix(matrix: np.ndarray, metrics=FEEDBACK_METRICS) -> dict:
+    """Column means of an (N x metrics) matrix, rounded like the API reports them"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.size == 0:
+        return {}
+    return dict(zip(metrics, np.round(matrix.mean(axis=0), 2).tolist()))
+
+
 def summarize_results(results: list) -> dict:
     """
     Averages the list of individual clip/frame results into a single summary result.
     """
     if not results:
         return {}
-
-    total = {
-        "eye_contact": 0.0,
-        "smile": 0.0,
-        "confidence": 0.0,
-        "posture": 0.0,
-        "hand_movement": 0.0,
-        "head_nod": 0.0,
-    }
-    count = len(results)
-
-    for r in results:
-        for key in total:
-            total[key] += r.get(key, 0.0)
-
-    average = {k: round(v / count, 2) for k, v in total.items()}
-    return average
+    return summarize_matrix(results_to_matrix(results))
 
 
 def generate_feedback(result: dict) -> dict:
     """
     Generates feedback (strengths, weaknesses, suggestions) based on summarized analysis result.
     """
-    feedback = {
-        "strengths": [],
-        "weaknesses": [],
-        "suggestions": [],
-        "confidence_score": result.get("confidence", 0.5),
-    }
-
-    # Eye Contact
-    eye_contact = result.get("eye_contact", 0)
-    if eye_contact >= 0.7:
-        feedback["strengths"].append("Maintains good eye contact")
-    else:
-        feedback["weaknesses"].append("Poor eye contact")
-        feedback["suggestions"].append("Try to maintain eye contact to build connection")
-
-    # Smile
-    smile = result.get("smile", 0)
-    if smile >= 0.7:
-        feedback["strengths"].append("Friendly smile")
-    else:
-        feedback["suggestions"].append("Smile occasionally to appear more approachable")
-
-    # Voice Emotion / Confidence
-    confidence = result.get("confidence", 0)
-    if confidence >= 0.75:
-        feedback["strengths"].append("Confident speaking")
-    else:
-        feedback["suggestions"].append("Work on projecting more confidence in speech")
-
-    # Posture
-    posture = result.get("posture", 0)
-    if posture >= 0.7:
-        feedback["strengths"].append("Professional posture")
-    else:
-        feedback["suggestions"].append("Maintain upright posture for confidence")
-
-    # Hand Movement
-    hand_movement = result.get("hand_movement", 0)
-    if hand_movement >= 0.6:
-        feedback["strengths"].append("Good hand gestures")
-    else:
-        feedback["suggestions"].append("Use expressive but controlled hand gestures")
-
-    # Head Nod
-    head_nod = result.get("head_nod", 0)
-    if head_nod < 0.3:
-        feedback["suggestions"].append("Nod occasionally to show engagement")
-
-    # General
-    feedback["suggestions"].append("Practice concise answers")
-    feedback["suggestions"].append("Maintain steady body posture")
-
-    return feedback
+    row = [[result.get(m, np.nan) for m in FEEDBACK_METRICS]]
+    return generate_feedback_batch(np.array(row, dtype=np.float64))[0]
@@ -0,0 +1,133 @@
+# services/interview_aggregator.py
+
+import math
+from collections import Counter
+
+from services.feedback_generator import generate_feedback
+
+AGGREGATE_METRICS = ("eye_contact", "smile", "posture", "confidence", "hand_movement", "head_nod", "score")
+
+
+class RunningStat:
+    """Welford running mean/variance with O(1) add, remove and merge"""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x: float):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = (self.count * self.mean - x) / (self.count - 1)
+        self.m2 = max(0.0, self.m2 - (x - old_mean) * (x - self.mean))
+        self.mean = old_mean
+        self.count -= 1
+
+    def merge(self, other: "RunningStat"):
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class InterviewAggregator:
+    """
+    Incremental interview-level aggregate.
+
+    Each analyzed answer updates running metric statistics and the emotion
+    histogram in O(1), so the overall summary and feedback are available after
+    every answer and the final interview feedback needs no batch recomputation.
+    """
+
+    def __init__(self):
+        self.answers = 0
+        self.stats = {metric: RunningStat() for metric in AGGREGATE_METRICS}
+        self.emotions = Counter()
+
+    @staticmethod
+    def _metric_values(analysis: dict, score=None):
+        for metric in AGGREGATE_METRICS:
+            value = score if metric == "score" else analysis.get(metric)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield metric, float(value)
+
+    @staticmethod
+    def _emotion_labels(analysis: dict):
+        # Error fallbacks put dicts in the emotion list; only count labels
+        return [e for e in analysis.get("emotion") or [] if isinstance(e, str)]
+
+    def add(self, analysis: dict, score=None):
+        self.answers += 1
+        for metric, value in self._metric_values(analysis, score):
+            self.stats[metric].add(value)
+        self.emotions.update(self._emotion_labels(analysis))
+
+    def remove(self, analysis: dict, score=None):
+        """Undo a previous add (used when an answer is re-recorded)"""
+        self.answers = max(0, self.answers - 1)
+        for metric, value in self._metric_values(analysis, score):
+            self.stats[metric].remove(value)
+        self.emotions.subtract(self._emotion_labels(analysis))
+        self.emotions = +self.emotions  # Drop zero counts
+
+    def merge(self, other: "InterviewAggregator"):
+        self.answers += other.answers
+        for metric in AGGREGATE_METRICS:
+            self.stats[metric].merge(other.stats[metric])
+        self.emotions.update(other.emotions)
+
+    def averages(self) -> dict:
+        """Metric means in the shape generate_feedback expects"""
+        return {metric: round(stat.mean, 2) for metric, stat in self.stats.items() if stat.count}
+
+    def summary(self) -> dict:
+        return {
+            "answers": self.answers,
+            **self.averages(),
+            "std": {metric: round(stat.std, 3) for metric, stat in self.stats.items() if stat.count},
+            "emotion_histogram": dict(self.emotions),
+            "dominant_emotion": self.emotions.most_common(1)[0][0] if self.emotions else None
+        }
+
+    def feedback(self) -> dict:
+        return generate_feedback(self.averages())
+
+    def to_dict(self) -> dict:
+        return {
+            "answers": self.answers,
+            "stats": {metric: [s.count, s.mean, s.m2] for metric, s in self.stats.items()},
+            "emotions": dict(self.emotions)
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "InterviewAggregator":
+        aggregator = cls()
+        if not state:
+            return aggregator
+        aggregator.answers = state.get("answers", 0)
+        for metric, values in state.get("stats", {}).items():
+            if metric in aggregator.stats:
+                aggregator.stats[metric] = RunningStat(*values)
+        aggregator.emotions = Counter(state.get("emotions", {}))
+        return aggregator
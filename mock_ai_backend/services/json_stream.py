@@ -0,0 +1,83 @@
+# services/json_stream.py
+
+import json
+from typing import Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+
+class JsonObjectExtractor:
+    """
+    Finds the first balanced JSON object in text that arrives in pieces (LLM
+    stream deltas) and validates it against a Pydantic model.
+
+    Text around the object (prose, code fences) is ignored. A candidate that
+    does not parse or validate is skipped and scanning resumes one character
+    after its opening brace, so "see {below}: {...}" still finds the real
+    object. ``feed`` returns the model instance as soon as its closing brace
+    arrives, which lets the caller stop the generation there.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self.text = ""
+        self.result: Optional[BaseModel] = None
+        self.errors = []
+        self._reset(0)
+
+    def _reset(self, position: int):
+        self._pos = position
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> Optional[BaseModel]:
+        if self.result is None and chunk:
+            self.text += chunk
+            self._scan()
+        return self.result
+
+    def finish(self) -> Optional[BaseModel]:
+        """End of stream: retry after any opening brace that never closed"""
+        while self.result is None and self._start is not None:
+            self._reset(self._start + 1)
+            self._scan()
+        return self.result
+
+    def _scan(self):
+        text = self.text
+        while self._pos < len(text) and self.result is None:
+            char = text[self._pos]
+            self._pos += 1
+            if self._start is None:
+                if char == "{":
+                    self._start = self._pos - 1
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    start = self._start
+                    self.result = self._validate(text[start:self._pos])
+                    if self.result is None:
+                        self._reset(start + 1)
+
+    def _validate(self, candidate: str) -> Optional[BaseModel]:
+        try:
+            return self.schema.model_validate(json.loads(candidate))
+        except (ValueError, ValidationError) as e:
+            self.errors.append(str(e).splitlines()[0])
+            return None
@@ -0,0 +1,315 @@
+# services/llm_stub.py
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+import requests
+
+# together: call api.together.xyz over HTTP; TOGETHER_API_URL (chat, answer evaluation) and
+#           TOGETHER_BASE_URL (completions, question generation) can point at the stub server
+# stub:     replay recorded responses in-process, no network
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "together").lower()
+
+# JSONL of {"kind": "chat" | "completion", "prompt": str, "content": str}; built-in samples when unset
+STUB_LLM_RECORDINGS = os.getenv("STUB_LLM_RECORDINGS")
+# Time to first token: "fixed:ms", "uniform:lo_ms,hi_ms", "normal:mean_ms,sd_ms" or "lognormal:median_ms,sigma"
+STUB_LLM_LATENCY = os.getenv("STUB_LLM_LATENCY", "lognormal:600,0.4")
+STUB_LLM_TOKENS_PER_S = float(os.getenv("STUB_LLM_TOKENS_PER_S", "80"))
+STUB_LLM_ERROR_RATE = float(os.getenv("STUB_LLM_ERROR_RATE", "0"))      # Share of calls answered with HTTP 503
+STUB_LLM_TIMEOUT_RATE = float(os.getenv("STUB_LLM_TIMEOUT_RATE", "0"))  # Share of calls that hang
+STUB_LLM_MAX_HANG = float(os.getenv("STUB_LLM_MAX_HANG", "10"))         # Seconds a hanging call waits at most
+# The stub server cannot raise in the client: a hanging request is held past the
+# backend's 45 s LLM timeout so the client's own timeout fires
+STUB_LLM_SERVER_HANG = float(os.getenv("STUB_LLM_SERVER_HANG", "60"))
+STUB_LLM_SEED = os.getenv("STUB_LLM_SEED")
+# When set, live responses are appended here in the recordings format
+LLM_RECORD_PATH = os.getenv("LLM_RECORD_PATH")
+
+DEFAULT_RECORDINGS = [
+    {"kind": "chat", "content": json.dumps({
+        "status": "Correct", "score": 84,
+        "feedback": "The answer is relevant and gives concrete details about the candidate's experience.",
+        "reasoning": "It addresses the question directly with specific examples.",
+        "suggestions": "Quantify the impact of the work you describe."
+    }, indent=2)},
+    {"kind": "chat", "content": "Here is my evaluation:\n```json\n" + json.dumps({
+        "status": "Partially Correct", "score": 58,
+        "feedback": "The answer is on topic but misses important points.",
+        "reasoning": "Only part of the question is covered.",
+        "suggestions": "Cover every part of the question and give an example."
+    }) + "\n```\nThe candidate should also speak more confidently."},
+    {"kind": "chat", "content": json.dumps({
+        "status": "Incorrect", "score": 22,
+        "feedback": "The answer does not address the question.",
+        "reasoning": "The content is unrelated to what was asked.",
+        "suggestions": "Listen to the question carefully and answer it directly."
+    })},
+    {"kind": "completion", "content": (
+        "1. Can you walk me through a REST API you designed and the decisions behind it?\n"
+        "Answer: I designed a REST API for order management with resources for orders and customers. "
+        "I used nouns for endpoints, HTTP methods for actions, pagination for lists and versioned the API "
+        "so clients were not broken by changes.\n"
+        "2. How do you find and fix a slow database query?\n"
+        "Answer: I look at the query plan with EXPLAIN to find full table scans, then add an index on the "
+        "filtered or joined columns, select only needed columns and measure the query time again.\n"
+        "3. How would you structure tests for a Python web service?\n"
+        "Answer: Fast unit tests with pytest for the business logic, integration tests for the API endpoints "
+        "against a test database, and a few end-to-end tests, all run in CI on every change.\n"
+        "4. Tell me about a time you disagreed with a teammate. How did you resolve it?\n"
+        "Answer: A teammate and I disagreed about a design, so we listed the trade-offs, built a small "
+        "prototype of each option and agreed on the one the data supported.\n"
+        "5. Describe a project you are proud of. What was your role?\n"
+        "Answer: I led the backend of a project that cut report generation time from minutes to seconds. "
+        "I designed the caching layer, coordinated with the frontend team and measured the impact."
+    )},
+]
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(" ".join(prompt.split()).encode("utf-8")).hexdigest()
+
+
+def parse_latency(spec: str):
+    """A sampler ``rng -> seconds`` for a latency spec (durations in milliseconds)"""
+    kind, _, args = (spec or "fixed:0").partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()]
+    kind = kind.strip().lower()
+    if kind == "fixed":
+        value = values[0] / 1000.0 if values else 0.0
+        return lambda rng: value
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000.0
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000.0
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(max(median, 1e-3)), sigma) / 1000.0
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+_record_lock = threading.Lock()
+
+
+def record_response(kind: str, prompt: str, content: str):
+    """Append a live response to LLM_RECORD_PATH so it can be replayed later"""
+    if not LLM_RECORD_PATH or not content or LLM_PROVIDER == "stub":
+        return
+    with _record_lock, open(LLM_RECORD_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"kind": kind, "prompt": prompt, "content": content}, ensure_ascii=False) + "\n")
+
+
+@dataclass
+class StubReply:
+    """What one stubbed call does: fail, hang, or stream ``tokens`` after ``first_token_s``"""
+
+    outcome: str  # ok | error | timeout
+    first_token_s: float = 0.0
+    token_s: float = 0.0
+    tokens: list = field(default_factory=list)
+
+    @property
+    def content(self) -> str:
+        return "".join(self.tokens)
+
+
+class StubResponse:
+    """The parts of ``requests.Response`` that answer_checker uses, for a stubbed chat completion"""
+
+    def __init__(self, reply: StubReply, stream: bool):
+        self.reply = reply
+        self.stream = stream
+        self.status_code = 200 if reply.outcome == "ok" else 503
+        self._closed = False
+
+    def _body(self) -> dict:
+        if self.status_code != 200:
+            return {"error": {"message": "Stub LLM: simulated service error"}}
+        return {"choices": [{"message": {"role": "assistant", "content": self.reply.content}}]}
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self._body())
+
+    def json(self) -> dict:
+        # A non-streamed completion arrives once every token is generated
+        time.sleep(self.reply.token_s * len(self.reply.tokens))
+        return self._body()
+
+    def iter_lines(self, decode_unicode: bool = False):
+        for token in self.reply.tokens:
+            if self._closed:
+                return
+            time.sleep(self.reply.token_s)
+            yield f"data: {json.dumps({'choices': [{'delta': {'content': token}}]})}"
+        yield "data: [DONE]"
+
+    def close(self):
+        self._closed = True
+
+
+class StubLLM:
+    """
+    Replays recorded LLM responses with sampled latency, token pacing and
+    injected failures. A prompt that was recorded gets its own response;
+    any other prompt gets a recording picked deterministically from its hash.
+    """
+
+    def __init__(self, recordings_path: str = STUB_LLM_RECORDINGS, latency: str = STUB_LLM_LATENCY,
+                 tokens_per_s: float = STUB_LLM_TOKENS_PER_S, error_rate: float = STUB_LLM_ERROR_RATE,
+                 timeout_rate: float = STUB_LLM_TIMEOUT_RATE, seed=STUB_LLM_SEED):
+        self.latency = parse_latency(latency)
+        self.token_s = 1.0 / tokens_per_s if tokens_per_s > 0 else 0.0
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "errors": 0, "timeouts": 0}
+
+        self.by_prompt = {}
+        self.by_kind = {}
+        for entry in self._load(recordings_path):
+            self.by_kind.setdefault(entry["kind"], []).append(entry["content"])
+            if entry.get("prompt"):
+                self.by_prompt[(entry["kind"], prompt_key(entry["prompt"]))] = entry["content"]
+
+    @staticmethod
+    def _load(path: str) -> list:
+        if not path:
+            return DEFAULT_RECORDINGS
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def plan(self, kind: str, prompt: str) -> StubReply:
+        key = prompt_key(prompt)
+        with self._lock:
+            self.stats["calls"] += 1
+            roll = self._rng.random()
+            first_token_s = self.latency(self._rng)
+            if roll < self.error_rate:
+                self.stats["errors"] += 1
+                return StubReply("error", first_token_s)
+            if roll < self.error_rate + self.timeout_rate:
+                self.stats["timeouts"] += 1
+                return StubReply("timeout", STUB_LLM_MAX_HANG)
+
+        content = self.by_prompt.get((kind, key))
+        if content is None:
+            choices = self.by_kind.get(kind) or [""]
+            content = choices[int(key[:8], 16) % len(choices)]
+        return StubReply("ok", first_token_s, self.token_s, re.findall(r"\s*\S+", content) or [""])
+
+    # In-process mode -------------------------------------------------------
+
+    def post(self, url: str, headers: dict = None, data=None, timeout: float = None, stream: bool = False,
+             **kwargs) -> StubResponse:
+        """Drop-in for ``requests.post`` against a chat completions URL (``data=`` or ``json=`` body)"""
+        payload = kwargs["json"] if kwargs.get("json") is not None else json.loads(data or "{}")
+        prompt = "\n".join(message.get("content", "") for message in payload.get("messages", []))
+        reply = self.plan("chat", prompt)
+        if reply.outcome == "timeout":
+            time.sleep(min(reply.first_token_s, timeout or reply.first_token_s))
+            raise requests.exceptions.Timeout("Stub LLM: simulated timeout")
+        time.sleep(reply.first_token_s)
+        return StubResponse(reply, stream=payload.get("stream", stream))
+
+    def complete(self, prompt: str, **kwargs) -> dict:
+        """Drop-in for a /v1/completions call (the response JSON it returns)"""
+        reply = self.plan("completion", prompt)
+        if reply.outcome == "timeout":
+            time.sleep(reply.first_token_s)
+            raise TimeoutError("Stub LLM: simulated timeout")
+        time.sleep(reply.first_token_s + reply.token_s * len(reply.tokens))
+        if reply.outcome == "error":
+            raise RuntimeError("Stub LLM: simulated service error")
+        return {"choices": [{"text": reply.content}]}
+
+
+def create_stub_app(stub: StubLLM = None, hang_s: float = STUB_LLM_SERVER_HANG):
+    """
+    A local server speaking the Together chat/completions API. Point the backend
+    at it with TOGETHER_API_URL=http://host:port/v1/chat/completions (answer
+    evaluation) and TOGETHER_BASE_URL=http://host:port/v1 (question generation,
+    which posts to /completions), with any TOGETHER_API_KEY. A simulated timeout
+    holds the request for ``hang_s`` seconds before answering 504.
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    stub = stub or StubLLM()
+    app = FastAPI(title="Stub LLM")
+
+    async def wait(reply: StubReply):
+        if reply.outcome == "timeout":
+            await asyncio.sleep(hang_s)
+            return JSONResponse({"error": {"message": "Stub LLM: simulated timeout"}}, status_code=504)
+        await asyncio.sleep(reply.first_token_s)
+        if reply.outcome == "error":
+            return JSONResponse({"error": {"message": "Stub LLM: simulated service error"}}, status_code=503)
+        return None
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        prompt = "\n".join(message.get("content", "") for message in payload.get("messages", []))
+        reply = stub.plan("chat", prompt)
+        failure = await wait(reply)
+        if failure is not None:
+            return failure
+
+        if not payload.get("stream"):
+            await asyncio.sleep(reply.token_s * len(reply.tokens))
+            return {"choices": [{"index": 0, "message": {"role": "assistant", "content": reply.content},
+                                 "finish_reason": "stop"}]}
+
+        async def events():
+            for token in reply.tokens:
+                await asyncio.sleep(reply.token_s)
+                yield f"data: {json.dumps({'choices': [{'index': 0, 'delta': {'content': token}}]})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/completions")
+    async def completions(request: Request):
+        payload = await request.json()
+        reply = stub.plan("completion", payload.get("prompt", ""))
+        failure = await wait(reply)
+        if failure is not None:
+            return failure
+        await asyncio.sleep(reply.token_s * len(reply.tokens))
+        return {"choices": [{"index": 0, "text": reply.content, "finish_reason": "stop"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return stub.stats
+
+    return app
+
+
+_stub = None
+_stub_lock = threading.Lock()
+
+
+def get_stub_llm() -> StubLLM:
+    global _stub
+    if _stub is None:
+        with _stub_lock:
+            if _stub is None:
+                _stub = StubLLM()
+    return _stub
+
+
+def configure_stub_llm(**kwargs) -> StubLLM:
+    """Replace the in-process stub (benchmarks set their own latency and error rates)"""
+    global _stub
+    with _stub_lock:
+        _stub = StubLLM(**kwargs)
+    return _stub
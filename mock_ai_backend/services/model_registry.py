@@ -0,0 +1,138 @@
+# services/model_registry.py
+
+import importlib
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Preload heavy models in a background thread once the server has started
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "true").lower() in ("1", "true", "yes")
+
+
+class ModelRegistry:
+    """
+    Lazily loaded, process-wide heavy resources (ML models, MediaPipe graphs and
+    the modules that import TensorFlow/MediaPipe/moviepy).
+
+    Each entry is loaded on first use under its own lock, so concurrent requests
+    wait for a single load instead of loading twice, and unrelated entries never
+    block each other.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._instances = {}
+        self._locks = {}
+        self._load_times = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks[name] = threading.Lock()
+
+    def get(self, name: str):
+        # Fast path without locking once loaded
+        if name in self._instances:
+            return self._instances[name]
+
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            if name not in self._instances:
+                start = time.perf_counter()
+                try:
+                    instance = self._loaders[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._load_times[name] = round(time.perf_counter() - start, 3)
+                self._errors.pop(name, None)
+                self._instances[name] = instance
+                logger.info(f"📦 Loaded {name} in {self._load_times[name]}s")
+        return self._instances[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def preload(self, names=None):
+        """Load the given (default: all) entries, logging failures instead of raising"""
+        for name in names or list(self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"❌ Preloading {name} failed: {e}")
+
+    def preload_in_background(self, names=None) -> threading.Thread:
+        thread = threading.Thread(target=self.preload, args=(names,), name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def ready(self) -> bool:
+        return all(name in self._instances for name in self._loaders)
+
+    def status(self) -> dict:
+        return {
+            name: {
+                "loaded": name in self._instances,
+                "load_time": self._load_times.get(name),
+                "error": self._errors.get(name)
+            }
+            for name in self._loaders
+        }
+
+
+class SerializedGraph:
+    """
+    A MediaPipe graph shared by the analysis threads. Graphs are not thread-safe,
+    so process() runs one frame at a time; pair it with static_image_mode=True so
+    no tracking state carries over between unrelated frames or videos.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._lock = threading.Lock()
+
+    def process(self, image):
+        with self._lock:
+            return self.graph.process(image)
+
+
+registry = ModelRegistry()
+
+
+def _module(path: str):
+    return lambda: importlib.import_module(path)
+
+
+# Standalone single-frame fallbacks (per-video tracking lives in utils.face_tracker.FaceTracker)
+def _mediapipe_face_mesh():
+    import mediapipe as mp
+    return SerializedGraph(mp.solutions.face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1, refine_landmarks=True))
+
+
+def _mediapipe_pose():
+    import mediapipe as mp
+    return SerializedGraph(mp.solutions.pose.Pose(static_image_mode=True, model_complexity=1))
+
+
+def _emotion_detector():
+    from services.emotion_detector import create_emotion_detector
+    return create_emotion_detector()
+
+
+# Modules whose import pulls in TensorFlow/Keras, MediaPipe, moviepy or pydub
+registry.register("emotion_prediction", _module("script.predict_emotion"))
+registry.register("video_analysis", _module("utils.video_analysis_utils"))
+registry.register("speech_to_text", _module("services.audio_to_text"))
+
+# Model instances
+registry.register("emotion_detector", _emotion_detector)
+registry.register("smile_face_mesh", _mediapipe_face_mesh)
+registry.register("posture_face_mesh", _mediapipe_face_mesh)
+registry.register("confidence_pose", _mediapipe_pose)
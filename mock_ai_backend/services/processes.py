@@ -0,0 +1,18 @@
+# services/processes.py
+
+import os
+
+# Server processes on this host (gunicorn.conf.py sets it to its worker count).
+# Limits that are kept in process memory are split between them.
+SERVER_PROCESSES = max(1, int(os.getenv("SERVER_PROCESSES", "1")))
+
+
+def pid_alive(pid: int) -> bool:
+    """Whether a process with this PID exists (one we may not signal still counts)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -1,17 +1,19 @@
 # 🤖 services/question_generator.py
 
 import os
+import re
 from dotenv import load_dotenv
-import together
+import requests
+
+from services.answer_evaluator import get_reference_answers
+from services.llm_stub import LLM_PROVIDER, get_stub_llm, record_response
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Set your API key properly (recommended way)
-os.environ["TOGETHER_API_KEY"] = os.getenv("TOGETHER_API_KEY")
-
-# Configure Together API
-together.api_key = os.getenv("TOGETHER_API_KEY")
+TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
+# OpenAI-compatible API root; point at script/stub_llm_server.py (http://host:port/v1) for load tests
+TOGETHER_BASE_URL = os.getenv("TOGETHER_BASE_URL", "https://api.together.xyz/v1").rstrip("/")
 
 def generate_questions(resume_text: str, jd_text: str):
     prompt = f"""
@@ -22,6 +24,8 @@ Given the following resume and job description, generate exactly 5 interview que
 - Last 2 should be behavioral questions.
 
 Return **only** the list of questions, numbered from 1 to 5, with no section headers or extra text.
+After each question, on its own line starting with "Answer:", give a model answer a strong candidate
+would give, in 2 to 3 sentences.
 
 Resume:
 {resume_text}
@@ -30,16 +34,46 @@ Job Description:
 {jd_text}
 """
 
-    # Choose a supported model
-    response = together.Complete.create(
-        model="mistralai/Mixtral-8x7B-Instruct-v0.1",  # ✅ Replace with your available model
-        prompt=prompt,
-        max_tokens=300,
-        temperature=0.7,
-    )
+    if LLM_PROVIDER == "stub":
+        # Recorded responses replayed in-process (load tests, offline development)
+        response = get_stub_llm().complete(prompt=prompt, max_tokens=800)
+    else:
+        # Plain HTTP to the completions endpoint, so TOGETHER_BASE_URL can redirect it
+        http_response = requests.post(
+            f"{TOGETHER_BASE_URL}/completions",
+            headers={"Authorization": f"Bearer {TOGETHER_API_KEY}", "Content-Type": "application/json"},
+            json={
+                "model": "mistralai/Mixtral-8x7B-Instruct-v0.1",  # ✅ Replace with your available model
+                "prompt": prompt,
+                "max_tokens": 800,
+                "temperature": 0.7,
+            },
+            timeout=45,
+        )
+        http_response.raise_for_status()
+        response = http_response.json()
 
    # ✅ Use dictionary access, not object-style
     text = response['choices'][0]['text']
-    # Split the string into a list of questions
-    questions = [q.strip() for q in text.split('\n') if q.strip() and '?' in q]
-    return questions
+    record_response("completion", prompt, text)
+    pairs = parse_questions(text)
+    try:
+        # Reference answers let the local scorer resolve more answers without the LLM
+        get_reference_answers().put_many(pairs)
+    except Exception as e:
+        print(f"⚠️ Could not store reference answers: {e}")
+    return [question for question, _ in pairs]
+
+
+def parse_questions(text: str) -> list:
+    """(question, reference answer or None) pairs from the numbered list the LLM returns"""
+    pairs = []
+    for line in text.split('\n'):
+        line = line.strip()
+        answer = re.match(r'^[*_]*answer[*_]*\s*:[*_]*\s*(.*)$', line, re.IGNORECASE)
+        if answer:
+            if pairs and answer.group(1):
+                pairs[-1] = (pairs[-1][0], answer.group(1).strip())
+        elif line and '?' in line:
+            pairs.append((line, None))
+    return pairs
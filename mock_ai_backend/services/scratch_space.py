@@ -0,0 +1,233 @@
+# services/scratch_space.py
+
+import os
+import queue
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+
+from services.processes import SERVER_PROCESSES, pid_alive
+
+# Per-request scratch directories. Small working files (normalized proxies,
+# speech WAVs, live audio) go to tmpfs when available; large ones to disk.
+SCRATCH_DIR = os.getenv("SCRATCH_DIR", os.path.join(tempfile.gettempdir(), "mock_ai_scratch"))
+SCRATCH_SHM_DIR = os.getenv("SCRATCH_SHM_DIR", "/dev/shm/mock_ai_scratch")
+SCRATCH_SHM_MAX_FILE = int(os.getenv("SCRATCH_SHM_MAX_MB", "64")) * 2**20      # Larger requests go to disk
+SCRATCH_SHM_QUOTA = int(os.getenv("SCRATCH_SHM_QUOTA_MB", "256")) * 2**20
+SCRATCH_DISK_QUOTA = int(os.getenv("SCRATCH_DISK_QUOTA_MB", "4096")) * 2**20
+SCRATCH_ORPHAN_AGE = int(os.getenv("SCRATCH_ORPHAN_AGE", "3600"))  # seconds before another worker's dir counts as orphaned
+# The quotas are for the whole host: each of this many processes (SERVER_PROCESSES
+# by default) tracks its own reservations against an equal share
+SCRATCH_PROCESSES = max(1, int(os.getenv("SCRATCH_PROCESSES", str(SERVER_PROCESSES))))
+
+TIER_SHM = "shm"
+TIER_DISK = "disk"
+
+
+class ScratchQuotaExceeded(Exception):
+    """No scratch tier has room for the requested reservation"""
+
+
+class ScratchDir:
+    """
+    One request's isolated scratch directory. Usable wherever a path is
+    (``os.path.join(scratch, name)``); ``close`` hands it to the background
+    cleaner and is safe to call more than once.
+    """
+
+    def __init__(self, manager: "ScratchManager", path: str, tier: str, reserved: int):
+        self.manager = manager
+        self.path = path
+        self.tier = tier
+        self.reserved = reserved
+        self.closed = False
+
+    def file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def close(self):
+        self.manager.release(self)
+
+    def __fspath__(self):
+        return self.path
+
+    def __str__(self):
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ScratchManager:
+    """
+    Hands out per-request scratch directories and tracks how many bytes are
+    reserved on each tier against its quota (this process's share of the
+    host-wide quota). Directories are removed by one
+    background thread, so releasing never blocks an event loop or an analysis
+    worker on ``rmtree``. Directory names carry the owning PID, which lets the
+    startup sweep drop leftovers of crashed workers without touching live ones.
+    """
+
+    def __init__(self, disk_dir: str = SCRATCH_DIR, shm_dir: str = SCRATCH_SHM_DIR,
+                 processes: int = SCRATCH_PROCESSES):
+        self.roots = {TIER_DISK: disk_dir}
+        self.processes = max(1, processes)
+        self.quotas = {TIER_DISK: SCRATCH_DISK_QUOTA // self.processes, TIER_SHM: SCRATCH_SHM_QUOTA // self.processes}
+        self.reserved = {TIER_DISK: 0, TIER_SHM: 0}
+        os.makedirs(disk_dir, exist_ok=True)
+        if shm_dir and os.path.isdir(os.path.dirname(shm_dir) or "/"):
+            try:
+                os.makedirs(shm_dir, exist_ok=True)
+                self.roots[TIER_SHM] = shm_dir
+                # Containers often mount a small /dev/shm; never plan on more than half of it
+                stats = os.statvfs(shm_dir)
+                self.quotas[TIER_SHM] = min(SCRATCH_SHM_QUOTA, stats.f_bavail * stats.f_frsize // 2) // self.processes
+            except OSError:
+                pass  # No writable tmpfs: everything goes to disk
+
+        self._lock = threading.Lock()
+        self._active = {}
+        self._removals = queue.Queue()
+        self._cleaner = threading.Thread(target=self._clean_forever, name="scratch-cleaner", daemon=True)
+        self._cleaner.start()
+
+    def _pick_tier(self, expected_bytes: int, size_known: bool = True) -> str:
+        # Unknown sizes never go to tmpfs: a small reservation would not bound what gets written to RAM
+        if (TIER_SHM in self.roots and size_known and expected_bytes <= SCRATCH_SHM_MAX_FILE
+                and self.reserved[TIER_SHM] + expected_bytes <= self.quotas[TIER_SHM]):
+            return TIER_SHM
+        if self.reserved[TIER_DISK] + expected_bytes <= self.quotas[TIER_DISK]:
+            return TIER_DISK
+        raise ScratchQuotaExceeded(
+            f"Scratch space exhausted ({self.reserved[TIER_DISK] // 2**20}MB of "
+            f"{self.quotas[TIER_DISK] // 2**20}MB reserved)"
+        )
+
+    def allocate(self, prefix: str = "request", expected_bytes: int = None) -> ScratchDir:
+        """
+        A new isolated directory, on tmpfs when ``expected_bytes`` is small and the
+        tmpfs quota allows. ``None`` means the size is unknown: the directory goes
+        to disk (callers that can bound the size should reserve that bound instead).
+        """
+        size_known = expected_bytes is not None
+        expected_bytes = max(0, int(expected_bytes or 0))
+        with self._lock:
+            tier = self._pick_tier(expected_bytes, size_known)
+            path = os.path.join(self.roots[tier], f"{prefix}-{os.getpid()}-{secrets.token_hex(6)}")
+            scratch = self._active[path] = ScratchDir(self, path, tier, expected_bytes)
+            self.reserved[tier] += expected_bytes
+        try:
+            os.makedirs(path)
+        except OSError:
+            self.release(scratch)
+            raise
+        return scratch
+
+    def release(self, scratch):
+        """Unreserve and remove a scratch directory in the background (a ScratchDir or a plain path)"""
+        if not isinstance(scratch, ScratchDir):
+            path = os.fspath(scratch)
+            with self._lock:
+                scratch = self._active.get(path)
+            if scratch is None:
+                self._removals.put(path)
+                return
+        with self._lock:
+            if scratch.closed:
+                return
+            scratch.closed = True
+            self._active.pop(scratch.path, None)
+            self.reserved[scratch.tier] -= scratch.reserved
+        self._removals.put(scratch.path)
+
+    def discard(self, path: str):
+        """Remove one file in the background (e.g. an upload that has been analyzed)"""
+        self._removals.put(path)
+
+    def _clean_forever(self):
+        while True:
+            path = self._removals.get()
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                print(f"⚠️ Scratch cleanup failed for {path}: {e}")
+            finally:
+                self._removals.task_done()
+
+    def wait_idle(self):
+        """Block until every queued removal has run (tests, benchmarks, shutdown)"""
+        self._removals.join()
+
+    def sweep_orphans(self) -> int:
+        """Remove scratch dirs left by dead workers (or stale ones older than SCRATCH_ORPHAN_AGE)"""
+        removed = 0
+        now = time.time()
+        for root in self.roots.values():
+            try:
+                entries = list(os.scandir(root))
+            except OSError:
+                continue
+            for entry in entries:
+                with self._lock:
+                    if entry.path in self._active:
+                        continue
+                try:
+                    pid = int(entry.name.rsplit("-", 2)[1])
+                except (IndexError, ValueError):
+                    pid = None
+                try:
+                    stale = now - entry.stat(follow_symlinks=False).st_mtime > SCRATCH_ORPHAN_AGE
+                except OSError:
+                    continue
+                # Own PID but not active: left by an earlier process that had the same PID
+                if pid is not None and pid != os.getpid() and pid_alive(pid) and not stale:
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                    else:
+                        os.remove(entry.path)
+                except OSError:
+                    continue
+                removed += 1
+        return removed
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "active": len(self._active),
+                "pending_removals": self._removals.qsize(),
+                **{f"{tier}_reserved_mb": round(self.reserved[tier] / 2**20, 1) for tier in self.roots},
+                **{f"{tier}_quota_mb": round(self.quotas[tier] / 2**20, 1) for tier in self.roots},
+            }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def _forget_manager():
+    # The cleaner thread does not survive fork(); a forked worker builds its own manager
+    global _manager, _manager_lock
+    _manager = None
+    _manager_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_manager)
+
+
+def get_scratch_manager() -> ScratchManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ScratchManager()
+    return _manager
@@ -0,0 +1,356 @@
+# services/session_store.py
+
+import json
+import secrets
+import threading
+import time
+from typing import Optional
+
+from models.session import (
+    METRIC_FIELDS,
+    JSON_FIELDS,
+    SESSION_DEFAULT_FIELDS,
+    ANSWER_DEFAULT_FIELDS
+)
+from services.database import get_connection, init_schema
+from services.interview_aggregator import InterviewAggregator
+
+
+class SessionStore:
+    """
+    Interview sessions, their questions and per-answer analysis in SQLite.
+
+    Metric values are real columns so history lists and charts are plain
+    indexed reads; full analysis, feedback and timelines are JSON blobs that
+    are only loaded when a read projects them.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS interview_sessions (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        title TEXT,
+        status TEXT NOT NULL DEFAULT 'in_progress',
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        question_count INTEGER NOT NULL DEFAULT 0,
+        answer_count INTEGER NOT NULL DEFAULT 0,
+        overall_score REAL,
+        summary TEXT,
+        aggregate TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_sessions_user_time ON interview_sessions(user_id, created_at DESC, id DESC);
+
+    CREATE TABLE IF NOT EXISTS session_questions (
+        session_id TEXT NOT NULL REFERENCES interview_sessions(id) ON DELETE CASCADE,
+        question_index INTEGER NOT NULL,
+        question TEXT NOT NULL,
+        PRIMARY KEY (session_id, question_index)
+    );
+
+    CREATE TABLE IF NOT EXISTS session_answers (
+        session_id TEXT NOT NULL REFERENCES interview_sessions(id) ON DELETE CASCADE,
+        question_index INTEGER NOT NULL,
+        question TEXT,
+        created_at REAL NOT NULL,
+        eye_contact REAL,
+        smile REAL,
+        posture REAL,
+        confidence REAL,
+        hand_movement REAL,
+        head_nod REAL,
+        score REAL,
+        transcript TEXT,
+        analysis TEXT,
+        evaluation TEXT,
+        feedback TEXT,
+        timeline TEXT,
+        PRIMARY KEY (session_id, question_index)
+    );
+    CREATE INDEX IF NOT EXISTS idx_answers_time ON session_answers(created_at);
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        init_schema(self.SCHEMA, path)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(interview_sessions)")}
+        if "aggregate" not in columns:
+            self.conn.execute("ALTER TABLE interview_sessions ADD COLUMN aggregate TEXT")
+
+    @property
+    def conn(self):
+        return get_connection(self.path)
+
+    @staticmethod
+    def _decode(row, fields) -> dict:
+        record = {}
+        for field in fields:
+            value = row[field]
+            if field in JSON_FIELDS and value is not None:
+                value = json.loads(value)
+            record[field] = value
+        return record
+
+    # -- writes ---------------------------------------------------------------
+
+    def create_session(self, user_id: str, title: Optional[str] = None, questions: list = ()) -> dict:
+        now = time.time()
+        session_id = secrets.token_urlsafe(12)
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                """
+                INSERT INTO interview_sessions (id, user_id, title, created_at, updated_at, question_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (session_id, user_id, title, now, now, len(questions))
+            )
+            conn.executemany(
+                "INSERT INTO session_questions (session_id, question_index, question) VALUES (?, ?, ?)",
+                [(session_id, i, q) for i, q in enumerate(questions)]
+            )
+        return {"id": session_id, "title": title, "status": "in_progress", "created_at": now,
+                "question_count": len(questions), "answer_count": 0, "overall_score": None}
+
+    def add_answer(self, session_id: str, user_id: str, question_index: int, question: str,
+                   analysis: dict, evaluation: dict = None, feedback: dict = None,
+                   timeline: list = None) -> Optional[dict]:
+        """
+        Store (or replace) the analysis of one answer and fold it into the
+        session's running aggregate. Returns the updated session summary, or
+        None if the session is not the user's.
+        """
+        now = time.time()
+        metrics = [analysis.get(field) for field in METRIC_FIELDS]
+        score = (evaluation or {}).get("score")
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            session = conn.execute(
+                "SELECT aggregate FROM interview_sessions WHERE id = ? AND user_id = ?", (session_id, user_id)
+            ).fetchone()
+            if session is None:
+                return None
+
+            # O(1) aggregate update; a re-recorded answer is first taken back out
+            aggregator = InterviewAggregator.from_dict(json.loads(session["aggregate"] or "{}"))
+            previous = conn.execute(
+                "SELECT analysis, score FROM session_answers WHERE session_id = ? AND question_index = ?",
+                (session_id, question_index)
+            ).fetchone()
+            if previous is not None:
+                aggregator.remove(json.loads(previous["analysis"] or "{}"), previous["score"])
+            aggregator.add(analysis, score)
+            summary = {**aggregator.summary(), "feedback": aggregator.feedback()}
+
+            new_question = conn.execute(
+                """
+                INSERT OR IGNORE INTO session_questions (session_id, question_index, question) VALUES (?, ?, ?)
+                """,
+                (session_id, question_index, question)
+            ).rowcount
+            conn.execute(
+                f"""
+                INSERT INTO session_answers (
+                    session_id, question_index, question, created_at, {", ".join(METRIC_FIELDS)},
+                    score, transcript, analysis, evaluation, feedback, timeline
+                ) VALUES (?, ?, ?, ?, {", ".join("?" for _ in METRIC_FIELDS)}, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (session_id, question_index) DO UPDATE SET
+                    question = excluded.question, created_at = excluded.created_at,
+                    {", ".join(f"{f} = excluded.{f}" for f in METRIC_FIELDS)},
+                    score = excluded.score, transcript = excluded.transcript, analysis = excluded.analysis,
+                    evaluation = excluded.evaluation, feedback = excluded.feedback, timeline = excluded.timeline
+                """,
+                (session_id, question_index, question, now, *metrics, score, analysis.get("transcript"),
+                 json.dumps(analysis), json.dumps(evaluation), json.dumps(feedback), json.dumps(timeline))
+            )
+            score_stat = aggregator.stats["score"]
+            conn.execute(
+                """
+                UPDATE interview_sessions SET
+                    updated_at = ?,
+                    answer_count = ?,
+                    question_count = question_count + ?,
+                    overall_score = ?,
+                    summary = ?,
+                    aggregate = ?
+                WHERE id = ?
+                """,
+                (now, aggregator.answers, new_question, round(score_stat.mean, 2) if score_stat.count else None,
+                 json.dumps(summary), json.dumps(aggregator.to_dict()), session_id)
+            )
+        return summary
+
+    def set_answer_evaluation(self, session_id: str, user_id: str, question_index: int,
+                              evaluation: dict) -> Optional[dict]:
+        """
+        Replace a stored answer's evaluation (e.g. when the LLM result for a
+        provisional local score arrives) and move its score in the running
+        aggregate. Returns the updated session summary, or None if not found.
+        """
+        score = (evaluation or {}).get("score")
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT s.aggregate, a.analysis, a.score
+                FROM session_answers a JOIN interview_sessions s ON s.id = a.session_id
+                WHERE a.session_id = ? AND a.question_index = ? AND s.user_id = ?
+                """,
+                (session_id, question_index, user_id)
+            ).fetchone()
+            if row is None:
+                return None
+
+            analysis = json.loads(row["analysis"] or "{}")
+            aggregator = InterviewAggregator.from_dict(json.loads(row["aggregate"] or "{}"))
+            aggregator.remove(analysis, row["score"])
+            aggregator.add(analysis, score)
+            summary = {**aggregator.summary(), "feedback": aggregator.feedback()}
+
+            conn.execute(
+                "UPDATE session_answers SET score = ?, evaluation = ? WHERE session_id = ? AND question_index = ?",
+                (score, json.dumps(evaluation), session_id, question_index)
+            )
+            score_stat = aggregator.stats["score"]
+            conn.execute(
+                "UPDATE interview_sessions SET updated_at = ?, overall_score = ?, summary = ?, aggregate = ? WHERE id = ?",
+                (time.time(), round(score_stat.mean, 2) if score_stat.count else None,
+                 json.dumps(summary), json.dumps(aggregator.to_dict()), session_id)
+            )
+        return summary
+
+    def complete_session(self, session_id: str, user_id: str) -> Optional[dict]:
+        """Mark a session completed; its summary is already current, so nothing is recomputed"""
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE interview_sessions SET status = 'completed', updated_at = ? WHERE id = ? AND user_id = ?",
+                (time.time(), session_id, user_id)
+            )
+            if cursor.rowcount == 0:
+                return None
+            row = conn.execute("SELECT summary FROM interview_sessions WHERE id = ?", (session_id,)).fetchone()
+        return json.loads(row["summary"]) if row["summary"] else {}
+
+    def iter_session_averages(self, batch_size: int = 5000):
+        """Yield (session_ids, averages dicts) batches for every session with answers"""
+        last_id = ""
+        while True:
+            rows = self.conn.execute(
+                "SELECT id, aggregate FROM interview_sessions WHERE id > ? AND aggregate IS NOT NULL ORDER BY id LIMIT ?",
+                (last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            yield (
+                [row["id"] for row in rows],
+                [InterviewAggregator.from_dict(json.loads(row["aggregate"])).averages() for row in rows]
+            )
+
+    def set_session_feedback(self, feedback_by_id: dict):
+        """Replace the feedback inside each session's summary (e.g. after a rule change)"""
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "UPDATE interview_sessions SET summary = json_set(COALESCE(summary, '{}'), '$.feedback', json(?)) WHERE id = ?",
+                [(json.dumps(feedback), session_id) for session_id, feedback in feedback_by_id.items()]
+            )
+
+    def delete_session(self, session_id: str, user_id: str) -> bool:
+        cursor = self.conn.execute(
+            "DELETE FROM interview_sessions WHERE id = ? AND user_id = ?", (session_id, user_id)
+        )
+        return cursor.rowcount > 0
+
+    # -- reads ----------------------------------------------------------------
+
+    def _owned(self, session_id: str, user_id: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM interview_sessions WHERE id = ? AND user_id = ?", (session_id, user_id)
+        ).fetchone()
+        return row is not None
+
+    def list_sessions(self, user_id: str, limit: int = 20, cursor: Optional[str] = None,
+                      fields: tuple = SESSION_DEFAULT_FIELDS):
+        """Newest-first keyset pagination; returns (sessions, next_cursor)"""
+        # created_at and id are always read to build the cursor
+        columns = list(dict.fromkeys((*fields, "created_at", "id")))
+        params = [user_id]
+        where = "user_id = ?"
+        if cursor:
+            created_at, last_id = cursor.split("|", 1)
+            where += " AND (created_at < ? OR (created_at = ? AND id < ?))"
+            params += [float(created_at), float(created_at), last_id]
+
+        rows = self.conn.execute(
+            f"""
+            SELECT {", ".join(columns)} FROM interview_sessions
+            WHERE {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """,
+            (*params, limit + 1)
+        ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = f"{last['created_at']!r}|{last['id']}"
+        return [self._decode(row, fields) for row in rows], next_cursor
+
+    def get_session(self, session_id: str, user_id: str, fields: tuple = SESSION_DEFAULT_FIELDS,
+                    answer_fields: Optional[tuple] = ANSWER_DEFAULT_FIELDS, include_questions: bool = True) -> Optional[dict]:
+        row = self.conn.execute(
+            f"SELECT {', '.join(fields)} FROM interview_sessions WHERE id = ? AND user_id = ?",
+            (session_id, user_id)
+        ).fetchone()
+        if row is None:
+            return None
+
+        session = self._decode(row, fields)
+        if include_questions:
+            session["questions"] = [
+                dict(q) for q in self.conn.execute(
+                    "SELECT question_index, question FROM session_questions WHERE session_id = ? ORDER BY question_index",
+                    (session_id,)
+                )
+            ]
+        if answer_fields:
+            session["answers"] = [
+                self._decode(a, answer_fields) for a in self.conn.execute(
+                    f"SELECT {', '.join(answer_fields)} FROM session_answers WHERE session_id = ? ORDER BY question_index",
+                    (session_id,)
+                )
+            ]
+        return session
+
+    def get_answer(self, session_id: str, user_id: str, question_index: int, fields: tuple) -> Optional[dict]:
+        row = self.conn.execute(
+            f"""
+            SELECT {", ".join("a." + f for f in fields)}
+            FROM session_answers a JOIN interview_sessions s ON s.id = a.session_id
+            WHERE a.session_id = ? AND a.question_index = ? AND s.user_id = ?
+            """,
+            (session_id, question_index, user_id)
+        ).fetchone()
+        return self._decode(row, fields) if row else None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore()
+    return _store
@@ -0,0 +1,251 @@
+# services/tracing.py
+
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Opt-in sampling profiler: dump folded stacks for requests slower than this (ms)
+PROFILE_SLOW_REQUESTS_MS = float(os.getenv("PROFILE_SLOW_REQUESTS_MS", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(__file__), '..', 'profiles'))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")) / 1000
+
+# Multi-worker deployments: each worker writes its histograms here and /metrics merges them
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))  # seconds between a worker's writes
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram for one label set"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class StageMetrics:
+    """
+    Duration histograms keyed by pipeline stage.
+
+    With METRICS_DIR set, every worker process periodically writes its
+    snapshot to its own file there and rendering sums all files, so a scrape
+    that lands on any worker reports the whole server. Files of exited
+    workers are kept, which keeps the merged counters monotonic.
+    """
+
+    name = "mock_ai_stage_duration_seconds"
+
+    def __init__(self, metrics_dir: str = METRICS_DIR):
+        self.metrics_dir = metrics_dir
+        self._reset()
+
+    def _reset(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def observe(self, stage: str, seconds: float):
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, Histogram())
+        histogram.observe(seconds)
+        if self.metrics_dir and time.monotonic() - self._last_flush > METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def _snapshots(self) -> dict:
+        return {stage: histogram.snapshot() for stage, histogram in list(self._histograms.items())}
+
+    def flush(self):
+        """Write this worker's histograms to METRICS_DIR (atomically, so readers never see half a file)"""
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            path = os.path.join(self.metrics_dir, f"stages-{os.getpid()}.json")
+            try:
+                os.makedirs(self.metrics_dir, exist_ok=True)
+                with open(path + ".tmp", "w") as f:
+                    json.dump(self._snapshots(), f)
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write metrics to {path}: {e}")
+
+    def _merged(self) -> dict:
+        if not self.metrics_dir:
+            return self._snapshots()
+        self.flush()
+        merged = {}
+        for name in os.listdir(self.metrics_dir):
+            if not (name.startswith("stages-") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.metrics_dir, name)) as f:
+                    snapshots = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for stage, (counts, total, count) in snapshots.items():
+                previous = merged.get(stage)
+                if previous is not None:
+                    counts = [a + b for a, b in zip(previous[0], counts)]
+                    total += previous[1]
+                    count += previous[2]
+                merged[stage] = (counts, total, count)
+        return merged
+
+    def render_prometheus(self) -> str:
+        """Text exposition format served on /metrics"""
+        lines = [
+            f"# HELP {self.name} Duration of analysis pipeline stages in seconds",
+            f"# TYPE {self.name} histogram",
+        ]
+        snapshots = self._merged()
+        for stage in sorted(snapshots):
+            counts, total, count = snapshots[stage]
+            cumulative = 0
+            for bound, bucket_count in zip(DEFAULT_BUCKETS + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{self.name}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = StageMetrics()
+# A worker forked from a preloaded master starts with empty histograms (the
+# master's observations would otherwise be counted once per worker)
+os.register_at_fork(after_in_child=metrics._reset)
+
+
+class RequestTrace:
+    """Per-request stage durations, returned as an optional timing breakdown"""
+
+    def __init__(self):
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {stage: round(seconds, 4) for stage, seconds in self.timings.items()}
+
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+def start_request_trace() -> RequestTrace:
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+@contextmanager
+def trace_stage(stage: str):
+    """Time a block, recording it in the stage histogram and the current request trace"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe(stage, elapsed)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(stage, elapsed)
+        logger.debug(f"⏱️ {stage}: {elapsed:.3f}s")
+
+
+def traced(stage: str):
+    """Decorator form of trace_stage"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class SlowRequestProfiler:
+    """
+    Opt-in sampling profiler for the calling thread.
+
+    Samples the thread's stack every PROFILE_SAMPLE_INTERVAL_MS while the block
+    runs. If the block took longer than PROFILE_SLOW_REQUESTS_MS, the samples
+    are written to PROFILE_DIR in folded-stack format (flamegraph.pl/speedscope).
+    Disabled unless PROFILE_SLOW_REQUESTS_MS is set.
+    """
+
+    def __init__(self, name: str, threshold_ms: float = None):
+        self.name = name
+        self.threshold_ms = PROFILE_SLOW_REQUESTS_MS if threshold_ms is None else threshold_ms
+        self.enabled = self.threshold_ms > 0
+        self.stacks = Counter()
+        self.dump_path = None
+        self._stop = threading.Event()
+
+    def _sample(self, thread_id: int):
+        while not self._stop.wait(PROFILE_SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        if self.enabled:
+            self._start = time.perf_counter()
+            self._thread = threading.Thread(target=self._sample, args=(threading.get_ident(),), daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.enabled:
+            return
+        self._stop.set()
+        self._thread.join()
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        if elapsed_ms < self.threshold_ms or not self.stacks:
+            return
+
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            self.dump_path = os.path.join(
+                PROFILE_DIR, f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{int(elapsed_ms)}ms.folded"
+            )
+            with open(self.dump_path, "w") as f:
+                for stack, count in self.stacks.items():
+                    f.write(f"{stack} {count}\n")
+            logger.warning(f"🐢 Slow request {self.name} took {elapsed_ms:.0f}ms, profile saved to {self.dump_path}")
+        except Exception as e:
+            logger.warning(f"Profile dump failed (non-critical): {e}")
@@ -0,0 +1,236 @@
+# services/transcript_analytics.py
+
+import json
+import os
+import re
+import wave
+from collections import Counter
+from functools import lru_cache
+
+# Local speech metrics from the transcript: no LLM call, so they are available
+# even when the answer evaluation times out
+SPEECH_SLOW_WPM = float(os.getenv("SPEECH_SLOW_WPM", "110"))
+SPEECH_FAST_WPM = float(os.getenv("SPEECH_FAST_WPM", "160"))
+FILLER_RATE_HIGH = float(os.getenv("FILLER_RATE_HIGH", "5"))  # Fillers per 100 words
+KEYWORD_COVERAGE_LOW = float(os.getenv("KEYWORD_COVERAGE_LOW", "0.3"))
+
+# Canonical filler -> spellings that count as it (English, romanized and Urdu script)
+FILLER_WORDS = {
+    "um": ["um", "umm", "uhm"],
+    "uh": ["uh", "uhh", "er", "erm", "ah"],
+    "like": ["like"],
+    "you know": ["you know", "ya know"],
+    "i mean": ["i mean"],
+    "basically": ["basically"],
+    "actually": ["actually"],
+    "literally": ["literally"],
+    "kind of": ["kind of", "kinda", "sort of", "sorta"],
+    "matlab": ["matlab", "مطلب"],
+    "yani": ["yani", "yaani", "یعنی"],
+    "acha": ["acha", "achha", "اچھا"],
+}
+
+# Spellings that are ordinary words in most sentences ("languages like Python", "it
+# actually worked", "the ER team"): only counted where they are clearly fillers, i.e.
+# at the start of a sentence, set off by a comma or repeated ("like, like")
+CONTEXTUAL_FILLERS = {"like", "actually", "er", "ah"}
+
+# "like" is a verb after these words ("I like", "would like", "looks like")
+_LIKE_NOT_FILLER_AFTER = {
+    "i", "you", "we", "they", "would", "really", "dont", "didnt", "do", "does", "did",
+    "look", "looks", "looked", "feel", "feels", "felt", "seem", "seems", "just", "much",
+}
+
+# parse_jd keeps every Title-case word; these carry no skill information
+_KEYWORD_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+    "on", "or", "our", "the", "this", "to", "we", "will", "with", "you", "your", "must",
+}
+
+_WORD = r"\w+(?:'\w+)*"
+# Keyword tokens keep the symbols that tell technologies apart ("C++", "C#",
+# ".NET", "Node.js") instead of reducing them all to "c", "net" or "node js"
+_KEYWORD_TOKEN = r"[.#]?\w(?:[\w'+#.]*[\w+#])?"
+_FILLER_LOOKUP = {
+    " ".join(spelling.split()): canonical
+    for canonical, spellings in FILLER_WORDS.items() for spelling in spellings
+}
+
+
+def normalize_keywords(keywords) -> list:
+    """
+    Clean keyword input: a list (e.g. parse_jd()["keywords"]), a JSON array
+    string or a comma-separated string. Lowercased, punctuation-trimmed (but
+    "+", "#" and "." inside a token are kept), de-duplicated, stopwords
+    dropped; order preserved.
+    """
+    if not keywords:
+        return []
+    if isinstance(keywords, str):
+        try:
+            parsed = json.loads(keywords)
+        except ValueError:
+            parsed = None
+        keywords = parsed if isinstance(parsed, list) else keywords.split(",")
+
+    cleaned = []
+    for keyword in keywords:
+        keyword = " ".join(re.findall(_KEYWORD_TOKEN, str(keyword).lower()))
+        if keyword and keyword not in _KEYWORD_STOPWORDS and keyword not in cleaned:
+            cleaned.append(keyword)
+    return cleaned
+
+
+@lru_cache(maxsize=64)
+def _matcher(keywords: tuple):
+    """
+    One compiled alternation over every filler and keyword, longest first,
+    with a catch-all word branch, so a single scan of the transcript counts
+    words, fillers and keyword hits together. Cached per keyword set.
+    """
+    terms = {phrase: ("filler", canonical) for phrase, canonical in _FILLER_LOOKUP.items()}
+    for keyword in keywords:
+        terms[keyword] = ("keyword", keyword)
+    alternatives = sorted(terms, key=len, reverse=True)
+    phrase_pattern = "|".join(r"\s+".join(map(re.escape, term.split())) for term in alternatives)
+    pattern = re.compile(rf"(?<!\w)(?P<term>{phrase_pattern})(?!\w)|(?P<word>{_WORD})", re.IGNORECASE)
+    return pattern, terms
+
+
+def audio_duration(path: str) -> float:
+    """Seconds of audio in a WAV (or, failing that, the length of a video); 0.0 when unknown"""
+    if not path:
+        return 0.0
+    try:
+        with wave.open(path, "rb") as wav:
+            return wav.getnframes() / float(wav.getframerate() or 1)
+    except Exception:
+        pass
+    try:
+        import cv2
+
+        cap = cv2.VideoCapture(path)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        finally:
+            cap.release()
+        return frames / fps if fps and frames > 0 else 0.0
+    except Exception:
+        return 0.0
+
+
+def _filler_in_context(text: str, start: int, end: int, spelling: str, previous: str) -> bool:
+    """Sentence-initial, next to a comma, or repeated: where a contextual filler is not an ordinary word"""
+    if previous == spelling:
+        return True
+    i = start - 1
+    while i >= 0 and text[i].isspace():
+        i -= 1
+    if i < 0 or text[i] in ".!?,;:":
+        return True
+    j = end
+    while j < len(text) and text[j].isspace():
+        j += 1
+    return j < len(text) and text[j] in ",;"
+
+
+def analyze_transcript(transcript: str, duration: float = 0.0, keywords=None) -> dict:
+    """Filler counts, speaking pace and (when keywords are given) keyword coverage in one pass"""
+    keywords = normalize_keywords(keywords)
+    pattern, terms = _matcher(tuple(keywords))
+
+    word_count = 0
+    fillers = Counter()
+    keyword_hits = Counter()
+    previous = ""
+    for match in pattern.finditer(transcript or ""):
+        term = match.group("term")
+        if term is None:
+            word_count += 1
+            previous = match.group("word").lower().replace("'", "")
+            continue
+
+        words = term.lower().split()
+        word_count += len(words)
+        spelling = " ".join(words)
+        kind, canonical = terms[spelling]
+        if kind == "keyword":
+            keyword_hits[canonical] += 1
+        elif spelling not in CONTEXTUAL_FILLERS or (
+            _filler_in_context(transcript, match.start(), match.end(), spelling, previous)
+            and not (canonical == "like" and previous in _LIKE_NOT_FILLER_AFTER)
+        ):
+            fillers[canonical] += 1
+        previous = words[-1].replace("'", "")
+
+    filler_count = sum(fillers.values())
+    words_per_minute = round(word_count / (duration / 60.0), 1) if duration > 0 and word_count else None
+    if words_per_minute is None:
+        pace = None
+    elif words_per_minute < SPEECH_SLOW_WPM:
+        pace = "slow"
+    elif words_per_minute > SPEECH_FAST_WPM:
+        pace = "fast"
+    else:
+        pace = "good"
+
+    result = {
+        "word_count": word_count,
+        "duration_s": round(duration, 2),
+        "words_per_minute": words_per_minute,
+        "pace": pace,
+        "filler_count": filler_count,
+        "filler_rate": round(filler_count / word_count * 100, 2) if word_count else 0.0,
+        "fillers": dict(fillers.most_common()),
+    }
+    if keywords:
+        matched = [k for k in keywords if keyword_hits[k]]
+        result["keywords"] = {
+            "total": len(keywords),
+            "matched": matched,
+            "missing": [k for k in keywords if not keyword_hits[k]],
+            "coverage": round(len(matched) / len(keywords), 2),
+            "counts": dict(keyword_hits),
+        }
+    return result
+
+
+def speech_feedback(analytics: dict) -> dict:
+    """Strengths/weaknesses/suggestions from the transcript metrics, in generate_feedback's shape"""
+    feedback = {"strengths": [], "weaknesses": [], "suggestions": []}
+    if not analytics or not analytics.get("word_count"):
+        return feedback
+
+    if analytics["filler_rate"] > FILLER_RATE_HIGH:
+        top = ", ".join(f'"{word}"' for word in list(analytics["fillers"])[:3])
+        feedback["weaknesses"].append(f"Frequent filler words ({top})")
+        feedback["suggestions"].append("Pause briefly instead of using filler words")
+    elif analytics["word_count"] >= 20:
+        feedback["strengths"].append("Few filler words")
+
+    pace = analytics.get("pace")
+    if pace == "good":
+        feedback["strengths"].append("Comfortable speaking pace")
+    elif pace == "fast":
+        feedback["suggestions"].append(f"Slow down a little ({analytics['words_per_minute']:.0f} words per minute)")
+    elif pace == "slow":
+        feedback["suggestions"].append(f"Speak a bit more fluently ({analytics['words_per_minute']:.0f} words per minute)")
+
+    keywords = analytics.get("keywords")
+    if keywords:
+        if keywords["coverage"] < KEYWORD_COVERAGE_LOW and keywords["missing"]:
+            feedback["suggestions"].append(
+                "Relate your answer to the role: mention " + ", ".join(keywords["missing"][:3])
+            )
+        elif keywords["matched"]:
+            feedback["strengths"].append("Answer covers the job description's key skills")
+    return feedback
+
+
+def merge_feedback(feedback: dict, extra: dict) -> dict:
+    """Append speech feedback to the visual-metric feedback without duplicating messages"""
+    for category, messages in extra.items():
+        existing = feedback.setdefault(category, [])
+        existing.extend(m for m in messages if m not in existing)
+    return feedback
@@ -0,0 +1,285 @@
+# services/upload_store.py
+
+import hashlib
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from services.database import get_connection, init_schema
+
+# Assembled uploads live here until finalized (or expired)
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "mock_ai_uploads"))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(4 * 1024 * 1024)))
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", str(500 * 1024 * 1024)))
+UPLOAD_TTL = int(os.getenv("UPLOAD_TTL", str(24 * 3600)))  # seconds an idle upload is kept
+UPLOAD_CLEANUP_INTERVAL = int(os.getenv("UPLOAD_CLEANUP_INTERVAL", "600"))
+# Bytes preallocated for uploads that are not yet deleted, across all workers and per caller
+UPLOAD_QUOTA = int(os.getenv("UPLOAD_QUOTA_MB", "4096")) * 2**20
+UPLOAD_CLIENT_QUOTA = int(os.getenv("UPLOAD_CLIENT_QUOTA_MB", "1024")) * 2**20
+UPLOAD_MIN_FREE = int(os.getenv("UPLOAD_MIN_FREE_MB", "1024")) * 2**20  # Disk left free after preallocating
+
+
+class UploadError(Exception):
+    """Invalid chunk or upload state; ``status_code`` is the HTTP status to report"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _preallocate(path: str, size: int):
+    with open(path, "wb") as f:
+        if size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError:
+                pass  # e.g. filesystems without fallocate; a sparse file works too
+        f.truncate(size)
+
+
+class UploadStore:
+    """
+    Resumable chunked uploads.
+
+    The target file is preallocated at init and each chunk is written in place
+    at its offset, so chunks may arrive out of order, in parallel or be retried
+    after a dropped connection. Which chunks have landed (and their checksums)
+    is kept in SQLite so any worker can accept the next chunk or the finalize.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS uploads (
+        id TEXT PRIMARY KEY,
+        user_id TEXT,
+        owner TEXT,
+        filename TEXT,
+        size INTEGER NOT NULL,
+        chunk_size INTEGER NOT NULL,
+        chunk_count INTEGER NOT NULL,
+        sha256 TEXT,
+        path TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'uploading',
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_uploads_expiry ON uploads(expires_at);
+
+    CREATE TABLE IF NOT EXISTS upload_chunks (
+        upload_id TEXT NOT NULL REFERENCES uploads(id) ON DELETE CASCADE,
+        chunk_index INTEGER NOT NULL,
+        sha256 TEXT NOT NULL,
+        PRIMARY KEY (upload_id, chunk_index)
+    );
+    """
+
+    def __init__(self, path: str = None, upload_dir: str = UPLOAD_DIR):
+        self.path = path
+        self.upload_dir = upload_dir
+        os.makedirs(upload_dir, exist_ok=True)
+        init_schema(self.SCHEMA, path)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(uploads)")}
+        if "owner" not in columns:
+            self.conn.execute("ALTER TABLE uploads ADD COLUMN owner TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_uploads_owner ON uploads(owner)")
+
+    @property
+    def conn(self):
+        return get_connection(self.path)
+
+    def _get(self, upload_id: str, user_id: Optional[str]):
+        row = self.conn.execute("SELECT * FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+        if row is None or row["expires_at"] < time.time():
+            raise UploadError("Upload not found or expired", 404)
+        if row["user_id"] is not None and row["user_id"] != user_id:
+            raise UploadError("Upload not found or expired", 404)
+        return row
+
+    def _received(self, upload_id: str) -> list:
+        return [r["chunk_index"] for r in self.conn.execute(
+            "SELECT chunk_index FROM upload_chunks WHERE upload_id = ? ORDER BY chunk_index", (upload_id,)
+        )]
+
+    def _describe(self, row, received: list) -> dict:
+        missing = sorted(set(range(row["chunk_count"])) - set(received))
+        return {
+            "upload_id": row["id"],
+            "filename": row["filename"],
+            "size": row["size"],
+            "chunk_size": row["chunk_size"],
+            "chunk_count": row["chunk_count"],
+            "received_chunks": len(received),
+            "missing_chunks": missing,
+            "status": row["status"],
+            "expires_at": row["expires_at"]
+        }
+
+    def init_upload(self, size: int, filename: Optional[str] = None, user_id: Optional[str] = None,
+                    chunk_size: int = UPLOAD_CHUNK_SIZE, sha256: Optional[str] = None,
+                    owner: Optional[str] = None) -> dict:
+        """
+        Reserve ``size`` bytes and preallocate the file. ``owner`` (the caller's
+        admission key: user or client address) is charged against
+        UPLOAD_CLIENT_QUOTA; every upload whose file still exists counts
+        against UPLOAD_QUOTA.
+        """
+        if size <= 0:
+            raise UploadError("Upload size must be positive")
+        if size > UPLOAD_MAX_SIZE:
+            raise UploadError(f"File size too large (max {UPLOAD_MAX_SIZE // (1024 * 1024)}MB)", 413)
+        if shutil.disk_usage(self.upload_dir).free - size < UPLOAD_MIN_FREE:
+            raise UploadError("Not enough disk space for this upload; try again later", 507)
+        chunk_size = max(64 * 1024, min(chunk_size, UPLOAD_CHUNK_SIZE * 4))
+
+        upload_id = secrets.token_urlsafe(16)
+        # Keep the container extension so ffmpeg-based readers probe it as usual
+        ext = os.path.splitext(filename or "")[1].lower()
+        if not (ext[1:].isalnum() and len(ext) <= 6):
+            ext = ".mp4"
+        path = os.path.join(self.upload_dir, upload_id + ext)
+
+        now = time.time()
+        chunk_count = -(-size // chunk_size)
+        conn = self.conn
+        with conn:
+            # The quota check and the reservation are one write transaction, so
+            # concurrent inits in other workers cannot both take the last bytes
+            conn.execute("BEGIN IMMEDIATE")
+            reserved, owned = conn.execute(
+                "SELECT COALESCE(SUM(size), 0), COALESCE(SUM(CASE WHEN owner = ? THEN size END), 0) FROM uploads",
+                (owner,)
+            ).fetchone()
+            if owner is not None and owned + size > UPLOAD_CLIENT_QUOTA:
+                raise UploadError(
+                    f"Too many unfinished uploads (max {UPLOAD_CLIENT_QUOTA // (1024 * 1024)}MB per client)", 429
+                )
+            if reserved + size > UPLOAD_QUOTA:
+                raise UploadError("Upload storage is full; try again later", 507)
+            conn.execute(
+                """
+                INSERT INTO uploads (id, user_id, owner, filename, size, chunk_size, chunk_count, sha256, path,
+                                     created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (upload_id, user_id, owner, filename, size, chunk_size, chunk_count, sha256, path,
+                 now, now + UPLOAD_TTL)
+            )
+
+        try:
+            _preallocate(path, size)
+        except OSError as e:
+            self.delete(upload_id)
+            raise UploadError(f"Could not allocate the upload: {e.strerror}", 507)
+        return self.status(upload_id, user_id)
+
+    def status(self, upload_id: str, user_id: Optional[str] = None) -> dict:
+        row = self._get(upload_id, user_id)
+        return self._describe(row, self._received(upload_id))
+
+    def chunk_bounds(self, upload_id: str, user_id: Optional[str], offset: int) -> tuple:
+        """Validate an incoming chunk's offset; returns (chunk_index, expected_length, path)"""
+        row = self._get(upload_id, user_id)
+        if row["status"] != "uploading":
+            raise UploadError("Upload already finalized", 409)
+        if offset < 0 or offset >= row["size"] or offset % row["chunk_size"]:
+            raise UploadError(f"Offset must be a multiple of {row['chunk_size']} below {row['size']}")
+        return offset // row["chunk_size"], min(row["chunk_size"], row["size"] - offset), row["path"]
+
+    def record_chunk(self, upload_id: str, chunk_index: int, sha256: str) -> dict:
+        """Mark a verified chunk as received and extend the upload's expiry"""
+        conn = self.conn
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO upload_chunks (upload_id, chunk_index, sha256) VALUES (?, ?, ?)",
+                (upload_id, chunk_index, sha256)
+            )
+            conn.execute("UPDATE uploads SET expires_at = ? WHERE id = ?", (time.time() + UPLOAD_TTL, upload_id))
+            row = conn.execute("SELECT * FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+            received = self._received(upload_id)
+        return self._describe(row, received)
+
+    def finalize(self, upload_id: str, user_id: Optional[str] = None) -> dict:
+        """
+        Check every chunk landed (and the whole-file hash, if one was declared).
+        The file stays where it is: the caller analyzes ``path`` directly and
+        calls ``delete`` afterwards.
+        """
+        row = self._get(upload_id, user_id)
+        received = self._received(upload_id)
+        if len(received) != row["chunk_count"]:
+            raise UploadError(f"Upload incomplete: {row['chunk_count'] - len(received)} chunk(s) missing", 409)
+
+        if row["sha256"]:
+            digest = hashlib.sha256()
+            with open(row["path"], "rb") as f:
+                while block := f.read(1024 * 1024):
+                    digest.update(block)
+            if digest.hexdigest() != row["sha256"].lower():
+                raise UploadError("Assembled file checksum mismatch", 422)
+
+        # Only one finalize may claim the file
+        claimed = self.conn.execute(
+            "UPDATE uploads SET status = 'finalized' WHERE id = ? AND status = 'uploading'", (upload_id,)
+        ).rowcount
+        if not claimed:
+            raise UploadError("Upload already finalized", 409)
+        return {"path": row["path"], "filename": row["filename"], "size": row["size"]}
+
+    def delete(self, upload_id: str):
+        row = self.conn.execute("SELECT path FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+        if row is None:
+            return False
+        self.conn.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
+        try:
+            os.remove(row["path"])
+        except FileNotFoundError:
+            pass
+        return True
+
+    def cleanup_expired(self) -> int:
+        """Delete expired uploads and their files; also sweeps files with no upload row"""
+        now = time.time()
+        expired = self.conn.execute("SELECT id FROM uploads WHERE expires_at < ?", (now,)).fetchall()
+        for row in expired:
+            self.delete(row["id"])
+
+        known = {os.path.basename(r["path"]) for r in self.conn.execute("SELECT path FROM uploads")}
+        for name in os.listdir(self.upload_dir):
+            file_path = os.path.join(self.upload_dir, name)
+            if name not in known and os.path.getmtime(file_path) < now - UPLOAD_TTL:
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+        return len(expired)
+
+
+def write_chunk_at(path: str, offset: int, data: bytes):
+    """Write ``data`` in place at ``offset`` of the preallocated upload file"""
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+    finally:
+        os.close(fd)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_upload_store() -> UploadStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = UploadStore()
+    return _store
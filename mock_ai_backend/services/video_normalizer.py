@@ -0,0 +1,112 @@
+# services/video_normalizer.py
+
+import logging
+import os
+import shutil
+import subprocess
+
+from services.scratch_space import ScratchQuotaExceeded, get_scratch_manager
+
+logger = logging.getLogger(__name__)
+
+# One ffmpeg pass turns any upload (1080p/4K, HEVC, VFR phone video...) into a
+# small fixed-fps proxy for the vision stages plus a 16 kHz mono WAV for speech
+VIDEO_NORMALIZE = os.getenv("VIDEO_NORMALIZE", "true").lower() in ("1", "true", "yes")
+# The landmark stages need 2 fps, but the head-pose pass (HEAD_POSE_FPS, see
+# utils/head_nod_utils.py) runs on the proxy too and must stay above the nod
+# band's Nyquist limit, so the proxy follows it: 6 fps by default, 3x the decode
+# work and proxy size of 2 fps. HEAD_POSE_FPS=0 (no nod metrics) keeps 2 fps.
+VIDEO_PROXY_FPS = float(os.getenv("VIDEO_PROXY_FPS", str(max(2.0, float(os.getenv("HEAD_POSE_FPS", "6"))))))
+VIDEO_PROXY_MAX_WIDTH = int(os.getenv("VIDEO_PROXY_MAX_WIDTH", "640"))
+VIDEO_PROXY_MAX_HEIGHT = int(os.getenv("VIDEO_PROXY_MAX_HEIGHT", "480"))
+VIDEO_NORMALIZE_TIMEOUT = float(os.getenv("VIDEO_NORMALIZE_TIMEOUT", "300"))
+
+
+def find_ffmpeg():
+    """The imageio-ffmpeg bundled binary, or ffmpeg on PATH"""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which("ffmpeg")
+
+
+class NormalizedVideo:
+    """
+    Inputs for one analysis. ``video_path`` is the proxy when normalization ran,
+    otherwise the original upload; ``audio_path`` is None when no WAV was made
+    (callers then extract audio from the video themselves).
+    """
+
+    def __init__(self, source_path: str, video_path: str = None, audio_path: str = None, work_dir=None):
+        self.source_path = source_path
+        self.video_path = video_path or source_path
+        self.audio_path = audio_path
+        self.work_dir = work_dir
+
+    @property
+    def normalized(self) -> bool:
+        return self.video_path != self.source_path
+
+    def cleanup(self):
+        if self.work_dir:
+            get_scratch_manager().release(self.work_dir)  # Removed in the background
+            self.work_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+
+def _proxy_filter(fps: float, max_width: int, max_height: int) -> str:
+    # Downscale only, keeping the aspect ratio (the old fixed 640x480 resize squashed 16:9 frames)
+    return (
+        f"fps={fps:g},"
+        f"scale=w='min({max_width},iw)':h='min({max_height},ih)':force_original_aspect_ratio=decrease"
+    )
+
+
+def normalize_video(video_path: str, fps: float = VIDEO_PROXY_FPS,
+                    max_width: int = VIDEO_PROXY_MAX_WIDTH, max_height: int = VIDEO_PROXY_MAX_HEIGHT) -> NormalizedVideo:
+    """
+    Decode the upload once and write the analysis proxy (MJPEG, cheap to seek
+    and decode with OpenCV) and the speech WAV in the same ffmpeg run.
+    Falls back to the original file when disabled or when ffmpeg is missing or fails.
+    """
+    ffmpeg = find_ffmpeg() if VIDEO_NORMALIZE else None
+    if not ffmpeg:
+        return NormalizedVideo(video_path)
+
+    # The proxy and WAV are usually well under the upload's size, so small answers land on tmpfs
+    try:
+        work_dir = get_scratch_manager().allocate("normalized", os.path.getsize(video_path))
+    except ScratchQuotaExceeded as e:
+        logger.warning(f"⚠️ {e}; analyzing the original file")
+        return NormalizedVideo(video_path)
+    proxy_path = work_dir.file("proxy.avi")
+    audio_path = work_dir.file("audio.wav")
+
+    video_output = [
+        "-map", "0:v:0", "-vf", _proxy_filter(fps, max_width, max_height),
+        "-c:v", "mjpeg", "-q:v", "4", "-an", proxy_path
+    ]
+    audio_output = ["-map", "0:a:0", "-vn", "-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le", audio_path]
+    command = [ffmpeg, "-nostdin", "-y", "-loglevel", "error", "-i", video_path]
+
+    try:
+        result = subprocess.run(command + video_output + audio_output, capture_output=True, timeout=VIDEO_NORMALIZE_TIMEOUT)
+        if result.returncode != 0:
+            # Typically a recording without an audio track: retry with the video output only
+            audio_path = None
+            result = subprocess.run(command + video_output, capture_output=True, timeout=VIDEO_NORMALIZE_TIMEOUT)
+        if result.returncode != 0 or not os.path.getsize(proxy_path):
+            raise RuntimeError(result.stderr.decode(errors="ignore").strip()[-500:])
+    except Exception as e:
+        logger.warning(f"⚠️ Video normalization failed, analyzing the original file: {e}")
+        work_dir.close()
+        return NormalizedVideo(video_path)
+
+    logger.info(f"🎞️ Normalized {os.path.basename(video_path)} → {os.path.getsize(proxy_path)} byte proxy")
+    return NormalizedVideo(video_path, proxy_path, audio_path, work_dir)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import modules the way the app does (``from services.x import ...``, cwd = mock_ai_backend)
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
@@ -0,0 +1,77 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from services import admission
+from services.admission import AdmissionController, AdmissionRejected, AdmissionSlotStore
+
+
+@pytest.fixture
+def slots(tmp_path, monkeypatch):
+    store = AdmissionSlotStore(path=str(tmp_path / "admission.db"))
+    monkeypatch.setattr(admission, "_slots", store)
+    return store
+
+
+def worker_controllers(count: int, **limits) -> list:
+    """The same endpoint class as seen by ``count`` worker processes"""
+    return [AdmissionController("analyze_single", processes=count, **limits) for _ in range(count)]
+
+
+def test_limits_are_split_between_workers():
+    controller = AdmissionController("analyze_single", max_concurrent=4, max_queue=10, processes=4)
+
+    assert controller.max_concurrent == 1
+    assert controller.max_queue == 3
+    assert AdmissionController("analyze_interview", max_concurrent=1, max_queue=2, processes=4).max_concurrent == 1
+
+
+def test_per_user_limit_holds_across_workers(slots):
+    first, second = worker_controllers(2, max_concurrent=4, max_queue=4, per_user_limit=2)
+
+    async def scenario():
+        async with first.admit("user:a"), second.admit("user:a"):
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with second.admit("user:a"):
+                    pass
+            assert rejected.value.status_code == 429
+            assert (await first.precheck_response("user:a")).status_code == 429
+            assert await first.precheck_response("user:b") is None
+        assert slots.held("analyze_single", "user:a") == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_request_returns_its_slot(slots):
+    controller = worker_controllers(2, max_concurrent=2, max_queue=2)[0]
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hold():
+            async with controller.admit("user:a"):
+                started.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(hold())
+        await started.wait()
+        assert slots.held("analyze_single", "user:a") == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert slots.held("analyze_single", "user:a") == 0
+
+    asyncio.run(scenario())
+
+
+def test_slots_of_dead_workers_are_reclaimed(slots):
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    slots.conn.execute(
+        "INSERT INTO admission_slots VALUES ('stale', 'analyze_single', 'user:a', ?, 0)", (exited.pid,)
+    )
+
+    assert slots.acquire("analyze_single", "user:a", 1) is not None
+    assert slots.held("analyze_single", "user:a") == 1
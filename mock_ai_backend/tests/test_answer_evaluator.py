@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("sklearn")
+
+from script.evaluate_tiered_scorer import FIXTURES_PATH, load_fixtures, replay
+from services.answer_evaluator import EVALUATION_ROUTING_THRESHOLD, ReferenceAnswerStore, question_key
+
+
+@pytest.fixture(scope="module")
+def fixtures():
+    return load_fixtures(FIXTURES_PATH)
+
+
+def test_replay_with_reference_answers(fixtures):
+    report = replay(fixtures, EVALUATION_ROUTING_THRESHOLD)
+
+    assert report["llm_call_rate"] <= 0.5
+    assert report["status_agreement"] >= 0.9
+
+
+def test_replay_without_reference_answers(fixtures):
+    report = replay(fixtures, EVALUATION_ROUTING_THRESHOLD, use_references=False)
+
+    # Only off-topic and too-short answers are trusted without a reference, and those must agree
+    assert report["resolved_locally"] > 0
+    assert report["llm_call_rate"] < 1.0
+    assert report["status_agreement"] == 1.0
+
+
+def test_reference_lookup_ignores_numbering_and_spacing(tmp_path):
+    store = ReferenceAnswerStore(path=str(tmp_path / "references.db"))
+    store.put_many([
+        ("2.  How do you find and fix a slow database query?", "Use EXPLAIN and add an index."),
+        ("3. How would you test a web service?", None),
+    ])
+
+    assert store.get("How do you find and fix a  slow database query?") == "Use EXPLAIN and add an index."
+    assert store.get("How would you test a web service?") is None
+    assert question_key("1) What is REST?") == question_key("what is rest?")
+
+
+def test_generated_questions_carry_reference_answers():
+    question_generator = pytest.importorskip("services.question_generator")
+    text = (
+        "1. What is a Python list?\n"
+        "Answer: A mutable sequence.\n"
+        "\n"
+        "2. Tell me about a conflict you resolved?\n"
+        "**Answer:** We compared prototypes.\n"
+        "3. Why this company?"
+    )
+
+    assert question_generator.parse_questions(text) == [
+        ("1. What is a Python list?", "A mutable sequence."),
+        ("2. Tell me about a conflict you resolved?", "We compared prototypes."),
+        ("3. Why this company?", None),
+    ]
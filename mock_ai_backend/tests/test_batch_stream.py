@@ -0,0 +1,51 @@
+import asyncio
+import os
+
+import pytest
+
+from services.batch_stream import BatchStreamError, MultipartVideoStream
+
+
+class StreamedRequest:
+    """The parts of a Starlette request MultipartVideoStream reads, sending the body in small chunks"""
+
+    def __init__(self, body: bytes, chunk_size: int = 7000):
+        self.headers = {"content-type": "multipart/form-data; boundary=xx"}
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def stream(self):
+        for i in range(0, len(self.body), self.chunk_size):
+            yield self.body[i:i + self.chunk_size]
+
+
+def multipart(*parts) -> bytes:
+    body = b""
+    for name, value, filename in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        body += f"--xx\r\nContent-Disposition: {disposition}\r\n\r\n".encode() + value + b"\r\n"
+    return body + b"--xx--\r\n"
+
+
+def collect(request, dest_dir, max_file_size=10**6):
+    async def run():
+        return [event async for event in MultipartVideoStream(request, dest_dir, max_file_size).events()]
+    return asyncio.run(run())
+
+
+def test_file_parts_are_complete_on_disk_when_reported(tmp_path):
+    video = os.urandom(100_000)
+    events = collect(StreamedRequest(multipart(("question", b"Why?", None), ("videos", video, "a.mp4"))), tmp_path)
+
+    assert events[0] == ("field", "question", "Why?")
+    kind, name, filename, path, size = events[1]
+    assert (kind, filename, size) == ("file", "a.mp4", len(video))
+    with open(path, "rb") as f:
+        assert f.read() == video
+
+
+def test_oversized_file_is_rejected(tmp_path):
+    with pytest.raises(BatchStreamError) as rejected:
+        collect(StreamedRequest(multipart(("videos", b"v" * 50_000, "a.mp4"))), tmp_path, max_file_size=10_000)
+
+    assert rejected.value.status_code == 413
@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tf2onnx")
+keras = pytest.importorskip("keras")
+
+from script.export_emotion_model_onnx import (  # noqa: E402
+    INPUT_SHAPE,
+    INT8_MIN_AGREEMENT,
+    PARITY_TOLERANCE,
+    check_parity,
+    export_to_onnx,
+    keras_model_path,
+    load_calibration_images,
+    onnx_model_path,
+    quantize_int8
+)
+
+# Real face crops (the training set's test split) when available
+PARITY_FACES_DIR = os.getenv(
+    "EMOTION_PARITY_FACES",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'facial_emotion', 'test'))
+)
+QUANTIZED_OPS = {"QuantizeLinear", "DequantizeLinear", "DynamicQuantizeLinear", "MatMulInteger", "ConvInteger"}
+
+# The shipped weights are checked only where they exist; the tiny model tests exercise the export everywhere
+needs_artifacts = pytest.mark.skipif(
+    not (os.path.exists(keras_model_path) and os.path.exists(onnx_model_path)),
+    reason="facial_emotion_model.h5 / .onnx not present"
+)
+
+
+def drawn_faces(count: int = 32) -> np.ndarray:
+    """Fixed 48x48 face sketches with varying brows, eyes and mouth, plus seeded sensor noise"""
+    cv2 = pytest.importorskip("cv2")
+    rng = np.random.default_rng(0)
+    faces = []
+    for i in range(count):
+        face = np.full(INPUT_SHAPE[:2], 40, dtype=np.uint8)
+        cv2.ellipse(face, (24, 25), (16, 20), 0, 0, 360, 170, -1)
+        eye = 1 + i % 3
+        cv2.circle(face, (17, 20), eye, 30, -1)
+        cv2.circle(face, (31, 20), eye, 30, -1)
+        brow = (i % 5 - 2) * 2
+        cv2.line(face, (12, 15 + brow), (21, 15 - brow), 60, 1)
+        cv2.line(face, (27, 15 - brow), (36, 15 + brow), 60, 1)
+        # Mouth from frown through neutral to smile and open
+        start, end = (0, 180) if i % 4 < 2 else (180, 360)
+        cv2.ellipse(face, (24, 34), (7, 1 + i % 4 * 2), 0, start, end, 50, 1 + i % 2)
+        noise = rng.normal(0, 6, face.shape)
+        faces.append(np.clip(face + noise, 0, 255).astype(np.uint8))
+    return np.stack(faces).reshape(-1, *INPUT_SHAPE).astype(np.float32) / 255.0
+
+
+@pytest.fixture(scope="module")
+def face_crops() -> np.ndarray:
+    if os.path.isdir(PARITY_FACES_DIR):
+        return load_calibration_images(PARITY_FACES_DIR, limit=256)
+    return drawn_faces()
+
+
+@pytest.fixture(scope="module")
+def random_crops() -> np.ndarray:
+    return np.random.default_rng(0).random((64, *INPUT_SHAPE), dtype=np.float32)
+
+
+@pytest.fixture(scope="module")
+def keras_model():
+    from keras.models import load_model
+    return load_model(keras_model_path)
+
+
+@pytest.fixture(scope="module")
+def tiny_model(random_crops):
+    """A small conv net with the emotion model's input and 7-way softmax, briefly fit so its predictions are decisive"""
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input(shape=INPUT_SHAPE),
+        keras.layers.Conv2D(4, 3, activation="relu"),
+        keras.layers.MaxPooling2D(4),
+        keras.layers.Flatten(),
+        keras.layers.Dense(7, activation="softmax")
+    ])
+    # Labels from the mean brightness of each crop, so the classes are learnable
+    brightness = random_crops.mean(axis=(1, 2, 3))
+    labels = np.searchsorted(np.quantile(brightness, np.linspace(0, 1, 8)[1:-1]), brightness)
+    model.compile(optimizer=keras.optimizers.Adam(0.01), loss="sparse_categorical_crossentropy")
+    model.fit(random_crops, labels, epochs=20, verbose=0)
+    return model
+
+
+@pytest.fixture(scope="module")
+def tiny_onnx(tiny_model, tmp_path_factory) -> str:
+    path = str(tmp_path_factory.mktemp("onnx") / "tiny.onnx")
+    export_to_onnx(tiny_model, path)
+    return path
+
+
+def is_quantized(path: str) -> bool:
+    import onnx
+    return any(node.op_type in QUANTIZED_OPS for node in onnx.load(path).graph.node)
+
+
+def test_export_matches_keras_probabilities(tiny_model, tiny_onnx, random_crops):
+    parity = check_parity(tiny_model, tiny_onnx, random_crops)
+
+    assert not is_quantized(tiny_onnx)
+    assert parity["max_abs_diff"] <= PARITY_TOLERANCE
+    assert parity["argmax_agreement"] == 1.0
+
+
+def test_int8_export_keeps_predictions(tiny_model, tiny_onnx, random_crops, tmp_path):
+    int8_path = str(tmp_path / "tiny.int8.onnx")
+    quantize_int8(tiny_onnx, int8_path)
+    parity = check_parity(tiny_model, int8_path, random_crops)
+
+    assert is_quantized(int8_path)
+    assert parity["argmax_agreement"] >= INT8_MIN_AGREEMENT
+
+
+@needs_artifacts
+def test_onnx_matches_keras_probabilities(keras_model, face_crops):
+    parity = check_parity(keras_model, onnx_model_path, face_crops)
+
+    if is_quantized(onnx_model_path):
+        assert parity["argmax_agreement"] >= INT8_MIN_AGREEMENT
+    else:
+        assert parity["max_abs_diff"] <= PARITY_TOLERANCE
+        assert parity["argmax_agreement"] == 1.0
+
+
+@needs_artifacts
+def test_onnx_batches_like_single_crops(face_crops):
+    pytest.importorskip("mediapipe")
+    from script.predict_emotion import OnnxEmotionModel
+
+    model = OnnxEmotionModel(onnx_model_path)
+    batched = model.predict(face_crops[:8])
+    single = np.concatenate([model.predict(face_crops[i:i + 1]) for i in range(8)])
+
+    assert np.allclose(batched, single, atol=1e-5)
+    assert np.allclose(batched.sum(axis=1), 1.0, atol=1e-3)
@@ -0,0 +1,97 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from services.video_normalizer import VIDEO_PROXY_FPS  # noqa: E402
+from utils.head_nod_utils import (  # noqa: E402
+    CHIN,
+    FOREHEAD,
+    HEAD_POSE_FPS,
+    LEFT_EYE,
+    MAX_ANALYZED_SECONDS,
+    NOSE_TIP,
+    RIGHT_EYE,
+    HeadMotionAnalyzer
+)
+
+FACE_HEIGHT = 0.4
+
+
+def face_results(nose_y: float):
+    landmarks = [SimpleNamespace(x=0.5, y=0.5) for _ in range(468)]
+    landmarks[FOREHEAD] = SimpleNamespace(x=0.5, y=0.3)
+    landmarks[CHIN] = SimpleNamespace(x=0.5, y=0.3 + FACE_HEIGHT)
+    landmarks[LEFT_EYE] = SimpleNamespace(x=0.4, y=0.45)
+    landmarks[RIGHT_EYE] = SimpleNamespace(x=0.6, y=0.45)
+    landmarks[NOSE_TIP] = SimpleNamespace(x=0.5, y=nose_y)
+    return SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=landmarks)])
+
+
+def pipeline_pose_rate() -> float:
+    """Head-pose sampling rate of analyze_video on a normalized proxy"""
+    return VIDEO_PROXY_FPS / max(1, round(VIDEO_PROXY_FPS / HEAD_POSE_FPS))
+
+
+def nodding(analyzer, rate: float, seconds: float, hz: float = 1.0, amplitude: float = 0.02, missing=()):
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        results = None if any(a <= t < b for a, b in missing) else face_results(
+            0.55 + amplitude * math.sin(2 * math.pi * hz * t)
+        )
+        analyzer.track(results, t)
+
+
+def test_one_hertz_nod_at_pipeline_rate():
+    rate = pipeline_pose_rate()
+    analyzer = HeadMotionAnalyzer(sample_rate=rate)
+    nodding(analyzer, rate, seconds=20)
+
+    summary = analyzer.summary()
+    assert summary["nod_frequency"] == pytest.approx(1.0, abs=0.1)
+    assert summary["nod_amplitude"] == pytest.approx(0.02 / FACE_HEIGHT, rel=0.2)
+
+
+def test_face_loss_gap_does_not_skew_frequency():
+    rate = pipeline_pose_rate()
+    analyzer = HeadMotionAnalyzer(sample_rate=rate)
+    nodding(analyzer, rate, seconds=30, missing=[(8.0, 14.0)])
+
+    assert analyzer.summary()["nod_frequency"] == pytest.approx(1.0, abs=0.15)
+
+
+def test_series_covers_the_whole_analyzed_recording():
+    rate = pipeline_pose_rate()
+    analyzer = HeadMotionAnalyzer(sample_rate=rate)
+    nodding(analyzer, rate, seconds=MAX_ANALYZED_SECONDS)
+
+    assert analyzer.times[0] == 0.0
+    assert len(analyzer.times) == int(MAX_ANALYZED_SECONDS * rate)
+
+
+def test_still_head_has_no_nods():
+    rate = pipeline_pose_rate()
+    analyzer = HeadMotionAnalyzer(sample_rate=rate)
+    nodding(analyzer, rate, seconds=20, amplitude=0.0)
+
+    assert analyzer.summary()["nod_amplitude"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_sparse_sampling_is_not_reported():
+    # One analyzed frame every 2 s cannot resolve the nod band
+    analyzer = HeadMotionAnalyzer(sample_rate=0.5)
+    nodding(analyzer, 0.5, seconds=120)
+
+    assert analyzer.summary() == {"nod_frequency": None, "nod_amplitude": None}
+
+
+def test_update_scores_movement_between_analyzed_frames():
+    analyzer = HeadMotionAnalyzer()
+    assert analyzer.update(face_results(0.55), 0.0) == 0.0
+    analyzer.track(face_results(0.60), 1.0)
+    assert analyzer.update(face_results(0.551), 2.0) == 0.0
+    assert analyzer.update(face_results(0.60), 4.0) == 1.0
+    assert analyzer.update(None, 6.0) == 0.0
@@ -0,0 +1,35 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.model_registry import ModelRegistry, SerializedGraph
+
+
+class RecordingGraph:
+    """Stands in for a MediaPipe graph and records how many frames it processed at once"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def process(self, image):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        return image
+
+
+def test_shared_graph_processes_one_frame_at_a_time():
+    graph = RecordingGraph()
+    registry = ModelRegistry()
+    registry.register("face_mesh", lambda: SerializedGraph(graph))
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(lambda i: registry.get("face_mesh").process(i), range(12)))
+
+    assert results == list(range(12))
+    assert graph.max_active == 1
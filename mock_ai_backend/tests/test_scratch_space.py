@@ -0,0 +1,17 @@
+import pytest
+
+from services.scratch_space import SCRATCH_DISK_QUOTA, TIER_DISK, ScratchManager, ScratchQuotaExceeded
+
+
+def test_disk_quota_is_split_between_processes(tmp_path):
+    manager = ScratchManager(disk_dir=str(tmp_path / "disk"), shm_dir=None, processes=4)
+    share = SCRATCH_DISK_QUOTA // 4
+
+    scratch = manager.allocate("request", share)
+    assert scratch.tier == TIER_DISK
+    with pytest.raises(ScratchQuotaExceeded):
+        manager.allocate("request", 1)
+
+    manager.release(scratch)
+    manager.release(manager.allocate("request", share))
+    manager.wait_idle()
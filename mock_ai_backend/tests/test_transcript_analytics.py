@@ -0,0 +1,51 @@
+import pytest
+
+from services.transcript_analytics import analyze_transcript, normalize_keywords, speech_feedback
+
+
+@pytest.mark.parametrize("transcript", [
+    "I have worked with languages like Python and frameworks like Django for three years",
+    "It actually worked better than the old version did",
+    "I would like to join a team that looks like this one",
+    "We moved the ER triage dashboard to a new service",
+    "The script prints ah and er when the parser fails",
+])
+def test_ordinary_words_are_not_fillers(transcript):
+    analytics = analyze_transcript(transcript)
+
+    assert analytics["filler_count"] == 0
+    assert "Frequent filler words" not in " ".join(speech_feedback(analytics)["weaknesses"])
+
+
+@pytest.mark.parametrize("transcript, filler, count", [
+    ("So, like, I built the API myself", "like", 1),
+    ("Like I said the cache was the problem", "like", 1),
+    ("It was like like really slow", "like", 1),
+    ("Actually, the tests caught it first", "actually", 1),
+    ("Er, I think it was Redis. Ah, no, Memcached", "uh", 2),
+    ("Um I think uh it was in Python", "um", 1),
+])
+def test_fillers_in_filler_contexts(transcript, filler, count):
+    assert analyze_transcript(transcript)["fillers"].get(filler) == count
+
+
+def test_filler_rate_counts_only_real_fillers():
+    analytics = analyze_transcript("Um, I used languages like Python, and, like, uh, some Go")
+
+    assert analytics["fillers"] == {"um": 1, "like": 1, "uh": 1}
+    assert analytics["word_count"] == 11
+
+
+def test_keywords_keep_symbols():
+    assert normalize_keywords(["C++", "C#", ".NET", "Node.js", "Python,", "REST APIs."]) == [
+        "c++", "c#", ".net", "node.js", "python", "rest apis"
+    ]
+
+
+def test_symbol_keywords_match_only_themselves():
+    keywords = ["C++", "C#", ".NET", "Node.js"]
+
+    assert analyze_transcript("I wrote plan c and then used node js", 10, keywords)["keywords"]["matched"] == []
+    assert analyze_transcript(
+        "I wrote C++ and C# services on .NET with Node.js.", 10, keywords
+    )["keywords"]["matched"] == ["c++", "c#", ".net", "node.js"]
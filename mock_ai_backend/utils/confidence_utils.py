@@ -1,28 +1,31 @@
-from deepface import DeepFace
 import cv2
 import numpy as np
 import mediapipe as mp
 
+from script.predict_emotion import predict_emotion_probabilities, probabilities_to_emotions
+from services.model_registry import registry
+
 import os
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Suppress TensorFlow logs
 
 
-# Initialize MediaPipe Pose (if not already done)
+# MediaPipe Pose for standalone calls is loaded on first use through the registry
+# (single-frame mode, one frame at a time across the analysis threads)
 mp_pose = mp.solutions.pose
-pose = mp_pose.Pose(static_image_mode=False, model_complexity=1)
 
-def estimate_confidence(frame) -> float:
+def estimate_confidence(frame, pose_results=None, emotions=None) -> float:
     """Estimate confidence based on multiple factors"""
     try:
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Get emotion analysis
-        analysis = DeepFace.analyze(img_path=rgb_frame, actions=['emotion'], enforce_detection=False)
-        emotions = analysis[0]['emotion']
+        # Emotion percentages come from the batched face-emotion stage in analyze_video;
+        # standalone calls fall back to the emotion model on the whole frame
+        if emotions is None:
+            gray = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (48, 48))
+            emotions = probabilities_to_emotions(predict_emotion_probabilities([gray], [frame])[0])
         
-        # Get pose landmarks
-        pose_results = pose.process(rgb_frame)
+        # Get pose landmarks (reuse tracked results from the per-video FaceTracker when available)
+        if pose_results is None:
+            pose_results = registry.get("confidence_pose").process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
         
         confidence_score = 0.0
         
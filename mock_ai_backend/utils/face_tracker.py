@@ -0,0 +1,183 @@
+import cv2
+import mediapipe as mp
+
+import os
+
+from utils.frame_buffers import BufferPool
+
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Suppress TensorFlow logs
+
+mp_face_mesh = mp.solutions.face_mesh
+mp_face_detection = mp.solutions.face_detection
+mp_hands = mp.solutions.hands
+mp_pose = mp.solutions.pose
+
+# First-stage BlazeFace (short-range) runs on a frame downscaled to this width
+FACE_DETECTOR_WIDTH = int(os.getenv("FACE_DETECTOR_WIDTH", "320"))
+# Landmark sets FaceMesh may return when several faces are in view
+MAX_TRACKED_FACES = int(os.getenv("MAX_TRACKED_FACES", "3"))
+
+FACE_ABSENT = "absent"
+FACE_PRESENT = "present"
+FACE_MULTIPLE = "multiple"
+
+
+class PrimaryFaceResults:
+    """FaceMesh-shaped results holding only the primary face, so estimators reading
+    ``multi_face_landmarks[0]`` never pick up a bystander"""
+
+    def __init__(self, face_landmarks):
+        self.multi_face_landmarks = [face_landmarks]
+
+
+class TrackedFrame:
+    """Landmark results for one frame, shared by all per-frame estimators"""
+
+    def __init__(self, face_results, hand_results, pose_results, face_count: int = 1):
+        self.face_results = face_results
+        self.hand_results = hand_results
+        self.pose_results = pose_results
+        self.face_count = face_count
+
+    @property
+    def face_landmarks(self):
+        if self.face_results is not None and self.face_results.multi_face_landmarks:
+            return self.face_results.multi_face_landmarks[0]
+        return None
+
+    @property
+    def face_status(self) -> str:
+        if self.face_landmarks is None:
+            return FACE_ABSENT
+        return FACE_MULTIPLE if self.face_count > 1 else FACE_PRESENT
+
+
+class FaceTracker:
+    """
+    Per-video MediaPipe graphs running in tracking (video) mode.
+
+    Frames must be fed in order. After the first detection the face ROI from
+    the previous frame is reused, and full detection only runs again once the
+    tracking confidence drops below ``min_tracking_confidence``. Create one
+    tracker per request so videos never share tracking state.
+
+    A cheap BlazeFace pass on a downscaled frame gates the face graphs: frames
+    without a face skip FaceMesh entirely (face_results is None), and when
+    several faces are in view only the largest (primary) one is returned.
+
+    The RGB conversion and the detector's downscaled frame are written into
+    buffers reused across frames; the RGB frame is converted once and shared
+    read-only by every graph.
+    """
+
+    def __init__(self, min_detection_confidence: float = 0.5, min_tracking_confidence: float = 0.5):
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.buffers = BufferPool()
+        self.face_detector = mp_face_detection.FaceDetection(
+            model_selection=0,  # Short-range model: faces within ~2m, as in interview recordings
+            min_detection_confidence=min_detection_confidence
+        )
+        self.multi_face_mesh = None  # Created the first time several faces show up
+        self.face_mesh = mp_face_mesh.FaceMesh(
+            static_image_mode=False,
+            max_num_faces=1,
+            refine_landmarks=True,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        self.hands = mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=2,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        self.pose = mp_pose.Pose(
+            static_image_mode=False,
+            model_complexity=1,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def _to_rgb(self, frame, name: str):
+        """BGR -> RGB into the named reusable buffer, marked read-only so MediaPipe can use it without a copy"""
+        dst = self.buffers.get(name, frame.shape)
+        if dst is not None:
+            dst.flags.writeable = True
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=dst)
+        rgb.flags.writeable = False
+        return rgb
+
+    def detect_faces(self, frame) -> list:
+        """Relative bounding boxes (xmin, ymin, width, height) of faces in a BGR frame, largest first"""
+        h, w = frame.shape[:2]
+        if w > FACE_DETECTOR_WIDTH:
+            size = (FACE_DETECTOR_WIDTH, max(1, int(h * FACE_DETECTOR_WIDTH / w)))
+            frame = cv2.resize(frame, size, dst=self.buffers.get("detector_bgr", (size[1], size[0], 3)),
+                               interpolation=cv2.INTER_AREA)
+        results = self.face_detector.process(self._to_rgb(frame, "detector_rgb"))
+        boxes = [
+            (box.xmin, box.ymin, box.width, box.height)
+            for box in (d.location_data.relative_bounding_box for d in results.detections or [])
+        ]
+        return sorted(boxes, key=lambda b: b[2] * b[3], reverse=True)
+
+    def _primary_face(self, rgb_frame, primary_box):
+        """Landmarks of the face closest to the primary detection when several are in view"""
+        if self.multi_face_mesh is None:
+            self.multi_face_mesh = mp_face_mesh.FaceMesh(
+                static_image_mode=False,
+                max_num_faces=MAX_TRACKED_FACES,
+                refine_landmarks=True,
+                min_detection_confidence=self.min_detection_confidence,
+                min_tracking_confidence=self.min_tracking_confidence
+            )
+        results = self.multi_face_mesh.process(rgb_frame)
+        if not results.multi_face_landmarks:
+            return None
+
+        cx = primary_box[0] + primary_box[2] / 2
+        cy = primary_box[1] + primary_box[3] / 2
+
+        def distance(face_landmarks):
+            nose = face_landmarks.landmark[1]
+            return (nose.x - cx) ** 2 + (nose.y - cy) ** 2
+
+        return PrimaryFaceResults(min(results.multi_face_landmarks, key=distance))
+
+    def process(self, frame) -> TrackedFrame:
+        """Run all landmark graphs on a BGR frame (frames must arrive in order)"""
+        faces = self.detect_faces(frame)
+        rgb_frame = self._to_rgb(frame, "rgb")
+
+        if not faces:
+            face_results = None  # No face: skip FaceMesh and every face-dependent analyzer
+        elif len(faces) == 1:
+            face_results = self.face_mesh.process(rgb_frame)
+        else:
+            face_results = self._primary_face(rgb_frame, faces[0])
+
+        return TrackedFrame(
+            face_results=face_results,
+            hand_results=self.hands.process(rgb_frame),
+            pose_results=self.pose.process(rgb_frame),
+            face_count=len(faces)
+        )
+
+    def track_face(self, frame):
+        """FaceMesh alone on a BGR frame (no detector gate, hands or pose): cheap dense head-pose sampling"""
+        return self.face_mesh.process(self._to_rgb(frame, "rgb"))
+
+    def close(self):
+        self.face_detector.close()
+        if self.multi_face_mesh is not None:
+            self.multi_face_mesh.close()
+        self.face_mesh.close()
+        self.hands.close()
+        self.pose.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,32 +1,20 @@
 # utils/facial_emotion_utils.py
 
-from deepface import DeepFace
-import cv2
+from collections import Counter
 
-def analyze_facial_emotions(video_path):
-    cap = cv2.VideoCapture(video_path)
-    emotions = []
-
-    frame_interval = 10  # Process every 10th frame
-    frame_count = 0
+from services.emotion_detector import detect_video_emotions
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        if frame_count % frame_interval == 0:
-            try:
-                analysis = DeepFace.analyze(frame, actions=['emotion'], enforce_detection=False)
-                if isinstance(analysis, list):
-                    emotions.append(analysis[0]['dominant_emotion'])
-                else:
-                    emotions.append(analysis['dominant_emotion'])
-            except Exception as e:
-                print(f"DeepFace error: {e}")
-        frame_count += 1
+def analyze_facial_emotions(video_path):
+    """Most frequent emotion over every 10th frame, from the configured emotion backend ("N/A" if none)"""
+    try:
+        scored = detect_video_emotions(video_path, frame_interval=10)
+    except ValueError as e:
+        # Unreadable video: same answer as a video without a detected face
+        print(f"Facial emotion error: {e}")
+        return "N/A"
 
-    cap.release()
+    emotions = [max(scores, key=scores.get) for scores in scored]
     if not emotions:
         return "N/A"
 
-    return max(set(emotions), key=emotions.count)
+    return Counter(emotions).most_common(1)[0][0]
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+
+# Reuse decode/resize/color-conversion buffers across frames instead of
+# allocating new arrays per frame (FRAME_BUFFER_REUSE=false restores the old
+# allocate-per-call behaviour, e.g. for benchmarking)
+FRAME_BUFFER_REUSE = os.getenv("FRAME_BUFFER_REUSE", "true").lower() in ("1", "true", "yes")
+FRAME_RING_SIZE = int(os.getenv("FRAME_RING_SIZE", "4"))
+
+
+class BufferPool:
+    """
+    Named, preallocated destination arrays for OpenCV ``dst=`` parameters.
+
+    ``get`` returns the same array for a name as long as the requested shape
+    and dtype match, so a per-video pool allocates once per frame size. When
+    reuse is disabled it returns None, which makes OpenCV allocate as usual.
+    """
+
+    def __init__(self, enabled: bool = None):
+        self.enabled = FRAME_BUFFER_REUSE if enabled is None else enabled
+        self._buffers = {}
+
+    def get(self, name: str, shape: tuple, dtype=np.uint8):
+        if not self.enabled:
+            return None
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self._buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    @property
+    def nbytes(self) -> int:
+        return sum(b.nbytes for b in self._buffers.values())
+
+
+class FrameRing:
+    """
+    Fixed-size ring of decode buffers for cv2.VideoCapture.
+
+    Frame ``i`` is decoded into slot ``i % size``, so a decoded frame stays
+    valid until ``size - 1`` further frames have been read. Anything kept
+    longer (e.g. frames handed to an emotion backend) must be copied.
+    """
+
+    def __init__(self, size: int = FRAME_RING_SIZE, enabled: bool = None):
+        self.enabled = FRAME_BUFFER_REUSE if enabled is None else enabled
+        self.slots = [None] * max(1, size)
+        self._index = 0
+
+    def _next_slot(self) -> int:
+        index = self._index
+        self._index = (index + 1) % len(self.slots)
+        return index
+
+    def _store(self, index: int, ret: bool, frame):
+        if ret and self.enabled:
+            self.slots[index] = frame
+        return ret, frame
+
+    def read(self, cap):
+        """cap.read() into the next ring slot"""
+        index = self._next_slot()
+        slot = self.slots[index]
+        return self._store(index, *(cap.read(slot) if slot is not None else cap.read()))
+
+    def retrieve(self, cap):
+        """cap.retrieve() (after cap.grab()) into the next ring slot"""
+        index = self._next_slot()
+        slot = self.slots[index]
+        return self._store(index, *(cap.retrieve(slot) if slot is not None else cap.retrieve()))
+
+
+class CropBatch:
+    """Growable (N, size, size) uint8 array that face crops are written into directly"""
+
+    def __init__(self, size: int = 48, capacity: int = 64):
+        self.size = size
+        self.data = np.empty((max(1, capacity), size, size), dtype=np.uint8)
+        self.count = 0
+
+    def next_slot(self) -> np.ndarray:
+        """Destination for the next crop; call ``commit`` once it has been written"""
+        if self.count == len(self.data):
+            grown = np.empty((len(self.data) * 2, self.size, self.size), dtype=np.uint8)
+            grown[:self.count] = self.data
+            self.data = grown
+        return self.data[self.count]
+
+    def commit(self, written: np.ndarray = None):
+        """Keep the slot; ``written`` is what the dst-taking call returned (copied in if
+        OpenCV allocated a new array instead of filling the slot)"""
+        slot = self.data[self.count]
+        if written is not None and not np.shares_memory(written, slot):
+            slot[...] = written
+        self.count += 1
+
+    def array(self) -> np.ndarray:
+        return self.data[:self.count]
+
+    def __len__(self):
+        return self.count
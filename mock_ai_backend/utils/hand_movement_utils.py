@@ -3,9 +3,11 @@ import mediapipe as mp
 
 mp_hands = mp.solutions.hands
 
-def estimate_hand_movement(frame) -> float:
-    with mp_hands.Hands(static_image_mode=True, max_num_hands=2) as hands:
-        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        if results.multi_hand_landmarks:
-            return 1.0  # Hand movement detected
-        return 0.0
+def estimate_hand_movement(frame, hand_results=None) -> float:
+    # Reuse tracked landmarks from the per-video FaceTracker when available
+    if hand_results is None:
+        with mp_hands.Hands(static_image_mode=True, max_num_hands=2) as hands:
+            hand_results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    if hand_results.multi_hand_landmarks:
+        return 1.0  # Hand movement detected
+    return 0.0
@@ -1,20 +1,143 @@
+import math
+import os
+
 import mediapipe as mp
 import cv2
+import numpy as np
+from collections import deque
+from scipy import signal
 
 mp_face_mesh = mp.solutions.face_mesh
-prev_nose_y = None
-
-def estimate_head_nod(frame) -> float:
-    global prev_nose_y
-    with mp_face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1) as face_mesh:
-        results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        if results.multi_face_landmarks:
-            nose = results.multi_face_landmarks[0].landmark[1]  # Nose tip
-            current_y = nose.y
-            if prev_nose_y is not None:
-                delta = abs(current_y - prev_nose_y)
-                prev_nose_y = current_y
-                if delta > 0.015:  # Threshold for nodding motion
-                    return 1.0
-            prev_nose_y = current_y
-    return 0.0
+
+# FaceMesh landmark indices used for the pitch proxy
+NOSE_TIP = 1
+FOREHEAD = 10
+CHIN = 152
+LEFT_EYE = 33
+RIGHT_EYE = 263
+
+NOD_DELTA_THRESHOLD = 0.015  # Nose movement between analyzed frames counted as nodding
+NOD_BAND_HZ = (0.5, 3.0)     # Typical head nod frequency band
+
+# Rate of the pose-only pass that feeds the nod series. The analyzed frames (one
+# every 2 s) are far too sparse to resolve the nod band, so recordings are also
+# sampled for head pose alone at this rate (0 disables the pass)
+HEAD_POSE_FPS = float(os.getenv("HEAD_POSE_FPS", "6"))
+MIN_NOD_SAMPLE_RATE = 4.0    # Nyquist at 2 Hz: resolves the common 0.5-2 Hz nods
+MIN_NOD_SAMPLES = 16         # Shortest series the band-pass filter can run on
+MAX_GAP_STEPS = 2.5          # Samples further apart than this (face lost) leave a gap
+# Longest stretch the nod series covers: analyze_video stops after 60 analyzed
+# frames, one every 2 s. Longer inputs (live streams) pass their own limit.
+MAX_ANALYZED_SECONDS = 120.0
+
+
+class HeadMotionAnalyzer:
+    """
+    Per-video head motion state.
+
+    Keeps a ring buffer of timestamped pitch positions for one video so nod
+    detection never compares frames from different videos or requests. Create
+    one analyzer per video; instances share nothing and are safe to use from
+    parallel workers.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, max_seconds: float = MAX_ANALYZED_SECONDS):
+        # Nominal rate, only used to place samples that come without a timestamp
+        self.sample_rate = max(float(sample_rate), 1e-6)
+        # Room for the whole recording at the densest rate samples arrive at
+        buffer_size = math.ceil(max_seconds * max(self.sample_rate, HEAD_POSE_FPS)) + 1
+        self.times = deque(maxlen=buffer_size)
+        self.pitch = deque(maxlen=buffer_size)
+        self.last_scored_nose_y = None
+
+    def _add(self, face_results, t: float = None):
+        """Buffer one frame's pitch; returns the nose height, or None without a face"""
+        if face_results is None or not face_results.multi_face_landmarks:
+            return None
+
+        landmarks = face_results.multi_face_landmarks[0].landmark
+        nose = landmarks[NOSE_TIP]
+        eye_y = (landmarks[LEFT_EYE].y + landmarks[RIGHT_EYE].y) / 2
+        face_height = abs(landmarks[CHIN].y - landmarks[FOREHEAD].y)
+
+        # Nose-below-eyes distance relative to face height rises and falls with pitch
+        pitch = (nose.y - eye_y) / face_height if face_height > 0 else 0.0
+
+        if t is None:
+            t = self.times[-1] + 1.0 / self.sample_rate if self.times else 0.0
+        if not self.times or t > self.times[-1]:
+            self.times.append(float(t))
+            self.pitch.append(pitch)
+        return nose.y
+
+    def track(self, face_results, t: float = None):
+        """Add a pose-only sample (a frame between the analyzed ones) to the nod series"""
+        self._add(face_results, t)
+
+    def update(self, face_results, t: float = None) -> float:
+        """Add an analyzed frame's landmarks; returns 1.0 if the head moved enough since the last one to count as a nod"""
+        nose_y = self._add(face_results, t)
+        if nose_y is None:
+            return 0.0
+
+        moved = self.last_scored_nose_y is not None and abs(nose_y - self.last_scored_nose_y) > NOD_DELTA_THRESHOLD
+        self.last_scored_nose_y = nose_y
+        return 1.0 if moved else 0.0
+
+    def _resampled_pitch(self):
+        """
+        The pitch series on an even grid at its median sampling interval, and a
+        mask of the grid points that were measured (False inside gaps, where the
+        value is only interpolated)
+        """
+        times = np.asarray(self.times, dtype=np.float64)
+        pitch = np.asarray(self.pitch, dtype=np.float64)
+        step = float(np.median(np.diff(times)))
+        grid = np.arange(times[0], times[-1] + step / 2, step)
+
+        right = np.clip(np.searchsorted(times, grid, side="right"), 1, len(times) - 1)
+        measured = (times[right] - times[right - 1]) <= MAX_GAP_STEPS * step
+        return step, np.interp(grid, times, pitch), measured
+
+    def summary(self) -> dict:
+        """
+        Nod frequency (Hz) and amplitude (pitch units) over the buffered window;
+        both are None when the series is too short or sampled too slowly to
+        resolve the nod band.
+        """
+        unmeasured = {"nod_frequency": None, "nod_amplitude": None}
+        if len(self.pitch) < MIN_NOD_SAMPLES:
+            return unmeasured
+
+        step, series, measured = self._resampled_pitch()
+        sample_rate = 1.0 / step
+        if sample_rate < MIN_NOD_SAMPLE_RATE or np.count_nonzero(measured) < MIN_NOD_SAMPLES:
+            return unmeasured
+
+        low, high = NOD_BAND_HZ
+        high = min(high, sample_rate / 2 * 0.95)
+        sos = signal.butter(2, [low, high], btype="bandpass", fs=sample_rate, output="sos")
+        filtered = signal.sosfiltfilt(sos, signal.detrend(series))
+
+        # Each full nod crosses zero twice; only count intervals between measured samples
+        intervals = measured[1:] & measured[:-1]
+        crossings = np.count_nonzero(np.diff(np.signbit(filtered)) & intervals)
+        duration = np.count_nonzero(intervals) * step
+        frequency = crossings / 2 / duration if duration > 0 else 0.0
+        amplitude = float(np.sqrt(2) * np.std(filtered[measured]))
+
+        return {
+            "nod_frequency": round(float(frequency), 3),
+            "nod_amplitude": round(amplitude, 4)
+        }
+
+
+def estimate_head_nod(frame, face_results=None, analyzer=None, t: float = None) -> float:
+    # Reuse tracked landmarks from the per-video FaceTracker when available
+    if face_results is None:
+        with mp_face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1) as face_mesh:
+            face_results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    # Without a per-video analyzer there is no previous frame to compare against
+    if analyzer is None:
+        analyzer = HeadMotionAnalyzer()
+    return analyzer.update(face_results, t)
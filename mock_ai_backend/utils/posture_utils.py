@@ -1,25 +1,18 @@
 import cv2
-import mediapipe as mp
 
 import os
 
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Suppress TensorFlow logs
+from services.model_registry import registry
 
-# Initialize MediaPipe Face Mesh
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(
-    static_image_mode=False,
-    max_num_faces=1,
-    refine_landmarks=True,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Suppress TensorFlow logs
 
-def estimate_posture(frame) -> float:
+def estimate_posture(frame, face_results=None) -> float:
     """Simple posture estimation based on face position and stability"""
     try:
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = face_mesh.process(rgb_frame)
+        results = face_results
+        if results is None:
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            results = registry.get("posture_face_mesh").process(rgb_frame)
         
         if results.multi_face_landmarks:
             landmarks = results.multi_face_landmarks[0]
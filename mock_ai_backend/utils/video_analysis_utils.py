@@ -5,7 +5,175 @@ from utils.voice_emotion_utils import estimate_voice_emotion
 from utils.posture_utils import estimate_posture
 from utils.confidence_utils import estimate_confidence
 from utils.hand_movement_utils import estimate_hand_movement
-from utils.head_nod_utils import estimate_head_nod
+from utils.head_nod_utils import HEAD_POSE_FPS, MAX_ANALYZED_SECONDS, estimate_head_nod, HeadMotionAnalyzer
+from utils.face_tracker import FaceTracker, FACE_ABSENT, FACE_MULTIPLE
+from utils.frame_buffers import BufferPool, CropBatch, FrameRing
+from services.tracing import trace_stage
+from services.emotion_detector import get_emotion_detector
+from script.predict_emotion import (
+    EMOTION_LABELS,
+    crop_face,
+    predict_emotion_probabilities,
+    probabilities_to_emotions
+)
+
+# What the face-dependent estimators return without a face; absent frames record
+# these directly instead of running the estimators
+ABSENT_FACE_SCORES = {"eye_contact": 0.0, "smile": 0.0, "posture": 0.2, "head_nod": 0.0}
+
+def fit_within(frame, max_width: int = 640, max_height: int = 480, buffers: BufferPool = None):
+    """Downscale keeping the aspect ratio; frames already small enough (e.g. from the proxy) pass through"""
+    h, w = frame.shape[:2]
+    scale = min(max_width / w, max_height / h)
+    if scale >= 1:
+        return frame
+    size = (max(1, int(w * scale)), max(1, int(h * scale)))
+    dst = buffers.get("fitted", (size[1], size[0]) + frame.shape[2:], frame.dtype) if buffers else None
+    return cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_AREA)
+
+TIMELINE_METRICS = ("eye_contact", "smile", "posture", "confidence", "hand_movement", "head_nod")
+
+def average(lst):
+    try:
+        return round(sum(lst) / len(lst), 2) if lst else 0.0
+    except Exception as e:
+        print(f"Error averaging: {e}")
+        return 0.0
+
+class FrameAnalyzer:
+    """
+    Incremental landmark analysis for one video or live stream.
+
+    Frames are fed in order with ``add_frame`` and each returns its metrics
+    right away; ``finish`` then only runs the batched emotion/confidence pass
+    over what was collected, so the final aggregate is ready as soon as the
+    last frame is in. Not thread-safe: use one analyzer per video.
+
+    Resize/crop buffers are reused across frames and face crops are written
+    straight into one preallocated batch; frames are only copied when the
+    emotion backend needs them.
+    """
+
+    def __init__(self, sample_rate: float = HEAD_POSE_FPS or 0.5, max_seconds: float = MAX_ANALYZED_SECONDS):
+        # One tracking-mode graph per video: sampled frames are fed in order, so the
+        # face ROI carries over and full detection only reruns when tracking is lost
+        self.tracker = FaceTracker()
+        self.head_motion = HeadMotionAnalyzer(sample_rate=sample_rate, max_seconds=max_seconds)
+        self.results = {name: [] for name in TIMELINE_METRICS if name != "confidence"}
+        self.buffers = BufferPool()
+
+        # Face-emotion stage inputs, scored in one batch once all frames are sampled.
+        # Backends with their own face detection also get the decoded frames.
+        self.keep_frames = get_emotion_detector().needs_frames
+        self.face_crops = CropBatch()
+        self.face_frames = []
+        self.crop_frame_indices = []
+        self.frame_poses = []
+        self.frame_times = []
+        self.face_statuses = []
+
+    @property
+    def frames_processed(self) -> int:
+        return len(self.frame_times)
+
+    def add_frame(self, frame, t: float) -> dict:
+        """Analyze one (BGR) frame taken at ``t`` seconds; returns its landmark metrics"""
+        frame = fit_within(frame, buffers=self.buffers)  # Resize for faster processing
+        with trace_stage("multimodal.landmarks"):
+            tracked = self.tracker.process(frame)
+
+        face_status = tracked.face_status
+        if face_status == FACE_ABSENT:
+            metrics = dict(ABSENT_FACE_SCORES)
+        else:
+            metrics = {}
+            with trace_stage("multimodal.eye_contact"):
+                metrics["eye_contact"] = estimate_eye_contact(frame, tracked.face_results)
+            with trace_stage("multimodal.smile"):
+                metrics["smile"] = estimate_smile(frame, tracked.face_results)
+            with trace_stage("multimodal.posture"):
+                metrics["posture"] = estimate_posture(frame, tracked.face_results)
+            with trace_stage("multimodal.head_nod"):
+                metrics["head_nod"] = estimate_head_nod(frame, tracked.face_results, self.head_motion, t)
+        with trace_stage("multimodal.hand_movement"):
+            metrics["hand_movement"] = estimate_hand_movement(frame, tracked.hand_results)
+
+        crop = None
+        if face_status != FACE_ABSENT:
+            crop = crop_face(frame, tracked.face_landmarks, dst=self.face_crops.next_slot(), buffers=self.buffers)
+
+        # Record only once every estimator succeeded so the per-frame series stay aligned
+        for name, value in metrics.items():
+            self.results[name].append(value)
+        self.face_statuses.append(face_status)
+        self.frame_poses.append(tracked.pose_results)
+        self.frame_times.append(round(t, 2))
+        if crop is not None:
+            self.face_crops.commit(crop)
+            if self.keep_frames:
+                # The frame lives in a reused buffer; kept frames need their own copy
+                self.face_frames.append(frame.copy())
+            self.crop_frame_indices.append(len(self.frame_poses) - 1)
+
+        return {"t": round(t, 2), "face": face_status, **metrics}
+
+    def add_pose_frame(self, frame, t: float):
+        """Head pose only, for frames between the analyzed ones (feeds nod frequency and amplitude)"""
+        frame = fit_within(frame, buffers=self.buffers)
+        with trace_stage("multimodal.head_pose"):
+            self.head_motion.track(self.tracker.track_face(frame), t)
+
+    def recent(self, frames: int = 5) -> dict:
+        """Rolling averages over the last ``frames`` frames, for live indicators"""
+        indicators = {name: average(values[-frames:]) for name, values in self.results.items()}
+        indicators["face"] = self.face_statuses[-1] if self.face_statuses else FACE_ABSENT
+        return indicators
+
+    def finish(self) -> dict:
+        """Batched emotion + confidence pass and the final averages, timeline and emotions"""
+        # One emotion model pass over every face crop feeds both confidence and emotion reporting
+        with trace_stage("multimodal.emotion"):
+            probabilities = predict_emotion_probabilities(
+                self.face_crops.array(), self.face_frames if self.keep_frames else None
+            )
+        frame_emotions = [{} for _ in self.frame_poses]  # No face: no emotion contribution
+        for i, probs in zip(self.crop_frame_indices, probabilities):
+            if probs.any():  # All-zero: the backend's own detector found no face
+                frame_emotions[i] = probabilities_to_emotions(probs)
+
+        with trace_stage("multimodal.confidence"):
+            confidence = [
+                estimate_confidence(None, pose_results, emotions)
+                for pose_results, emotions in zip(self.frame_poses, frame_emotions)
+            ]
+
+        detected_emotions = [EMOTION_LABELS[int(probs.argmax())] for probs in probabilities if probs.any()]
+        results = {**self.results, "confidence": confidence}
+
+        # Per-sampled-frame metric series, persisted with the answer for history charts
+        timeline = [
+            {"t": t, "face": face, **{name: round(float(value), 3) for name, value in zip(TIMELINE_METRICS, values)}}
+            for t, face, *values in zip(self.frame_times, self.face_statuses, *(results[name] for name in TIMELINE_METRICS))
+        ]
+
+        return {
+            **{name: average(results[name]) for name in TIMELINE_METRICS},
+            **self.head_motion.summary(),
+            # Share of sampled frames with the candidate in view / with other people in view
+            "face_presence": average([status != FACE_ABSENT for status in self.face_statuses]),
+            "multiple_faces": average([status == FACE_MULTIPLE for status in self.face_statuses]),
+            "emotion": detected_emotions,
+            "timeline": timeline
+        }
+
+    def close(self):
+        self.tracker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 def analyze_video(video_path: str) -> dict:
     cap = cv2.VideoCapture(video_path)
@@ -13,64 +181,54 @@ def analyze_video(video_path: str) -> dict:
     if not cap.isOpened():
         raise ValueError(f"Failed to open video file: {video_path}")
 
-    frame_rate = int(cap.get(cv2.CAP_PROP_FPS))
-    frame_interval = max(1, frame_rate * 2)  # Analyze 1 frame every 2 seconds
-    max_frames = 60
-
-    results = {
-        "eye_contact": [],
-        "smile": [],
-        "posture": [],
-        "confidence": [],
-        "hand_movement": [],
-        "head_nod": []
-    }
+    # Float fps: the normalized proxy runs at a low (possibly fractional) frame rate
+    frame_rate = cap.get(cv2.CAP_PROP_FPS) or 1.0
+    frame_interval = max(1, round(frame_rate * 2))  # Analyze 1 frame every 2 seconds
+    # Head pose alone on the frames in between, dense enough to resolve nods
+    pose_interval = max(1, round(frame_rate / HEAD_POSE_FPS)) if HEAD_POSE_FPS > 0 else 0
+    max_frames = 60  # 120 s of video: MAX_ANALYZED_SECONDS in utils/head_nod_utils.py
 
     frame_idx = 0
-    processed = 0
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        if frame_idx % frame_interval == 0:
-            try:
-                frame = cv2.resize(frame, (640, 480))  # Resize for faster processing
-
-                results["eye_contact"].append(estimate_eye_contact(frame))
-                results["smile"].append(estimate_smile(frame))
-                results["posture"].append(estimate_posture(frame))
-                results["confidence"].append(estimate_confidence(frame))
-                results["hand_movement"].append(estimate_hand_movement(frame))
-                results["head_nod"].append(estimate_head_nod(frame))
-
-                processed += 1
-                if processed >= max_frames:
+    analyzer = FrameAnalyzer(sample_rate=frame_rate / (pose_interval or frame_interval))
+    ring = FrameRing()
+
+    try:
+        while True:
+            # Skipped frames are only grabbed; sampled ones are decoded into the ring
+            if not cap.grab():
+                break
+
+            if frame_idx % frame_interval == 0:
+                ret, frame = ring.retrieve(cap)
+                if not ret:
                     break
-                if processed % 10 == 0:
-                    print(f"Processed {processed} frames...")
+                try:
+                    analyzer.add_frame(frame, frame_idx / frame_rate)
 
-            except Exception as e:
-                print(f"[Frame {frame_idx}] Error during analysis: {e}")
+                    processed = analyzer.frames_processed
+                    if processed >= max_frames:
+                        break
+                    if processed % 10 == 0:
+                        print(f"Processed {processed} frames...")
 
-        frame_idx += 1
+                except Exception as e:
+                    print(f"[Frame {frame_idx}] Error during analysis: {e}")
 
-    cap.release()
+            elif pose_interval and frame_idx % pose_interval == 0:
+                ret, frame = ring.retrieve(cap)
+                if not ret:
+                    break
+                try:
+                    analyzer.add_pose_frame(frame, frame_idx / frame_rate)
+                except Exception as e:
+                    print(f"[Frame {frame_idx}] Error during head pose tracking: {e}")
 
-    def average(lst):
-        try:
-            return round(sum(lst) / len(lst), 2) if lst else 0.0
-        except Exception as e:
-            print(f"Error averaging: {e}")
-            return 0.0
+            frame_idx += 1
+    finally:
+        analyzer.close()
+        cap.release()
 
     return {
-        "eye_contact": average(results["eye_contact"]),
-        "smile": average(results["smile"]),
-        "posture": average(results["posture"]),
-        "confidence": average(results["confidence"]),
-        "hand_movement": average(results["hand_movement"]),
-        "head_nod": average(results["head_nod"]),
+        **analyzer.finish(),
         "voice_emotion": estimate_voice_emotion(video_path)
     }